@@ -0,0 +1,81 @@
+"""
+Compares the startup time of an interface built from a layout file, which is parsed and validated on every start,
+against the same layout compiled ahead of time with pygame_gui_xml.compiler
+
+Cold loads run each in a new process, importing pygame_gui_xml and loading the node tree, so that they include the
+import of the XML parsers and schemas, which only the layout file needs
+
+usage: python benchmarks/bench_compiled.py [element count] [repeat]
+"""
+import sys
+import os
+import gc
+import tempfile
+import statistics
+import subprocess
+import py_compile
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.append(os.path.join(os.path.abspath(os.path.dirname(__file__)), "../"))
+import pygame
+import pygame_gui
+import pygame_gui_xml.xmlparser as xmlparser
+import pygame_gui_xml.gui as xmlgui
+import pygame_gui_xml.compiler as xmlcompiler
+from suite import write_fixtures, measure
+
+_coldLoad = """
+import time
+start = time.perf_counter()
+import pygame_gui_xml.gui
+source = {source}
+node = __import__(source).get_node_tree() if not source.endswith(".xml") else pygame_gui_xml.gui.parse_source(source)
+print((time.perf_counter() - start) * 1000)
+"""
+
+def cold_load(source: str, directory: str, repeat: int) -> float:
+    """The median time taken by a new process to import pygame_gui_xml and load the node tree of source, in milliseconds"""
+    env = { **os.environ, "PYTHONPATH": os.pathsep.join([os.path.join(os.path.abspath(os.path.dirname(__file__)), ".."), directory]) }
+    timings = [ float(subprocess.run([sys.executable, "-c", _coldLoad.format(source=repr(source))], capture_output=True, text=True, env=env, check=True).stdout.split()[-1]) for _ in range(repeat) ]
+    return statistics.median(timings)
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    pygame.init()
+    pygame.display.set_mode((800, 600))
+    # one manager is reused, since pygame_gui does not free the elements of discarded managers
+    manager = pygame_gui.UIManager((800, 600))
+    def reset():
+        manager.clear_and_reset()
+        pygame.event.clear()
+        gc.collect()
+
+    with tempfile.TemporaryDirectory() as directory:
+        source = write_fixtures(directory, count, 4)
+        output = os.path.join(directory, "layout_ui.py")
+        compileTime = measure(lambda: xmlcompiler.compile_layout(source, output), 1)["min"]
+        # shipped modules come with their bytecode, even where writing it on import is disabled
+        py_compile.compile(output, doraise=True)
+
+        def interpreted():
+            xmlgui.parse_xml_tree(manager, xmlparser.parse_pygame_xml(source), [])
+        def compiled():
+            module = xmlcompiler.load_compiled_module(output)
+            xmlgui.build_compiled_tree(manager, module, module.get_node_tree(), [])
+
+        parseTime = measure(lambda: xmlparser.parse_pygame_xml(source), repeat)["median"]
+        loadTime = measure(lambda: xmlcompiler.load_compiled_module(output).get_node_tree(), repeat)["median"]
+        interpretedTime = measure(interpreted, repeat, reset)["median"]
+        compiledTime = measure(compiled, repeat, reset)["median"]
+        nodeCount = len(xmlparser.parse_pygame_xml(source).find_all_with_attrs([])) + 1
+        coldInterpreted = cold_load(source, directory, repeat)
+        coldCompiled = cold_load("layout_ui", directory, repeat)
+    pygame.quit()
+
+    print(f'nodes: {nodeCount}, compiled in {compileTime:.2f} ms')
+    print(f'node tree: parsed {parseTime:.2f} ms, compiled module {loadTime:.2f} ms ({parseTime / loadTime:.1f}x)')
+    print(f'startup: interpreted {interpretedTime:.2f} ms, compiled {compiledTime:.2f} ms ({interpretedTime / compiledTime:.2f}x)')
+    print(f'cold load: interpreted {coldInterpreted:.2f} ms, compiled {coldCompiled:.2f} ms ({coldInterpreted / coldCompiled:.2f}x)')
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Compares a selection list of many items written as item tags in the layout against the same items read from a
+datasource file: the parse time and memory of the layout, and the time to build the list
+
+usage: python benchmarks/bench_datasource.py [item count] [repeat]
+"""
+import sys
+import os
+import gc
+import tempfile
+import tracemalloc
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.append(os.path.join(os.path.abspath(os.path.dirname(__file__)), "../"))
+import pygame
+import pygame_gui
+import pygame_gui_xml.xmlparser as xmlparser
+import pygame_gui_xml.datasource as xmldatasource
+import pygame_gui_xml.gui as xmlgui
+from suite import measure
+
+def write_layouts(directory: str, count: int) -> tuple[str, str]:
+    data = os.path.join(directory, "servers.csv")
+    with open(data, "w") as f:
+        f.writelines([ f'Server {i},#server\n' for i in range(count) ])
+    inline = os.path.join(directory, "inline.xml")
+    with open(inline, "w") as f:
+        f.write('<pygamegui><body><selectionlist rect="0 0 300 600" id="servers">' + "".join([ f'<item>Server {i}</item>' for i in range(count) ]) + "</selectionlist></body></pygamegui>")
+    external = os.path.join(directory, "external.xml")
+    with open(external, "w") as f:
+        f.write(f'<pygamegui><body><selectionlist rect="0 0 300 600" id="servers" datasource="{data}"></selectionlist></body></pygamegui>')
+    return inline, external
+
+def get_parse_memory(source: str) -> int:
+    gc.collect()
+    tracemalloc.start()
+    node = xmlparser.parse_pygame_xml(source)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del node
+    return size
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    pygame.init()
+    pygame.display.set_mode((800, 600))
+    # one manager is reused, since elements are only freed once the events posted about them are taken off the queue
+    manager = pygame_gui.UIManager((800, 600))
+    print(f'selection list of {count} items')
+    with tempfile.TemporaryDirectory() as directory:
+        for name, source in zip(["item tags", "datasource"], write_layouts(directory, count)):
+            parseTime = measure(lambda: xmlparser.parse_pygame_xml(source), repeat)["median"]
+            memory = get_parse_memory(source)
+            node = xmlparser.parse_pygame_xml(source)
+
+            def build():
+                xmldatasource.datasource_cache.clear()
+                manager.clear_and_reset()
+                pygame.event.get()
+                xmlgui.parse_xml_tree(manager, node, [], use_themes_in_file=False)
+            buildTime = measure(build, repeat)["median"]
+            print(f'{name:<10} parse {parseTime:8.2f} ms   tree {memory / 1024:9.1f} KiB   build {buildTime:8.2f} ms')
+        manager.clear_and_reset()
+        pygame.event.get()
+        xmldatasource.datasource_cache.clear()
+        gc.collect()
+    pygame.quit()
+
+if __name__ == "__main__":
+    main()
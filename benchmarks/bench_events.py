@@ -0,0 +1,77 @@
+"""
+Compares routing events through the GUITree dispatch table against every subscriber scanning every event,
+with thousands of bound buttons
+
+usage: python benchmarks/bench_events.py [bound element count] [event count]
+"""
+import sys
+import os
+import io
+import time
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.append(os.path.join(os.path.abspath(os.path.dirname(__file__)), "../"))
+import pygame
+import pygame_gui
+import pygame_gui_xml.xmlast as xmlast
+import pygame_gui_xml.xmlparser as xmlparser
+import pygame_gui_xml.gui as xmlgui
+import pygame_gui_xml.guitree as xmlguitree
+
+def generate_buttons(count: int) -> bytes:
+    lines = ['<?xml version="1.0" encoding="UTF-8"?>', "<pygamegui>", "<body>", '<panel rect="0 0 800 600" id="buttons">']
+    lines.extend([ f'<button rect="{(i * 7) % 700} {(i * 13) % 560} 100 40" id="button-{i}">Button {i}</button>' for i in range(count) ])
+    lines.extend(["</panel>", "</body>", "</pygamegui>"])
+    return "\n".join(lines).encode()
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    eventCount = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+    pygame.init()
+    pygame.display.set_mode((800, 600))
+    manager = pygame_gui.UIManager((800, 600))
+    node = xmlast.XMLParser(xmlparser.schemas).get_ast_from_stream(io.BytesIO(generate_buttons(count)))
+    tree = xmlgui.parse_xml_tree(manager, node, [], use_themes_in_file=False)
+
+    handled = [0]
+    def handler(event: pygame.event.Event):
+        handled[0] += 1
+
+    buttons = [ tree.get_element(f'button-{i}') for i in range(count) ]
+    subscribers: list[tuple[pygame_gui.core.UIElement, int, xmlguitree.EventHandler]] = []
+    for button in buttons:
+        tree.get_tree_element(button).bind_event("press", pygame_gui.UI_BUTTON_PRESSED, handler)
+        tree.get_tree_element(button).bind_event("hover", pygame_gui.UI_BUTTON_ON_HOVERED, handler)
+        subscribers.append((button, pygame_gui.UI_BUTTON_PRESSED, handler))
+        subscribers.append((button, pygame_gui.UI_BUTTON_ON_HOVERED, handler))
+
+    # a frame's worth of mostly untargeted input events with the odd button press
+    events: list[pygame.event.Event] = []
+    for i in range(eventCount):
+        if i % 10 == 0:
+            events.append(pygame.event.Event(pygame_gui.UI_BUTTON_PRESSED, ui_element=buttons[(i * 31) % len(buttons)]))
+        else:
+            events.append(pygame.event.Event(pygame.MOUSEMOTION, pos=(i % 800, i % 600), rel=(1, 1), buttons=(0, 0, 0)))
+
+    start = time.perf_counter()
+    for event in events:
+        for element, eventType, callback in subscribers:
+            if event.type == eventType and getattr(event, "ui_element", None) is element:
+                callback(event)
+    scanTime = time.perf_counter() - start
+    scanned = handled[0]
+
+    handled[0] = 0
+    start = time.perf_counter()
+    for event in events:
+        tree.dispatch(event)
+    dispatchTime = time.perf_counter() - start
+    assert handled[0] == scanned
+
+    print(f'bound elements: {len(buttons)}, handlers: {len(subscribers)}, events: {len(events)}')
+    print(f'subscribers scanning every event: {scanTime * 1000:.2f} ms ({scanTime / len(events) * 1e6:.2f} us per event)')
+    print(f'dispatch table: {dispatchTime * 1000:.2f} ms ({dispatchTime / len(events) * 1e6:.2f} us per event)')
+    print(f'speedup: {scanTime / dispatchTime:.0f}x')
+    pygame.quit()
+
+if __name__ == "__main__":
+    main()
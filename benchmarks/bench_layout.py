@@ -0,0 +1,58 @@
+"""
+Times resolving every rect of a large layout for a new window size: the per node pass of pygame_gui_xml.layout
+against its NumPy arrays, with the plain rescaling of absolute rects GUI did before relative units for reference, and
+toggling back to a window size already held by the layout cache
+
+usage: python benchmarks/bench_layout.py [card count] [repeat]
+"""
+import sys
+import os
+import io
+sys.path.append(os.path.join(os.path.abspath(os.path.dirname(__file__)), "../"))
+import pygame_gui_xml.xmlast as xmlast
+import pygame_gui_xml.xmlparser as xmlparser
+import pygame_gui_xml.layout as xmllayout
+from suite import measure
+
+def generate_cards(count: int) -> bytes:
+    lines = ['<?xml version="1.0" encoding="UTF-8"?>', "<pygamegui>", "<body>", '<panel rect="0 0 100% 100%" id="cards">']
+    for i in range(count):
+        lines.append(f'<panel rect="{i % 10 * 10}% {i // 10 % 10 * 10}% 1/10 10%" min-size="40 30" max-size="200 25vh">')
+        lines.append(f'<label rect="2 2 96% 40%">Card {i}</label><button rect="2 -2 50% 40%" anchors="bottom">Open</button>')
+        lines.append("</panel>")
+    lines.extend(["</panel>", "</body>", "</pygamegui>"])
+    return "\n".join(lines).encode()
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    node = xmlast.XMLParser(xmlparser.schemas).get_ast_from_stream(io.BytesIO(generate_cards(count)))
+    layout = xmllayout.Layout(node)
+    window, scale = (1920, 1080), (2.4, 1.8)
+
+    # absolute rects of the same count, rescaled the way resizes worked before
+    absolute = layout.resolve((800, 600))
+    rescaleTime = measure(lambda: [ (x * scale[0], y * scale[1], w * scale[0], h * scale[1]) for x, y, w, h in absolute ], repeat)["median"]
+    nodesTime = measure(lambda: layout.resolve(window, scale, vectorize=False), repeat)["median"]
+    print(f'rects: {len(layout)}')
+    print(f'rescale absolute rects {rescaleTime:8.3f} ms')
+    print(f'layout per node        {nodesTime:8.3f} ms')
+    cached = xmllayout.Layout(node, cache_size=2)
+    cached.apply((800, 600))
+    cached.apply(window, scale)
+    toggles = [(window, scale), ((800, 600), (1.0, 1.0))]
+    cachedTime = measure(lambda: [ cached.apply(*toggles[i % 2]) for i in range(2) ], repeat)["median"] / 2
+    cached.restore()
+    print(f'cached window size     {cachedTime:8.3f} ms ({nodesTime / cachedTime:.1f}x)')
+    if xmllayout.get_numpy() is None:
+        print("layout vectorized      NumPy is not installed")
+        return
+    layout.resolve(window, scale, vectorize=True)
+    vectorizedTime = measure(lambda: layout.resolve(window, scale, vectorize=True), repeat)["median"]
+    arrayTime = measure(lambda: layout.resolve_array(window, scale), repeat)["median"]
+    print(f'layout vectorized      {vectorizedTime:8.3f} ms ({nodesTime / vectorizedTime:.1f}x), of which resolving the array {arrayTime:.3f} ms ({nodesTime / arrayTime:.1f}x)')
+    if layout.resolve(window, scale, vectorize=True) != layout.resolve(window, scale, vectorize=False):
+        raise ValueError("Vectorized layout differs from the per node layout")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Compares the memory held by a parsed 100k node document with compact __slots__ XMLNodes
+against the same tree made of dict based nodes, as XMLNode was before
+
+usage: python benchmarks/bench_node_memory.py [node count]
+"""
+import sys
+import os
+import io
+import gc
+import tracemalloc
+from typing import Any
+sys.path.append(os.path.join(os.path.abspath(os.path.dirname(__file__)), "../"))
+import pygame_gui_xml.xmlast as xmlast
+import pygame_gui_xml.xmlparser as xmlparser
+
+class DictXMLNode():
+    """Replica of the XMLNode layout before __slots__: a per instance __dict__, its own attrs dict and children list"""
+    def __init__(self, name: str, attrs: dict[str, Any], text: str, parent: "DictXMLNode | None", children: list["DictXMLNode"]):
+        self.name = name
+        self.attrs = attrs
+        self.text = text
+        self.parent = parent
+        self.children = children
+
+def generate_inventory(count: int) -> bytes:
+    """An inventory like screen: selection lists of items and dropdown menus of options"""
+    lines = ['<?xml version="1.0" encoding="UTF-8"?>', "<pygamegui>", "<body>"]
+    perList = 1000
+    for listIndex in range(count // perList):
+        if listIndex % 2 == 0:
+            lines.append(f'<selectionlist rect="0 0 300 600" id="inventory-{listIndex}">')
+            lines.append('<item selected="true">Item 0</item>')
+            lines.extend([ f'<item>Item {i}</item>' for i in range(1, perList - 1) ])
+            lines.append("</selectionlist>")
+        else:
+            lines.append(f'<dropdownmenu rect="300 0 300 40" id="leaderboard-{listIndex}">')
+            lines.extend([ f'<option>Player {i}</option>' for i in range(perList - 1) ])
+            lines.append("</dropdownmenu>")
+    lines.extend(["</body>", "</pygamegui>"])
+    return "\n".join(lines).encode()
+
+def to_dict_nodes(head: xmlast.XMLNode) -> DictXMLNode:
+    top = DictXMLNode(head.name, dict(head.attrs), head.text, None, [])
+    stack = [(head, top)]
+    while len(stack) > 0:
+        node, copy = stack.pop()
+        for child in node.children:
+            childCopy = DictXMLNode("".join(child.name), dict(child.attrs), child.text, copy, [])
+            copy.children.append(childCopy)
+            stack.append((child, childCopy))
+    return top
+
+def measure(build) -> tuple[Any, int]:
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, after - before
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    content = generate_inventory(count)
+    parser = xmlast.XMLParser(xmlparser.schemas)
+    compact, compactSize = measure(lambda: parser.get_ast_from_stream(io.BytesIO(content)))
+    nodeCount = len(compact.find_all_with_attrs([])) + 1
+    # tag names are copied so the dict based nodes do not benefit from interning, while text and attribute values
+    # are shared with the compact tree, so they are only counted for the compact nodes
+    _, dictSize = measure(lambda: to_dict_nodes(compact))
+    print(f'nodes: {nodeCount}')
+    print(f'dict based nodes: {dictSize / 1024 / 1024:.2f} MiB ({dictSize / nodeCount:.0f} bytes per node)')
+    print(f'compact nodes: {compactSize / 1024 / 1024:.2f} MiB ({compactSize / nodeCount:.0f} bytes per node)')
+    print(f'saved: {1 - compactSize / dictSize:.0%}')
+
+if __name__ == "__main__":
+    main()
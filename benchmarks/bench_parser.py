@@ -0,0 +1,45 @@
+"""
+Compares the single pass compiled schema parsing of XMLParser against the previous
+validate-then-parse path on large generated documents
+
+usage: python benchmarks/bench_parser.py [element count] [depth]
+"""
+import sys
+import os
+import timeit
+from typing import Any
+sys.path.append(os.path.join(os.path.abspath(os.path.dirname(__file__)), "../"))
+import bs4
+import pygame_gui_xml.xmlast as xmlast
+import pygame_gui_xml.xmlparser as xmlparser
+from layouts import generate_layout
+
+def legacy_get_ast_node(parser: xmlast.XMLParser, current: bs4.Tag, parent: xmlast.XMLNode | None) -> xmlast.XMLNode:
+    """The two pass implementation XMLParser.get_ast_node used before schemas were compiled"""
+    schema = parser.tagSchemas[current.name]
+    if not schema.validate(current):
+        raise ValueError(f'XML Parser Error: Could not validate tag {xmlast.get_tag_details(current)} according to given schema')
+    nodeAttrs: dict[str, Any] = {}
+    for attr in current.attrs:
+        if schema.attrSchema[attr].validator(current[attr]):
+            nodeAttrs[attr] = schema.attrSchema[attr].parserfunc(current[attr])
+    node = xmlast.XMLNode(current.name, nodeAttrs, str(current.string), parent, [])
+    node.children = [ legacy_get_ast_node(parser, child, node) for child in current.children if isinstance(child, bs4.Tag) ]
+    return node
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    depth = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    doc = bs4.BeautifulSoup(generate_layout(count, depth), "lxml-xml")
+    parser = xmlast.XMLParser(xmlparser.schemas)
+    repeats = 5
+
+    legacy = min(timeit.repeat(lambda: legacy_get_ast_node(parser, doc, None), number=1, repeat=repeats))
+    compiled = min(timeit.repeat(lambda: parser.get_ast(doc), number=1, repeat=repeats))
+    print(f'elements: {count}, depth: {depth}')
+    print(f'validate then parse: {legacy * 1000:.2f} ms')
+    print(f'compiled single pass: {compiled * 1000:.2f} ms')
+    print(f'speedup: {legacy / compiled:.2f}x')
+
+if __name__ == "__main__":
+    main()
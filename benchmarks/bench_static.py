@@ -0,0 +1,65 @@
+"""
+Compares the per frame update and draw time of a mostly static screen, a grid of panels of labels and images with a
+few buttons, built as separate elements against the same screen with every panel marked static and baked
+
+usage: python benchmarks/bench_static.py [panel count] [frames]
+"""
+import sys
+import os
+import io
+import gc
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.append(os.path.join(os.path.abspath(os.path.dirname(__file__)), "../"))
+import pygame
+import pygame_gui
+import pygame_gui_xml.xmlast as xmlast
+import pygame_gui_xml.xmlparser as xmlparser
+import pygame_gui_xml.gui as xmlgui
+from suite import measure
+
+def generate_screen(count: int, static: bool) -> bytes:
+    attr = ' static="true"' if static else ""
+    lines = ['<?xml version="1.0" encoding="UTF-8"?>', "<pygamegui>", "<body>"]
+    for i in range(count):
+        x, y = (i % 8) * 100, (i // 8) % 10 * 56
+        lines.append(f'<panel rect="{x} {y} 96 52" id="card-{i}"{attr}>')
+        lines.append(f'<label rect="2 2 88 20" bind="text:score-{i}">Score {{}}</label><label rect="2 24 60 20">Card {i}</label><image rect="64 24 20 20"></image>')
+        lines.append("</panel>")
+    lines.extend([ f'<button rect="{700 - i * 110} 560 100 36" id="button-{i}">Button {i}</button>' for i in range(3) ])
+    lines.extend(["</body>", "</pygamegui>"])
+    return "\n".join(lines).encode()
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 80
+    frames = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    pygame.init()
+    pygame.display.set_mode((800, 600))
+    screen = pygame.Surface((800, 600))
+    # one manager is reused, since elements are only freed once the events posted about them are taken off the queue
+    manager = pygame_gui.UIManager((800, 600))
+
+    results: dict[str, dict[str, float]] = {}
+    for static in [False, True]:
+        manager.clear_and_reset()
+        pygame.event.get()
+        gc.collect()
+        node = xmlast.XMLParser(xmlparser.schemas).get_ast_from_stream(io.BytesIO(generate_screen(count, static)))
+        build = measure(lambda: xmlgui.parse_xml_tree(manager, node, [], use_themes_in_file=False), 1)["min"]
+        manager.update(0.016)
+        name = "static" if static else "separate"
+        results[name] = {
+            "sprites": len(manager.get_sprite_group().sprites()),
+            "build": build,
+            "update": measure(lambda: [ manager.update(0.016) for _ in range(frames) ], 3)["median"] / frames,
+            "draw": measure(lambda: [ manager.draw_ui(screen) for _ in range(frames) ], 3)["median"] / frames,
+        }
+    pygame.quit()
+
+    separate, static = results["separate"], results["static"]
+    print(f'{count} panels of 2 labels and an image, 3 buttons, {frames} frames')
+    for name, result in results.items():
+        print(f'{name:<9} sprites {result["sprites"]:5d}   build {result["build"]:8.2f} ms   update {result["update"]:7.3f} ms/frame   draw {result["draw"]:7.3f} ms/frame')
+    print(f'saved per frame: update {separate["update"] - static["update"]:.3f} ms ({separate["update"] / static["update"]:.1f}x), draw {separate["draw"] - static["draw"]:.3f} ms ({separate["draw"] / static["draw"]:.1f}x)')
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""
+Compares building and scrolling a UISelectionList against a VirtualList of the same items, for growing item counts
+
+usage: python benchmarks/bench_virtuallist.py [frames]
+"""
+import sys
+import os
+import gc
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.append(os.path.join(os.path.abspath(os.path.dirname(__file__)), "../"))
+import pygame
+import pygame_gui
+import pygame_gui_xml.virtuallist as xmlvirtuallist
+from suite import measure
+
+def scroll(manager: pygame_gui.UIManager, scrollBar: pygame_gui.elements.UIVerticalScrollBar, frames: int):
+    """Scrolls from the top to the bottom of the list over frames updates"""
+    for frame in range(frames):
+        scrollBar.set_scroll_from_start_percentage(frame / frames)
+        manager.update(0.016)
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    pygame.init()
+    pygame.display.set_mode((800, 600))
+    # one manager is reused, since elements are only freed once the events posted about them are taken off the queue
+    manager = pygame_gui.UIManager((800, 600))
+    rect = pygame.Rect(0, 0, 300, 400)
+
+    print(f'list of 300x400, scrolled top to bottom over {frames} frames')
+    for count in [1000, 10000, 50000]:
+        items = [ f'Item {i}' for i in range(count) ]
+        for name, create in [("selectionlist", lambda: pygame_gui.elements.UISelectionList(rect, list(items), manager)), ("virtuallist", lambda: xmlvirtuallist.VirtualList(rect, items, manager))]:
+            manager.clear_and_reset()
+            pygame.event.get()
+            gc.collect()
+            elements: list[pygame_gui.core.UIElement] = []
+            build = measure(lambda: elements.append(create()), 1)["min"]
+            scrollTime = measure(lambda: scroll(manager, elements[-1].scroll_bar, frames), 1)["min"] / frames
+            print(f'{count:6d} items {name:<14} build {build:8.2f} ms   scroll {scrollTime:7.3f} ms/frame')
+    pygame.quit()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""Synthetic pygame_gui_xml layouts for benchmarking"""
+import itertools
+
+_leafTemplates: list[str] = [
+    '<button rect="{x} {y} 120 40" anchors="top left" id="button-{i}" class="menu-button" tooltip="Button {i}">Button {i}</button>',
+    '<label rect="{x} {y} 200 30" id="label-{i}">Label {i}</label>',
+    '<horizontalslider rect="{x} {y} 200 20" start="5" range="0 100" click-increment="5" id="slider-{i}"></horizontalslider>',
+    '<textentryline rect="{x} {y} 200 30" placeholder="Type here" initial="Entry {i}" id="entry-{i}"></textentryline>',
+    '<statusbar rect="{x} {y} 200 20" anchors="bottom" id="status-{i}"></statusbar>',
+    '<textbox rect="{x} {y} 200 80" id="textbox-{i}" class="description">Textbox {i}</textbox>',
+    '<textentrybox rect="{x} {y} 200 80" initial="Notes {i}" id="entrybox-{i}"></textentrybox>',
+    '<selectionlist rect="{x} {y} 200 100" id="list-{i}"><item selected="true">Item A</item><item>Item B</item><item>Item C</item></selectionlist>',
+    '<virtuallist rect="{x} {y} 200 100" multiselect="true" id="virtuallist-{i}"><item selected="true">Row A</item><item>Row B</item><item>Row C</item><item>Row D</item></virtuallist>',
+    '<dropdownmenu rect="{x} {y} 200 30" id="dropdown-{i}"><option>Option A</option><option start="true">Option B</option></dropdownmenu>',
+    '<panel rect="{x} {y} 100 60" id="card-{i}"><tooltip hover-distance="5 5" id="tooltip-{i}">Card {i}</tooltip></panel>',
+]
+_imageTemplate = '<image src="{src}" rect="{x} {y} 64 64" id="image-{i}" class="icon"></image>'
+
+def generate_layout(count: int = 1000, depth: int = 3, image_src: str | None = None, theme: str | None = None) -> str:
+    """
+    Generates a layout document with roughly count elements spread through panels nested depth levels deep,
+    the deepest of which sits in a window
+
+    Images are only generated when image_src gives an existing image file, and a head importing theme only when theme is given
+    """
+    templates = itertools.cycle(_leafTemplates + ([ _imageTemplate.replace("{src}", image_src) ] if not image_src is None else []))
+    counter = itertools.count()
+    lines: list[str] = ['<?xml version="1.0" encoding="UTF-8"?>', "<pygamegui>"]
+    if not theme is None:
+        lines.extend(["<head>", "<themes>", f'<theme>{theme}</theme>', "</themes>", "</head>"])
+    lines.append("<body>")
+    depth = max(depth, 1)
+    perPanel = max(count // depth, 1)
+    for level in range(depth):
+        if level == depth - 1 and depth > 1:
+            lines.append(f'<window rect="{level * 5} {level * 5} 800 600" title="Window {level}" id="window-{level}" resizable="true">')
+        else:
+            lines.append(f'<panel rect="{level * 5} {level * 5} 800 600" id="panel-{level}">')
+        for _ in range(perPanel):
+            i = next(counter)
+            lines.append(next(templates).format(x=(i * 7) % 700, y=(i * 13) % 500, i=i))
+    if depth > 1:
+        lines.append("</window>")
+    lines.extend(["</panel>"] * (depth - 1 if depth > 1 else 1))
+    lines.extend(["</body>", "</pygamegui>"])
+    return "\n".join(lines)
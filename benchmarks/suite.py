@@ -0,0 +1,158 @@
+"""
+Headless benchmark suite timing each stage of turning a layout into an interface: parsing, building, constructing
+a GUI, resizing it and querying its node tree. The generated layout uses every tag of xmlparser.schemas
+
+Results are printed and written as JSON, and can be compared against the JSON of an earlier run to spot regressions
+
+usage: python benchmarks/suite.py [--count 300] [--depth 4] [--repeat 3] [--output results.json] [--compare baseline.json]
+"""
+import sys
+import os
+import json
+import time
+import timeit
+import argparse
+import platform
+import tempfile
+import statistics
+import subprocess
+from typing import Any, Callable
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.append(os.path.join(os.path.abspath(os.path.dirname(__file__)), "../"))
+import pygame
+import pygame_gui
+import pygame_gui_xml
+import pygame_gui_xml.xmlparser as xmlparser
+import pygame_gui_xml.gui as xmlgui
+from layouts import generate_layout
+
+RESULTS_FORMAT_VERSION = 1
+
+_theme = { "button": { "colours": { "normal_bg": "#25292e" } }, "label": { "misc": { "text_horiz_alignment": "left" } } }
+
+def write_fixtures(directory: str, count: int, depth: int) -> str:
+    """Writes the layout, its theme and its image to directory, returning the path of the layout"""
+    image = os.path.join(directory, "icon.png")
+    surface = pygame.Surface((64, 64))
+    surface.fill("Orange")
+    pygame.image.save(surface, image)
+    with open(os.path.join(directory, "theme.json"), "w") as f:
+        json.dump(_theme, f)
+    source = os.path.join(directory, "layout.xml")
+    with open(source, "w") as f:
+        f.write(generate_layout(count, depth, image_src=image, theme="theme.json"))
+    return source
+
+def get_commit() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def measure(stmt: Callable[[], Any], repeat: int, setup: Callable[[], Any] | None = None) -> dict[str, float]:
+    """Times stmt once per repetition, running setup untimed before each, and summarizes the timings in milliseconds"""
+    timings: list[float] = []
+    for _ in range(repeat):
+        if not setup is None:
+            setup()
+        timings.append(timeit.timeit(stmt, number=1) * 1000)
+    return { "min": min(timings), "median": statistics.median(timings), "mean": statistics.fmean(timings), "repeat": repeat }
+
+def run(count: int, depth: int, repeat: int) -> dict[str, Any]:
+    pygame.init()
+    pygame.display.set_mode((800, 600))
+    results: dict[str, dict[str, float]] = {}
+    with tempfile.TemporaryDirectory() as directory:
+        source = write_fixtures(directory, count, depth)
+        cache = xmlparser.create_ast_cache(os.path.join(directory, "cache"))
+
+        nodetree = xmlparser.parse_pygame_xml(source)
+        tags = { node.name for node in [nodetree, *nodetree.find_all_with_attrs([])] }
+        missing = { schema.name for schema in xmlparser.schemas } - tags
+        if len(missing) > 0:
+            raise ValueError(f'Benchmark layout does not cover the tags {sorted(missing)}')
+        nodeCount = len(nodetree.find_all_with_attrs([])) + 1
+
+        for backend in xmlparser.backends:
+            if not xmlparser.is_backend_available(backend):
+                continue
+            results[f'parse_pygame_xml[{backend}]'] = measure(lambda: xmlparser.parse_pygame_xml(source, backend=backend), repeat)
+        xmlparser.parse_pygame_xml(source, cache)
+        results["parse_pygame_xml[cache hit]"] = measure(lambda: xmlparser.parse_pygame_xml(source, cache), repeat)
+
+        manager = pygame_gui.UIManager((800, 600))
+        results["parse_xml_tree"] = measure(lambda: xmlgui.parse_xml_tree(manager, nodetree, []), repeat, manager.clear_and_reset)
+
+        gui = xmlgui.GUI(source)
+        results["GUI.construct"] = measure(gui.construct, repeat)
+        elementCount = len(gui.elements)
+
+        sizes = iter([ (800 + 40 * (i % 2 + 1), 600 + 30 * (i % 2 + 1)) for i in range(repeat * 2) ])
+        results["GUI.resize[rebuild]"] = measure(lambda: gui.resize(next(sizes)), repeat)
+        relayout = xmlgui.GUI(source, resize_mode="relayout")
+        sizes = iter([ (800 + 40 * (i % 2 + 1), 600 + 30 * (i % 2 + 1)) for i in range(repeat * 2) ])
+        results["GUI.resize[relayout]"] = measure(lambda: relayout.resize(next(sizes)), repeat)
+
+        queries: dict[str, Callable[[], Any]] = {
+            "find": lambda: nodetree.find("tooltip"),
+            "find_all": lambda: nodetree.find_all("button"),
+            "find_by_id": lambda: nodetree.find_by_id(f'label-{count // 2}'),
+            "find_all_by_class": lambda: nodetree.find_all_by_class("menu-button"),
+            "find_all_with_attrs": lambda: nodetree.find_all_with_attrs(["anchors", "rect"]),
+        }
+        queryRounds = 100
+        for name, query in queries.items():
+            summary = measure(lambda: [ query() for _ in range(queryRounds) ], repeat, nodetree.get_index)
+            results[f'XMLNode.{name}'] = { **{ key: value / queryRounds for key, value in summary.items() if key != "repeat" }, "repeat": repeat }
+    pygame.quit()
+
+    return {
+        "format": RESULTS_FORMAT_VERSION,
+        "meta": {
+            "commit": get_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "pygame": pygame.version.ver,
+            "pygame_gui": getattr(pygame_gui, "__version__", None),
+            "pygame_gui_xml": pygame_gui_xml.__version__,
+            "count": count,
+            "depth": depth,
+            "nodes": nodeCount,
+            "elements": elementCount,
+        },
+        "results": results,
+    }
+
+def compare(results: dict[str, Any], baseline: dict[str, Any]) -> dict[str, float]:
+    """The ratio of the median of each benchmark to its median in baseline, above 1 meaning slower"""
+    return { name: summary["median"] / baseline["results"][name]["median"] for name, summary in results["results"].items()
+        if name in baseline["results"] and baseline["results"][name]["median"] > 0 }
+
+def main():
+    argparser = argparse.ArgumentParser(description="Times parsing, building, resizing and querying a generated pygame_gui_xml layout")
+    argparser.add_argument("--count", type=int, default=300, help="approximate number of elements in the layout")
+    argparser.add_argument("--depth", type=int, default=4, help="number of nested containers")
+    argparser.add_argument("--repeat", type=int, default=3, help="repetitions of each benchmark")
+    argparser.add_argument("--output", help="file to write the JSON results to")
+    argparser.add_argument("--compare", help="JSON results of an earlier run to compare against")
+    args = argparser.parse_args()
+
+    results = run(args.count, args.depth, args.repeat)
+    ratios: dict[str, float] = {}
+    if args.compare:
+        with open(args.compare) as f:
+            ratios = compare(results, json.load(f))
+    meta = results["meta"]
+    print(f'nodes: {meta["nodes"]}, elements: {meta["elements"]}, depth: {meta["depth"]}')
+    for name, summary in results["results"].items():
+        line = f'{name:<34} min {summary["min"]:10.3f} ms   median {summary["median"]:10.3f} ms'
+        if name in ratios:
+            line += f'   {ratios[name]:.2f}x baseline'
+        print(line)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+if __name__ == "__main__":
+    main()
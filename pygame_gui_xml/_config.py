@@ -10,6 +10,10 @@ class ElementTagMetaData(TypedDict):
 
 
 _validAnchors: list[str] = ["left", "right", "top", "bottom", "center", "centerx", "centery"]
+_validBindTargets: list[str] = ["text", "rect", "visible", "value"]
+# every element tag can bind rect and visible, while text and value are only shown by the tags below
+_textBindTags: set[str] = {"label", "button", "textbox", "textentryline", "textentrybox"}
+_valueBindTags: set[str] = _textBindTags | {"horizontalslider", "statusbar", "selectionlist", "virtuallist", "dropdownmenu"}
 _otherTags: list[str] = ["body", "pygamegui", "head", "themes", "theme"]
 _elementTags: dict[str, ElementTagMetaData] = { 
  "image": {
@@ -21,6 +25,7 @@ _elementTags: dict[str, ElementTagMetaData] = {
  "window":  {},
  "statusbar":  {},
  "selectionlist":  {},
+ "virtuallist":  {},
  "worldspacehealthbar":  {}, 
  "screenspacehealthbar":  {},
  "label":  {},
@@ -45,6 +50,16 @@ def is_non_element_tag(strdata: str) -> bool:
 def is_valid_anchor(strdata: str) -> bool:
     return strdata in _validAnchors
 
+def is_valid_bind_target(strdata: str) -> bool:
+    return strdata in _validBindTargets
+
+def get_valid_bind_targets() -> list[str]:
+    return list(_validBindTargets)
+
+def get_bind_targets(tag: str) -> list[str]:
+    """The bind targets an element tag can show"""
+    return [ target for target in _validBindTargets if (target != "text" or tag in _textBindTags) and (target != "value" or tag in _valueBindTags) ]
+
 def get_valid_anchor_tags() -> list[str]:
     return list(_validAnchors)
 
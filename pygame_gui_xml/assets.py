@@ -0,0 +1,181 @@
+import os
+import json
+import time
+import logging
+import weakref
+import threading
+import warnings
+from collections import OrderedDict
+from typing import Any, Iterable
+import pygame
+import pygame_gui
+
+logger = logging.getLogger(__name__)
+
+class ThemeCache():
+    """
+    Process wide cache of parsed theme files, keyed by absolute path and modification time
+
+    Each theme file is read and decoded once. Applying themes to a manager is skipped entirely when that manager's
+    theme already holds the same files at the same modification times, as is the case after UIManager.clear_and_reset
+
+    get may be called from any thread, such as to read the themes of a screen in the background, while apply
+    must be called from the thread owning the manager
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._themes: dict[str, tuple[float, dict[str, Any]]] = {}
+        self._applied: weakref.WeakKeyDictionary[Any, tuple[tuple[str, float], ...]] = weakref.WeakKeyDictionary()
+        self.loads = 0
+
+    def get(self, abspath: str) -> dict[str, Any]:
+        """The decoded theme at abspath, read again only if the file was modified"""
+        mtime = os.path.getmtime(abspath)
+        with self._lock:
+            cached = self._themes.get(abspath)
+            if not cached is None and cached[0] == mtime:
+                return cached[1]
+            with open(abspath, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self.loads += 1
+            self._themes[abspath] = (mtime, data)
+            return data
+
+    def apply(self, manager: pygame_gui.UIManager, paths: Iterable[str]) -> bool:
+        """Loads the given theme files into the theme of manager, in order and without duplicates. Returns whether anything was loaded"""
+        stamps: list[tuple[str, float]] = []
+        for abspath in dict.fromkeys([ os.path.abspath(path) for path in paths ]):
+            try:
+                stamps.append((abspath, os.path.getmtime(abspath)))
+            except OSError:
+                warnings.warn(f'Failed to open theme file at path:{abspath}', UserWarning)
+        stamps = tuple(stamps)
+        theme = manager.get_theme()
+        if self._applied.get(theme) == stamps:
+            return False
+        for abspath, _ in stamps:
+            logger.info("Loading theme %s", abspath)
+            try:
+                theme.load_theme(self.get(abspath))
+            except ValueError:
+                warnings.warn(f'Failed to load theme file {abspath}, check syntax', UserWarning)
+        self._applied[theme] = stamps
+        return True
+
+    def clear(self):
+        with self._lock:
+            self._themes.clear()
+        self._applied.clear()
+
+theme_cache = ThemeCache()
+
+DEFAULT_IMAGE_BUDGET = 64 * 1024 * 1024
+
+ImageKey = tuple[str, float, tuple[int, int] | None]
+
+class ImageCache():
+    """
+    Process wide cache of decoded image surfaces, keyed by absolute path, modification time and target size
+
+    Surfaces are stored already converted and scaled to the size they are displayed at, so UIImage elements
+    built from them skip both the decode and the rescale. Once the cached pixels, preloaded ones included, exceed
+    max_bytes, the preloads not yet asked for are evicted first, keeping the latest one until the least recently used
+    surfaces are evicted. Returned surfaces are shared and must not be drawn on
+
+    decode_time adds up the seconds spent decoding and scaling surfaces on misses
+
+    Converting a surface needs the display, so get must be called from the main thread. preload can be called from any
+    thread to decode an image ahead of time, leaving only the conversion and scaling to the next get
+    """
+    def __init__(self, max_bytes: int = DEFAULT_IMAGE_BUDGET):
+        self.max_bytes = max_bytes
+        self._lock = threading.RLock()
+        self._surfaces: OrderedDict[ImageKey, pygame.Surface] = OrderedDict()
+        self._decoded: OrderedDict[tuple[str, float], pygame.Surface] = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.decode_time = 0.0
+
+    @staticmethod
+    def get_surface_bytes(surface: pygame.Surface) -> int:
+        return surface.get_pitch() * surface.get_height()
+
+    def get(self, path: str, size: tuple[int, int] | None = None) -> pygame.Surface:
+        """The image at path converted for alpha blitting and, if size has a positive width and height, scaled to size"""
+        abspath = os.path.abspath(path)
+        if not size is None and (size[0] <= 0 or size[1] <= 0):
+            size = None
+        key: ImageKey = (abspath, os.path.getmtime(abspath), None if size is None else (int(size[0]), int(size[1])))
+        with self._lock:
+            surface = self._surfaces.get(key)
+            if not surface is None:
+                self._surfaces.move_to_end(key)
+                self.hits += 1
+                return surface
+            self.misses += 1
+            decoded = self._decoded.pop(key[:2], None)
+            if not decoded is None:
+                self.size -= self.get_surface_bytes(decoded)
+
+        start = time.perf_counter()
+        surface = (decoded if not decoded is None else pygame.image.load(abspath)).convert_alpha()
+        if not key[2] is None and surface.get_size() != key[2]:
+            surface = pygame.transform.smoothscale(surface, key[2])
+        with self._lock:
+            self.decode_time += time.perf_counter() - start
+            self._surfaces[key] = surface
+            self.size += self.get_surface_bytes(surface)
+            self.evict()
+        return surface
+
+    def preload(self, path: str) -> bool:
+        """Decodes the image at path without converting it, returning False if it was already decoded"""
+        abspath = os.path.abspath(path)
+        stamp = (abspath, os.path.getmtime(abspath))
+        with self._lock:
+            if stamp in self._decoded:
+                return False
+        decoded = pygame.image.load(abspath)
+        with self._lock:
+            if stamp in self._decoded:
+                return False
+            # the preloads of an earlier version of the file are never asked for
+            for stale in [ other for other in self._decoded if other[0] == abspath ]:
+                self.size -= self.get_surface_bytes(self._decoded.pop(stale))
+            self._decoded[stamp] = decoded
+            self.size += self.get_surface_bytes(decoded)
+            self.evict()
+        return True
+
+    def evict(self):
+        """
+        Drops surfaces until the cache fits in max_bytes: the preloads older than the latest one, then the least recently
+        used surfaces, and the latest preload last
+        """
+        with self._lock:
+            while self.size > self.max_bytes and len(self._decoded) > 1:
+                self._evict_decoded()
+            while self.size > self.max_bytes and len(self._surfaces) > 0:
+                _, surface = self._surfaces.popitem(last=False)
+                self.size -= self.get_surface_bytes(surface)
+                self.evictions += 1
+            while self.size > self.max_bytes and len(self._decoded) > 0:
+                self._evict_decoded()
+
+    def _evict_decoded(self):
+        _, decoded = self._decoded.popitem(last=False)
+        self.size -= self.get_surface_bytes(decoded)
+        self.evictions += 1
+
+    def get_stats(self) -> dict[str, int]:
+        return { "entries": len(self._surfaces), "bytes": self.size, "hits": self.hits, "misses": self.misses, "evictions": self.evictions }
+
+    def clear(self):
+        with self._lock:
+            self._surfaces.clear()
+            self._decoded.clear()
+            self.size = 0
+
+image_cache = ImageCache()
@@ -0,0 +1,289 @@
+"""
+Ahead of time compilation of pygame_gui_xml layouts into Python modules
+
+A compiled module holds the already validated node tree of a layout and a build function calling the pygame_gui
+constructors of its elements directly, the same calls made by gui.parsingFunctions. Loading it needs neither an XML
+parser nor schema validation, and GUI accepts the imported module in place of a source path
+
+usage: python -m pygame_gui_xml.compiler layout.xml [-o layout_ui.py]
+"""
+import os
+import sys
+import argparse
+import logging
+import pprint
+import types
+import importlib.util
+from typing import TypedDict, Callable, Iterable
+import pygame_gui
+import pygame_gui_xml.xmlast as xmlast
+import pygame_gui_xml.xmlparser as xmlparser
+import pygame_gui_xml.xmlcache as xmlcache
+import pygame_gui_xml.gui as xmlgui
+import pygame_gui_xml.virtuallist
+from pygame_gui_xml._config import is_valid_tag
+
+logger = logging.getLogger(__name__)
+
+class CompiledInfo(TypedDict):
+    """The variable names of the parent element and container at runtime, the compile time counterpart of gui.ParsingInfo"""
+    parent_element: str
+    container: str
+
+# Given a node, the expression of the node at runtime and the info of the node, returns the expression creating its element
+Emitter = Callable[[xmlast.XMLNode, str, CompiledInfo], str]
+
+def emit_info(info: CompiledInfo) -> str:
+    return f'manager=manager, parent_element={info["parent_element"]}, container={info["container"]}'
+
+def emit_object_id(node: xmlast.XMLNode) -> str:
+    objectid = xmlgui.get_object_id(node)
+    return f'pygame_gui.core.ObjectID({objectid.object_id!r}, {objectid.class_id!r})'
+
+def emit_rect(ref: str) -> str:
+    # rects are read from the node at runtime, so that the rescaled rects of a resized GUI are used
+    return f'pygame.Rect({ref}.attrs["rect"])'
+
+def emit_anchors(node: xmlast.XMLNode) -> str:
+    return repr(node.attrs.get("anchors") or {})
+
+def emit_button(node: xmlast.XMLNode, ref: str, info: CompiledInfo) -> str:
+    return f'pygame_gui.elements.UIButton(relative_rect={emit_rect(ref)}, anchors={emit_anchors(node)}, {emit_info(info)}, text={node.text!r}, object_id={emit_object_id(node)}, tool_tip_text={node.attrs.get("tooltip")!r})'
+
+def emit_pygamegui(node: xmlast.XMLNode, ref: str, info: CompiledInfo) -> str:
+    return f'pygame_gui.core.UIContainer(relative_rect=pygame.Rect((0, 0), manager.window_resolution), {emit_info(info)})'
+
+def emit_image(node: xmlast.XMLNode, ref: str, info: CompiledInfo) -> str:
+    if "src" in node.attrs:
+        surface = f'pygame_gui_xml.assets.image_cache.get({node.attrs["src"]!r}, {emit_rect(ref)}.size)'
+    else:
+        surface = f'blank_surface({emit_rect(ref)}.size)'
+    return f'pygame_gui.elements.UIImage(relative_rect={emit_rect(ref)}, image_surface={surface}, {emit_info(info)}, anchors={emit_anchors(node)}, object_id={emit_object_id(node)})'
+
+def emit_body(node: xmlast.XMLNode, ref: str, info: CompiledInfo) -> str:
+    return f'pygame_gui.core.UIContainer(relative_rect={ref}.attrs.get("rect") or pygame.Rect((0, 0), manager.window_resolution), {emit_info(info)}, anchors={{}})'
+
+def emit_window(node: xmlast.XMLNode, ref: str, info: CompiledInfo) -> str:
+    title = node.attrs.get("title") or "Unnamed Window"
+    resizable = node.attrs.get("resizable") or False
+    return f'pygame_gui.elements.UIWindow(rect={emit_rect(ref)}, manager=manager, window_display_title={title!r}, resizable={resizable!r}, object_id={emit_object_id(node)})'
+
+def emit_panel(node: xmlast.XMLNode, ref: str, info: CompiledInfo) -> str:
+    return f'pygame_gui.elements.UIPanel({emit_rect(ref)}, 1, {emit_info(info)}, anchors={emit_anchors(node)}, object_id={emit_object_id(node)})'
+
+def emit_label(node: xmlast.XMLNode, ref: str, info: CompiledInfo) -> str:
+    return f'pygame_gui.elements.UILabel({emit_rect(ref)}, text={node.text!r}, {emit_info(info)}, anchors={emit_anchors(node)}, object_id={emit_object_id(node)})'
+
+def emit_textbox(node: xmlast.XMLNode, ref: str, info: CompiledInfo) -> str:
+    return f'pygame_gui.elements.UITextBox({node.text!r}, {emit_rect(ref)}, {emit_info(info)}, anchors={emit_anchors(node)}, object_id={emit_object_id(node)})'
+
+def emit_statusbar(node: xmlast.XMLNode, ref: str, info: CompiledInfo) -> str:
+    return f'pygame_gui.elements.UIStatusBar({emit_rect(ref)}, {emit_info(info)}, anchors={emit_anchors(node)}, object_id={emit_object_id(node)})'
+
+def emit_datasource(node: xmlast.XMLNode) -> str:
+    # datasources are opened at runtime, so that the compiled module does not depend on the size of the data
+    return f'pygame_gui_xml.datasource.datasource_cache.get({node.attrs["datasource"]!r})'
+
+def emit_selectionlist(node: xmlast.XMLNode, ref: str, info: CompiledInfo) -> str:
+    multiselect = node.attrs.get("multiselect") or False
+    if "datasource" in node.attrs:
+        return f'pygame_gui_xml.virtuallist.VirtualList({emit_rect(ref)}, {emit_datasource(node)}, {emit_info(info)}, anchors={emit_anchors(node)}, allow_multi_select={multiselect!r}, object_id={emit_object_id(node)})'
+    items = [ child for child in node.children if child.name == "item" ]
+    selected = [ item.text for item in items if item.attrs.get("selected") == True ]
+    default_selection = selected if multiselect else next(iter(selected), None)
+    return f'pygame_gui.elements.UISelectionList({emit_rect(ref)}, item_list={[ item.text for item in items ]!r}, {emit_info(info)}, anchors={emit_anchors(node)}, allow_multi_select={multiselect!r}, default_selection={default_selection!r}, object_id={emit_object_id(node)})'
+
+def emit_virtuallist(node: xmlast.XMLNode, ref: str, info: CompiledInfo) -> str:
+    multiselect = node.attrs.get("multiselect") or False
+    items = [ child for child in node.children if child.name == "item" ]
+    selected = [ index for index, item in enumerate(items) if item.attrs.get("selected") == True ]
+    selected = selected if multiselect else selected[:1]
+    return f'pygame_gui_xml.virtuallist.VirtualList({emit_rect(ref)}, {[ item.text for item in items ]!r}, {emit_info(info)}, anchors={emit_anchors(node)}, allow_multi_select={multiselect!r}, selected={selected!r}, object_id={emit_object_id(node)})'
+
+def emit_horizontalslider(node: xmlast.XMLNode, ref: str, info: CompiledInfo) -> str:
+    start_value = node.attrs.get("start") or 0
+    range_value = node.attrs.get("range") or (0, 100)
+    click_increment = node.attrs.get("click-increment") or 1
+    return f'pygame_gui.elements.UIHorizontalSlider({emit_rect(ref)}, start_value={start_value!r}, value_range={range_value!r}, {emit_info(info)}, anchors={emit_anchors(node)}, click_increment={click_increment!r}, object_id={emit_object_id(node)})'
+
+def emit_dropdownmenu(node: xmlast.XMLNode, ref: str, info: CompiledInfo) -> str:
+    if "datasource" in node.attrs:
+        return f'pygame_gui_xml.virtuallist.VirtualDropDownMenu({emit_datasource(node)}, {emit_rect(ref)}, {emit_info(info)}, anchors={emit_anchors(node)}, object_id={emit_object_id(node)})'
+    options = [ child for child in node.children if child.name == "option" ]
+    if "value" in (node.attrs.get("bind") or {}):
+        selected = next(( index for index, option in enumerate(options) if option.attrs.get("start") == True ), 0)
+        return f'pygame_gui_xml.virtuallist.VirtualDropDownMenu({[ option.text for option in options ]!r}, {emit_rect(ref)}, {emit_info(info)}, anchors={emit_anchors(node)}, object_id={emit_object_id(node)}, selected={selected!r})'
+    if len(options) == 0:
+        return f'pygame_gui.elements.UIDropDownMenu([], "", {emit_rect(ref)}, {emit_info(info)}, anchors={emit_anchors(node)})'
+    starting_option = next(( option.text for option in options if option.attrs.get("start") == True ), options[0].text)
+    return f'pygame_gui.elements.UIDropDownMenu({[ option.text for option in options ]!r}, {starting_option!r}, {emit_rect(ref)}, {emit_info(info)}, anchors={emit_anchors(node)}, object_id={emit_object_id(node)})'
+
+def emit_textentryline(node: xmlast.XMLNode, ref: str, info: CompiledInfo) -> str:
+    placeholder = node.attrs.get("placeholder") or ""
+    initial = node.attrs.get("initial") or ""
+    return f'pygame_gui.elements.UITextEntryLine({emit_rect(ref)}, {emit_info(info)}, anchors={emit_anchors(node)}, placeholder_text={placeholder!r}, initial_text={initial!r}, object_id={emit_object_id(node)})'
+
+def emit_textentrybox(node: xmlast.XMLNode, ref: str, info: CompiledInfo) -> str:
+    initial = node.attrs.get("initial") or ""
+    return f'pygame_gui.elements.UITextEntryBox({emit_rect(ref)}, {emit_info(info)}, anchors={emit_anchors(node)}, initial_text={initial!r}, object_id={emit_object_id(node)})'
+
+def emit_tooltip(node: xmlast.XMLNode, ref: str, info: CompiledInfo) -> str:
+    hover_distance = node.attrs.get("hover-distance") or (5, 5)
+    return f'pygame_gui.elements.UITooltip({node.text!r}, {hover_distance!r}, manager, {info["parent_element"]}, anchors={emit_anchors(node)}, object_id={emit_object_id(node)})'
+
+emitters: dict[str, Emitter] = {
+    "button": emit_button,
+    "pygamegui": emit_pygamegui,
+    "window": emit_window,
+    "body": emit_body,
+    "image": emit_image,
+    "panel": emit_panel,
+    "label": emit_label,
+    "textbox": emit_textbox,
+    "statusbar": emit_statusbar,
+    "selectionlist": emit_selectionlist,
+    "virtuallist": emit_virtuallist,
+    "horizontalslider": emit_horizontalslider,
+    "dropdownmenu": emit_dropdownmenu,
+    "textentrybox": emit_textentrybox,
+    "textentryline": emit_textentryline,
+    "tooltip": emit_tooltip
+}
+
+# The element classes created for each tag, to know at compile time which elements become the container of their children
+elementClasses: dict[str, type] = {
+    "button": pygame_gui.elements.UIButton,
+    "pygamegui": pygame_gui.core.UIContainer,
+    "window": pygame_gui.elements.UIWindow,
+    "body": pygame_gui.core.UIContainer,
+    "image": pygame_gui.elements.UIImage,
+    "panel": pygame_gui.elements.UIPanel,
+    "label": pygame_gui.elements.UILabel,
+    "textbox": pygame_gui.elements.UITextBox,
+    "statusbar": pygame_gui.elements.UIStatusBar,
+    "selectionlist": pygame_gui.elements.UISelectionList,
+    "virtuallist": pygame_gui_xml.virtuallist.VirtualList,
+    "horizontalslider": pygame_gui.elements.UIHorizontalSlider,
+    "dropdownmenu": pygame_gui.elements.UIDropDownMenu,
+    "textentrybox": pygame_gui.elements.UITextEntryBox,
+    "textentryline": pygame_gui.elements.UITextEntryLine,
+    "tooltip": pygame_gui.elements.UITooltip
+}
+
+def is_compilable(node: xmlast.XMLNode) -> bool:
+    return is_valid_tag(node.name) and node.name in emitters
+
+def emit_build(top: xmlast.XMLNode, indexes: dict[xmlast.XMLNode, int]) -> list[str]:
+    """The statements creating the elements of top and its children in the same order and with the same parents as gui.iter_parse_node"""
+    lines: list[str] = []
+    stack: list[tuple[xmlast.XMLNode, CompiledInfo]] = [(top, { "parent_element": "None", "container": "None" })]
+    while len(stack) > 0:
+        current, currentInfo = stack.pop()
+        if not is_valid_tag(current.name):
+            continue
+        if not current.name in emitters:
+            logger.warning("Could not find corresponding emitter for node %s, it will not be compiled", current)
+            continue
+
+        index = indexes[current]
+        ref, var = f'nodes[{index}]', f'e{index}'
+        if xmlgui.is_static(current):
+            # static subtrees are baked at runtime from their nodes, just as when interpreted
+            lines.append(f'{var} = elements[{ref}] = pygame_gui_xml.gui.StaticLayer({ref}, {{ "manager": manager, "parent_element": {currentInfo["parent_element"]}, "container": {currentInfo["container"]} }})')
+            continue
+        lines.append(f'{var} = elements[{ref}] = {emitters[current.name](current, ref, currentInfo)}')
+        if len(current.children) > 0:
+            nextContainer = var if issubclass(elementClasses[current.name], pygame_gui.core.IContainerLikeInterface) else currentInfo["container"]
+            nextInfo: CompiledInfo = { "parent_element": var, "container": nextContainer }
+            stack.extend([ (child, nextInfo) for child in reversed(current.children) ])
+    return lines
+
+_moduleTemplate = '''"""
+Compiled from {source} by pygame_gui_xml.compiler, do not edit
+
+Pass this module to pygame_gui_xml.gui.GUI in place of the source path
+"""
+import os
+import pygame
+import pygame_gui
+import pygame_gui_xml.xmlcache
+import pygame_gui_xml.assets
+import pygame_gui_xml.gui
+import pygame_gui_xml.virtuallist
+import pygame_gui_xml.datasource
+
+COMPILED_FORMAT = {version}
+SOURCE = {source!r}
+
+FLAT_TREE = {flat}
+
+def get_node_tree():
+    """The node tree of the layout, a fresh copy on every call"""
+    node = pygame_gui_xml.xmlcache.unflatten_xml_tree([ (name, dict(attrs), text, parentIndex) for name, attrs, text, parentIndex in FLAT_TREE ])
+    node["path"] = os.path.join(os.path.dirname(os.path.abspath(__file__)), SOURCE)
+    return node
+
+def blank_surface(size):
+    surface = pygame.surface.Surface(size).convert_alpha()
+    surface.fill("White")
+    return surface
+
+def build(manager, nodes, elements):
+    """Creates the elements of the layout, where nodes lists the node tree of get_node_tree in document order"""
+{build}
+'''
+
+def generate_module(nodetree: xmlast.XMLNode, source: str) -> str:
+    """The code of the compiled module of a parsed layout, where source is the path of the layout relative to the module"""
+    flat = xmlcache.flatten_xml_tree(nodetree)
+    name, attrs, text, parentIndex = flat[0]
+    flat[0] = (name, { attrname: value for attrname, value in attrs.items() if attrname != "path" }, text, parentIndex)
+    nodes = [nodetree, *nodetree.find_all_with_attrs([])]
+    lines = emit_build(xmlgui.get_body(nodetree), { node: index for index, node in enumerate(nodes) })
+    return _moduleTemplate.format(
+        source=source.replace(os.sep, "/"),
+        version=xmlgui.COMPILED_FORMAT_VERSION,
+        flat=pprint.pformat(flat, width=160, sort_dicts=False),
+        build="\n".join([ "    " + line for line in lines ]) or "    pass"
+    )
+
+def compile_layout(source: str, output: str | None = None, schemas: Iterable[xmlast.XMLTagParserSchema] = xmlparser.schemas) -> str:
+    """
+    Validates the layout at source against schemas and returns the code of its compiled module, also writing it to output when given
+
+    Raises a ValueError when the layout is invalid, just as parsing it would
+    """
+    with open(source, "rb") as f:
+        nodetree = xmlast.XMLParser(list(schemas)).get_ast_from_stream(f)
+    directory = os.path.dirname(os.path.abspath(output)) if not output is None else os.getcwd()
+    code = generate_module(nodetree, os.path.relpath(os.path.abspath(source), directory))
+    if not output is None:
+        with open(output, "w") as f:
+            f.write(code)
+    return code
+
+def load_compiled_module(path: str) -> types.ModuleType:
+    """Imports the compiled module written at path, for modules outside of the import path"""
+    name = os.path.splitext(os.path.basename(path))[0]
+    spec = importlib.util.spec_from_file_location(name, path)
+    if spec is None or spec.loader is None:
+        raise ValueError(f'Could not load compiled layout {path}')
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def main(argv: list[str] | None = None):
+    argparser = argparse.ArgumentParser(prog="python -m pygame_gui_xml.compiler", description="Compiles a pygame_gui_xml layout into a Python module to be passed to GUI")
+    argparser.add_argument("source", help="layout file to compile")
+    argparser.add_argument("-o", "--output", help="file to write the module to, printed when not given")
+    args = argparser.parse_args(argv)
+    try:
+        code = compile_layout(args.source, args.output)
+    except (OSError, ValueError) as error:
+        print(f'Could not compile {args.source}: {error}', file=sys.stderr)
+        sys.exit(1)
+    if args.output is None:
+        print(code)
+
+if __name__ == "__main__":
+    main()
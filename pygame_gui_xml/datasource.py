@@ -0,0 +1,186 @@
+"""
+List items read from external files, for the datasource attribute of selectionlist and dropdownmenu
+
+A datasource file holds one item per line:
+
+- ".csv": the first field is the text of the item, and a second field, when present, the object id of its row
+- ".jsonl" or ".ndjson": a JSON string, a [text, object id] array or a {"text": ..., "object_id": ...} object
+- any other extension: the whole line is the text of the item
+
+Blank lines are skipped. Validating the attribute only checks that the file exists, so parsing a layout costs the same
+whatever the size of its data. The file is memory mapped when the element is built, and FileItemSource indexes the
+starts of its lines a chunk at a time, as far as the items read so far. Each item is decoded only when a row shows it,
+and VirtualList sizes itself by a length estimated from the first chunk, which is exact once the whole file is indexed
+"""
+import os
+import csv
+import json
+import mmap
+import array
+import logging
+import threading
+from collections.abc import Sequence
+
+logger = logging.getLogger(__name__)
+
+formats: dict[str, str] = { ".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl" }
+
+# the bytes indexed at a time, about 20000 lines of short items
+CHUNK_SIZE = 256 * 1024
+
+def get_format(path: str) -> str:
+    """The format of a datasource file by its extension, "lines" for any extension without a format of its own"""
+    return formats.get(os.path.splitext(path)[1].lower(), "lines")
+
+def is_datasource_file(data: str) -> bool:
+    return os.path.isfile(os.path.abspath(data))
+
+def decode_item(line: str, format: str) -> str | tuple[str, str]:
+    """The item of a line of a datasource file, a text or a text and the object id of its row"""
+    if format == "lines":
+        return line
+    if format == "csv":
+        fields = next(csv.reader([line]))
+        if len(fields) >= 2 and len(fields[1]) > 0:
+            return (fields[0], fields[1])
+        return fields[0] if len(fields) > 0 else ""
+    if format == "jsonl":
+        value = json.loads(line)
+        if isinstance(value, str):
+            return value
+        if isinstance(value, list) and len(value) == 2 and all([ isinstance(part, str) for part in value ]):
+            return (value[0], value[1])
+        if isinstance(value, dict) and isinstance(value.get("text"), str):
+            return (value["text"], value["object_id"]) if isinstance(value.get("object_id"), str) else value["text"]
+        raise ValueError(f'Could not read list item {line}, expected a string, a [text, object id] array or an object with a text')
+    raise ValueError(f'Unknown datasource format {format}, expected one of {["lines", *sorted(set(formats.values()))]}')
+
+class FileItemSource(Sequence):
+    """
+    The items of a datasource file as a read only sequence, which VirtualList accepts as its items
+
+    The starts of the non blank lines are indexed in chunks of CHUNK_SIZE bytes as items further down are read.
+    Taking the length indexes the whole file without decoding any item, where estimate_len extrapolates it from the
+    chunks indexed so far. decodes counts the items decoded. Items can no longer be read once the source is closed,
+    which happens when it is collected
+    """
+    def __init__(self, path: str, format: str | None = None):
+        self.path = os.path.abspath(path)
+        self.format = format or get_format(path)
+        self._file = open(self.path, "rb")
+        self.size = os.fstat(self._file.fileno()).st_size
+        # an empty file cannot be mapped
+        self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if self.size > 0 else b""
+        self._starts = array.array("Q")
+        self._ends = array.array("Q")
+        self._scanned = 0
+        self.decodes = 0
+
+    def _scan(self):
+        """Indexes the lines of the next chunk, ending at the last line break inside of it or at the end of the file"""
+        end = min(self._scanned + CHUNK_SIZE, self.size)
+        chunk = self._data[self._scanned:end]
+        if end < self.size:
+            lastBreak = chunk.rfind(b"\n")
+            if lastBreak < 0:
+                # a line longer than a chunk, read until its end
+                lineEnd = self._data.find(b"\n", end)
+                end = self.size if lineEnd < 0 else lineEnd + 1
+                chunk = self._data[self._scanned:end]
+            else:
+                end = self._scanned + lastBreak + 1
+                chunk = chunk[:lastBreak + 1]
+        start = self._scanned
+        for line in chunk.split(b"\n"):
+            if len(line.strip()) > 0:
+                self._starts.append(start)
+                self._ends.append(start + len(line))
+            start += len(line) + 1
+        self._scanned = end
+
+    def _scan_to(self, index: int):
+        while len(self._starts) <= index and self._scanned < self.size:
+            self._scan()
+
+    def is_indexed(self) -> bool:
+        """Whether every line of the file was indexed"""
+        return self._scanned >= self.size
+
+    def is_closed(self) -> bool:
+        return self._file.closed
+
+    def _check_open(self):
+        if self.is_closed():
+            raise ValueError(f'Could not read datasource {self.path}, the source was closed')
+
+    def estimate_len(self) -> int:
+        """
+        The number of items, extrapolated from the lines per byte of the chunks indexed so far until the whole file is
+        indexed. Only indexes up to the first non blank line, so the estimate is 0 only for a source without items
+        """
+        self._check_open()
+        self._scan_to(0)
+        if self.is_indexed():
+            return len(self._starts)
+        return max(len(self._starts), round(len(self._starts) * self.size / self._scanned))
+
+    def __len__(self) -> int:
+        self._check_open()
+        while self._scanned < self.size:
+            self._scan()
+        return len(self._starts)
+
+    def __getitem__(self, index: int) -> str | tuple[str, str]:
+        if isinstance(index, slice):
+            return [ self[i] for i in range(*index.indices(len(self))) ]
+        self._check_open()
+        if index < 0:
+            index += len(self)
+        self._scan_to(index)
+        if not 0 <= index < len(self._starts):
+            raise IndexError(f'Datasource item {index} out of range, {self.path} has {len(self)} items')
+        line = self._data[self._starts[index]:self._ends[index]].decode("utf-8").strip("\r")
+        self.decodes += 1
+        return decode_item(line, self.format)
+
+    def close(self):
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+        self._file.close()
+
+    def __del__(self):
+        if hasattr(self, "_data"):
+            self.close()
+
+class DataSourceCache():
+    """
+    Process wide cache of opened datasource files, keyed by absolute path, modification time and size
+
+    Elements rebuilt on resize or reload share the already indexed source of an unchanged file. The source of a changed
+    file is only dropped from the cache, as are the sources on clear, since elements of other scenes or GUIs may still
+    show it. It keeps its mapping of the file until the last of them lets go of it
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sources: dict[str, tuple[tuple[float, int], FileItemSource]] = {}
+        self.opens = 0
+
+    def get(self, path: str) -> FileItemSource:
+        abspath = os.path.abspath(path)
+        stat = os.stat(abspath)
+        stamp = (stat.st_mtime, stat.st_size)
+        with self._lock:
+            cached = self._sources.get(abspath)
+            if not cached is None and cached[0] == stamp:
+                return cached[1]
+            logger.info("Opening datasource %s", abspath)
+            source = FileItemSource(abspath)
+            self.opens += 1
+            self._sources[abspath] = (stamp, source)
+            return source
+
+    def clear(self):
+        with self._lock:
+            self._sources.clear()
+
+datasource_cache = DataSourceCache()
@@ -1,18 +1,34 @@
 import os
+import math
+import time
+import concurrent.futures
+import logging
+import types
 import pygame
 import pygame_gui
-from typing import TypedDict, Iterable, Callable, TypeVar, Generic
+from typing import TypedDict, Iterable, Iterator, Callable, TypeVar, Generic
+from collections.abc import MutableMapping
 import pygame_gui_xml.xmlast
-import pygame_gui_xml.xmlparser
+import pygame_gui_xml.xmlcache
+import pygame_gui_xml.xmldiff
+import pygame_gui_xml.assets
+import pygame_gui_xml.guitree
+import pygame_gui_xml.profiling
+import pygame_gui_xml.layout
+import pygame_gui_xml.virtuallist
+import pygame_gui_xml.datasource
 from pygame_gui_xml._config import is_valid_tag
 import warnings
 
+logger = logging.getLogger(__name__)
+
 T = TypeVar("T")
 class ParsingInfo(TypedDict):
     manager: pygame_gui.UIManager
     parent_element: pygame_gui.core.UIElement
     container: pygame_gui.core.IContainerLikeInterface
 
+ElementMap = MutableMapping[pygame_gui_xml.xmlast.XMLNode, pygame_gui.core.UIElement]
 ParsingFunction = Callable[[pygame_gui_xml.xmlast.XMLNode, ParsingInfo], pygame_gui.core.UIElement]
 
 def get_object_id(node: pygame_gui_xml.xmlast.XMLNode):
@@ -23,7 +39,7 @@ def get_object_id(node: pygame_gui_xml.xmlast.XMLNode):
             object_id = "#" + object_id
     if not class_id is None:
         if not class_id.startswith("@"):
-            class_id = "@" + object_id
+            class_id = "@" + class_id
     return pygame_gui.core.ObjectID(object_id or "", class_id or "")
 
 def parse_button(node: pygame_gui_xml.xmlast.XMLNode, info: ParsingInfo)  -> pygame_gui.elements.UIButton:
@@ -46,11 +62,11 @@ def parse_image(node: pygame_gui_xml.xmlast.XMLNode, info: ParsingInfo) -> pygam
         rect = pygame.Rect(node.attrs["rect"])
         anchors = node.attrs.get("anchors") or {}
         objectid = get_object_id(node)
-        surface = pygame.surface.Surface(rect[2:]).convert_alpha()
-        surface.fill("White")
         if "src" in node.attrs:
-            abspath = str(os.path.abspath(node.attrs["src"]))
-            surface = pygame.image.load(abspath).convert_alpha()
+            surface = pygame_gui_xml.assets.image_cache.get(node.attrs["src"], rect.size)
+        else:
+            surface = pygame.surface.Surface(rect.size).convert_alpha()
+            surface.fill("White")
         return pygame_gui.elements.UIImage(relative_rect=rect, image_surface=surface, **info, anchors=anchors, object_id=objectid)
     raise ValueError(f'Could not parse image, invalid node name {node}')
 
@@ -101,18 +117,43 @@ def parse_statusbar(node: pygame_gui_xml.xmlast.XMLNode, info: ParsingInfo) -> p
         return pygame_gui.elements.UIStatusBar(rect, **info, anchors=anchors, object_id=objectid)
     raise ValueError(f'Could not parse statusbar, invalid node name {node}')
 
+def get_datasource(node: pygame_gui_xml.xmlast.XMLNode, childName: str) -> pygame_gui_xml.datasource.FileItemSource:
+    """The opened datasource of node, whose items replace any child tags of the name childName"""
+    if any([ child.name == childName for child in node.children ]):
+        logger.warning("Ignoring the %s tags of %s, its items are read from datasource %s", childName, node, node.attrs["datasource"])
+    return pygame_gui_xml.datasource.datasource_cache.get(node.attrs["datasource"])
+
 def parse_selectionlist(node: pygame_gui_xml.xmlast.XMLNode, info: ParsingInfo) -> pygame_gui.elements.UISelectionList:
     if node.name == "selectionlist":
         rect = pygame.Rect(node.attrs["rect"])
         anchors = node.attrs.get("anchors") or {}
         objectid = get_object_id(node)
         multiselect = node.attrs.get("multiselect") or False
+        if "datasource" in node.attrs:
+            # the items of a datasource are only read as they are shown, by a VirtualList
+            source = get_datasource(node, "item")
+            return pygame_gui_xml.virtuallist.VirtualList(rect, source, **info, anchors=anchors, allow_multi_select=multiselect, object_id=objectid)
         items = [ child for child in node.children if child.name == "item" ]
         selected = [ item.text for item in items if item.attrs.get("selected") == True ]
+        # single selection lists take a single default item rather than a list
+        default_selection = selected if multiselect else next(iter(selected), None)
 
-        return pygame_gui.elements.UISelectionList(rect, item_list=[item.text for item in items],  **info, anchors=anchors, allow_multi_select=multiselect, default_selection=selected, object_id=objectid)
+        return pygame_gui.elements.UISelectionList(rect, item_list=[item.text for item in items],  **info, anchors=anchors, allow_multi_select=multiselect, default_selection=default_selection, object_id=objectid)
     raise ValueError(f'Could not parse selectionlist, invalid node name {node}')
 
+def parse_virtuallist(node: pygame_gui_xml.xmlast.XMLNode, info: ParsingInfo) -> pygame_gui_xml.virtuallist.VirtualList:
+    if node.name == "virtuallist":
+        rect = pygame.Rect(node.attrs["rect"])
+        anchors = node.attrs.get("anchors") or {}
+        objectid = get_object_id(node)
+        multiselect = node.attrs.get("multiselect") or False
+        items = [ child for child in node.children if child.name == "item" ]
+        selected = [ index for index, item in enumerate(items) if item.attrs.get("selected") == True ]
+        # single selection lists keep the first selected item
+        selected = selected if multiselect else selected[:1]
+        return pygame_gui_xml.virtuallist.VirtualList(rect, [ item.text for item in items ], **info, anchors=anchors, allow_multi_select=multiselect, selected=selected, object_id=objectid)
+    raise ValueError(f'Could not parse virtuallist, invalid node name {node}')
+
 def parse_horizontalslider(node: pygame_gui_xml.xmlast.XMLNode, info: ParsingInfo) -> pygame_gui.elements.UIHorizontalSlider:
     if node.name == "horizontalslider":
         rect = pygame.Rect(node.attrs["rect"])
@@ -130,10 +171,17 @@ def parse_dropdownmenu(node: pygame_gui_xml.xmlast.XMLNode, info: ParsingInfo) -
         rect = pygame.Rect(node.attrs["rect"])
         anchors = node.attrs.get("anchors") or {}
         objectid = get_object_id(node)
+        if "datasource" in node.attrs:
+            source = get_datasource(node, "option")
+            return pygame_gui_xml.virtuallist.VirtualDropDownMenu(source, rect, **info, anchors=anchors, object_id=objectid)
         options = [ child for child in node.children if child.name == "option" ]
+        if "value" in (node.attrs.get("bind") or {}):
+            # options bound to a state are replaced with set_options, which UIDropDownMenu does not have
+            selected = next(( index for index, option in enumerate(options) if option.attrs.get("start") == True ), 0)
+            return pygame_gui_xml.virtuallist.VirtualDropDownMenu([ option.text for option in options ], rect, **info, anchors=anchors, object_id=objectid, selected=selected)
         if len(options) == 0:
             return pygame_gui.elements.UIDropDownMenu([], "", rect, **info, anchors=anchors)
-        starting_option = next([ option.text for option in options if option.attrs.get("start") == True], options[0].text)
+        starting_option = next(( option.text for option in options if option.attrs.get("start") == True ), options[0].text)
         return pygame_gui.elements.UIDropDownMenu([ option.text for option in options ], starting_option, rect, **info, anchors=anchors, object_id=objectid)
     raise ValueError(f'Could not parse dropdown, invalid node name {node}')
 
@@ -175,6 +223,7 @@ parsingFunctions: dict[str, ParsingFunction] = {
     "textbox": parse_textbox,
     "statusbar": parse_statusbar,
     "selectionlist": parse_selectionlist,
+    "virtuallist": parse_virtuallist,
     "horizontalslider": parse_horizontalslider,
     "dropdownmenu": parse_dropdownmenu,
     "textentrybox": parse_textentrybox,
@@ -187,62 +236,250 @@ pygame_gui.core.ObjectID()
 # def parse_xml_node(node: xmlast.XMLNode, info: ParsingInfo) -> pygame_gui.core.UIElement:
     # objectid = get_object_id(node)
 
-def parse_node(node: pygame_gui_xml.xmlast.XMLNode, info: ParsingInfo):
-    # print("Current Tag: ", tag)
-    if is_valid_tag(node.name):
-        if node.name in parsingFunctions:
-            pygameGUIElement = parsingFunctions[node.name](node, info)
-            # print(pygameGUIElement, isinstance(pygameGUIElement, pygame_gui.core.IContainerLikeInterface))
-            nextContainer = pygameGUIElement if isinstance(pygameGUIElement, pygame_gui.core.IContainerLikeInterface) else info["container"]
+def is_buildable(node: pygame_gui_xml.xmlast.XMLNode) -> bool:
+    return is_valid_tag(node.name) and node.name in parsingFunctions
+
+# tags drawn the same every frame until their text, size or theme changes, which a static attribute can bake together
+bakeableTags: set[str] = {"panel", "label", "image"}
+
+def is_bakeable(node: pygame_gui_xml.xmlast.XMLNode) -> bool:
+    """Whether node and every element below it are non-interactive, so that they can be drawn once into a single surface"""
+    return all([ subnode.name in bakeableTags for subnode in [node, *node.find_all_with_attrs([])] if is_buildable(subnode) ])
+
+def is_static(node: pygame_gui_xml.xmlast.XMLNode) -> bool:
+    """Whether node is built as a single StaticLayer in place of its elements"""
+    return node.attrs.get("static") == True and is_bakeable(node)
+
+def iter_parse_node(node: pygame_gui_xml.xmlast.XMLNode, info: ParsingInfo, elements: ElementMap | None = None, stats: pygame_gui_xml.profiling.ProfileStats | None = None, bake: bool = True) -> Iterator[tuple[pygame_gui_xml.xmlast.XMLNode, pygame_gui.core.UIElement]]:
+    """
+    Creates the pygame_gui elements of node and its children one at a time in document order, yielding each node along with its element
+
+    Every element is created after its parent and earlier siblings, so it can be paused between any two elements.
+    Created elements are recorded in elements when given, and timed under the "build" phase of their tag name when given stats
+
+    With bake, nodes marked static are built as a single StaticLayer, and the nodes below them get no element
+    """
+    stack: list[tuple[pygame_gui_xml.xmlast.XMLNode, ParsingInfo]] = [(node, info)]
+    while len(stack) > 0:
+        current, currentInfo = stack.pop()
+        if not is_valid_tag(current.name):
+            # item and option tags are read by their parent element rather than parsed on their own
+            logger.debug("Could not parse node %s, seen as invalid", current)
+            continue
+        if not current.name in parsingFunctions:
+            logger.warning("Could not find corresponding parsing function for node %s", current)
+            continue
+
+        static = bake and current.attrs.get("static") == True
+        if static and not is_bakeable(current):
+            logger.warning("Could not bake static node %s, only subtrees of %s can be baked", current, sorted(bakeableTags))
+            static = False
+        parsingFunction = StaticLayer if static else parsingFunctions[current.name]
+        if stats is None:
+            pygameGUIElement = parsingFunction(current, currentInfo)
+        else:
+            start = time.perf_counter()
+            pygameGUIElement = parsingFunction(current, currentInfo)
+            stats.record("build", time.perf_counter() - start, current.name)
+        if not elements is None:
+            elements[current] = pygameGUIElement
+        yield current, pygameGUIElement
+
+        if len(current.children) > 0 and not static:
+            nextContainer = pygameGUIElement if isinstance(pygameGUIElement, pygame_gui.core.IContainerLikeInterface) else currentInfo["container"]
             nextInfo: ParsingInfo = {
-                "manager": info["manager"],
+                "manager": currentInfo["manager"],
                 "parent_element": pygameGUIElement,
                 "container": nextContainer 
             }
+            stack.extend([ (child, nextInfo) for child in reversed(current.children) ])
 
-            for child in node.children:
-                parse_node(child, nextInfo)
-        else:
-            print(f'Could not find corresponding parsing function for node {node}')
-    else:
-        print(f'Could not parse node {node}, seen as invalid')
+def parse_node(node: pygame_gui_xml.xmlast.XMLNode, info: ParsingInfo, elements: ElementMap | None = None, stats: pygame_gui_xml.profiling.ProfileStats | None = None, bake: bool = True) -> pygame_gui.core.UIElement | None:
+    """
+    Creates the pygame_gui element of node and its children, recording each created element of a node in elements when given
+
+    When given stats, the constructor of every element is timed under the "build" phase of its tag name
+    """
+    top = None
+    for current, pygameGUIElement in iter_parse_node(node, info, elements, stats, bake):
+        if current is node:
+            top = pygameGUIElement
+    return top
+
+def count_buildable(node: pygame_gui_xml.xmlast.XMLNode) -> int:
+    """The number of elements parse_node creates for node"""
+    count = 0
+    stack = [node]
+    while len(stack) > 0:
+        current = stack.pop()
+        if is_buildable(current):
+            count += 1
+            if not is_static(current):
+                stack.extend(current.children)
+    return count
+
+
+def get_theme_names(node: pygame_gui_xml.xmlast.XMLNode) -> list[str]:
+    return [ theme.text.strip() for theme in node.find_all("theme") ]
+
+def get_theme_paths(node: pygame_gui_xml.xmlast.XMLNode, themes: Iterable[str] = ()) -> list[str]:
+    """The absolute paths of the given themes followed by the themes imported in the document, each listed once"""
+    paths = [ str(os.path.abspath(theme)) for theme in themes ]
+    if "path" in node.attrs:
+        directory = os.path.abspath( os.path.dirname(node.attrs["path"]) )
+        paths.extend([ str(os.path.join(directory, name)) for name in get_theme_names(node) ])
+    return list(dict.fromkeys(paths))
 
+def get_body(node: pygame_gui_xml.xmlast.XMLNode) -> pygame_gui_xml.xmlast.XMLNode:
+    top = node.find("body")
+    if top is None:
+        raise ValueError("Could not parse PygameGUI XML: XML Node Tree has no body")
+    return top
+
+def parse_xml_tree(manager: pygame_gui.UIManager, node: pygame_gui_xml.xmlast.XMLNode, themes: Iterable[str], use_themes_in_file: bool = True, stats: pygame_gui_xml.profiling.ProfileStats | None = None, resolve_layout: bool = True) -> pygame_gui_xml.guitree.GUITree:
+    """
+    Builds the pygame_gui elements of a parsed document, returning the GUITree of the element created for each node
 
-def parse_xml_tree(manager: pygame_gui.UIManager, node: pygame_gui_xml.xmlast.XMLNode, themes: Iterable[str], use_themes_in_file: bool = True):
+    When given stats, theme loading, image decoding, the whole build and each element constructor are timed into it.
+    Relative rects are resolved for the window of manager first, unless resolve_layout is False because a Layout was
+    already applied to node, as GUI does
+    """
     info: ParsingInfo = {
         "manager": manager,
         "parent_element": None,
         "container": None 
     }
 
+    top = get_body(node)
+    if resolve_layout:
+        pygame_gui_xml.layout.resolve_tree(node, manager.window_resolution)
     if use_themes_in_file:
-        for theme in themes:
-            abspath = str(os.path.abspath(theme))
-            print("Loading Theme", abspath)
-            manager.get_theme().load_theme(abspath)
-
-        themesNode = node.find("themes")
-        if not themesNode is None:
-            importedThemes = [theme.text.strip() for theme in themesNode.find_all("theme")]
-            print(node)
-            if "path" in node.attrs:
-                for theme in importedThemes:
-                    abspath = str(os.path.join(os.path.abspath( os.path.dirname(node.attrs["path"]) ), theme ))
-                    print("Loading Theme", abspath)
-                    manager.get_theme().load_theme(abspath)
+        with pygame_gui_xml.profiling.timed(stats, "themes"):
+            pygame_gui_xml.assets.theme_cache.apply(manager, get_theme_paths(node, themes))
 
+    elements = pygame_gui_xml.guitree.GUITree(node)
+    if stats is None:
+        parse_node(top, info, elements)
+        return elements
 
-    top = node.find("body")
-    if top is None:
-        raise ValueError("Could not parse PygameGUI XML: XML Node Tree has no body")
+    imageCache = pygame_gui_xml.assets.image_cache
+    decodeTime, misses = imageCache.decode_time, imageCache.misses
+    with stats.timed("build tree"):
+        parse_node(top, info, elements, stats)
+    if imageCache.misses > misses:
+        stats.record("image decode", imageCache.decode_time - decodeTime, count=imageCache.misses - misses)
+    return elements
+
+# Bump whenever the code generated by pygame_gui_xml.compiler changes, so that stale compiled modules are rejected
+COMPILED_FORMAT_VERSION = 2
 
-    parse_node(top, info)
+def check_compiled_module(module: types.ModuleType):
+    version = getattr(module, "COMPILED_FORMAT", None)
+    if version != COMPILED_FORMAT_VERSION:
+        raise ValueError(f'Could not load compiled layout {module.__name__}: compiled format {version}, expected {COMPILED_FORMAT_VERSION}, recompile it with pygame_gui_xml.compiler')
+
+def build_compiled_tree(manager: pygame_gui.UIManager, module: types.ModuleType, node: pygame_gui_xml.xmlast.XMLNode, themes: Iterable[str], use_themes_in_file: bool = True, stats: pygame_gui_xml.profiling.ProfileStats | None = None, resolve_layout: bool = True) -> pygame_gui_xml.guitree.GUITree:
+    """
+    Builds the elements of a layout compiled by pygame_gui_xml.compiler, where node is a tree returned by the get_node_tree
+    of module, returning the same GUITree as parse_xml_tree would, with the same resolve_layout
+    """
+    if resolve_layout:
+        pygame_gui_xml.layout.resolve_tree(node, manager.window_resolution)
+    if use_themes_in_file:
+        with pygame_gui_xml.profiling.timed(stats, "themes"):
+            pygame_gui_xml.assets.theme_cache.apply(manager, get_theme_paths(node, themes))
+    elements = pygame_gui_xml.guitree.GUITree(node)
+    with pygame_gui_xml.profiling.timed(stats, "build tree"):
+        module.build(manager, [node, *node.find_all_with_attrs([])], elements)
+    return elements
+
+DEFAULT_BUILD_BUDGET = 0.004
+
+class IncrementalBuild():
+    """
+    Builds the elements of a parsed document a few at a time, so that a large interface can be built over several frames
+
+    Each step loads the themes or creates elements in document order until budget seconds have passed, always making
+    some progress. elements is the GUITree of the elements created so far, and on_complete is called with the build once
+    the last element was created. resolve_layout is as in parse_xml_tree
+    """
+    def __init__(self, manager: pygame_gui.UIManager, node: pygame_gui_xml.xmlast.XMLNode, themes: Iterable[str] = (), use_themes_in_file: bool = True, budget: float = DEFAULT_BUILD_BUDGET, on_complete: Callable[["IncrementalBuild"], None] | None = None, stats: pygame_gui_xml.profiling.ProfileStats | None = None, resolve_layout: bool = True):
+        self.manager = manager
+        self.node = node
+        self.budget = budget
+        self.on_complete = on_complete
+        self.stats = stats
+        self.top = get_body(node)
+        if resolve_layout:
+            pygame_gui_xml.layout.resolve_tree(node, manager.window_resolution)
+        self.elements = pygame_gui_xml.guitree.GUITree(node)
+        self.total = count_buildable(self.top)
+        self.built = 0
+        self.done = False
+        self._steps = self._run(get_theme_paths(node, themes) if use_themes_in_file else None)
+
+    def _run(self, themePaths: list[str] | None) -> Iterator[None]:
+        if not themePaths is None:
+            with pygame_gui_xml.profiling.timed(self.stats, "themes"):
+                pygame_gui_xml.assets.theme_cache.apply(self.manager, themePaths)
+            yield
+        info: ParsingInfo = { "manager": self.manager, "parent_element": None, "container": None }
+        for _ in iter_parse_node(self.top, info, self.elements, self.stats):
+            self.built += 1
+            yield
+
+    @property
+    def progress(self) -> float:
+        """The fraction of the elements created so far, from 0 to 1"""
+        if self.done:
+            return 1.0
+        return self.built / self.total if self.total > 0 else 0.0
+
+    def step(self, budget: float | None = None) -> bool:
+        """Builds for up to budget seconds, or the budget of the build if not given, returning whether the build is complete"""
+        if self.done:
+            return True
+        budget = self.budget if budget is None else budget
+        with pygame_gui_xml.profiling.timed(self.stats, "build step"):
+            start = time.perf_counter()
+            for _ in self._steps:
+                if time.perf_counter() - start >= budget:
+                    return False
+        self.done = True
+        if not self.on_complete is None:
+            self.on_complete(self)
+        return True
+
+    def finish(self):
+        """Builds every remaining element right away"""
+        self.step(math.inf)
+
+def relayout_elements(manager: pygame_gui.UIManager, elements: ElementMap, size: tuple[int, int]):
+    """Moves and resizes already created elements to the current rects of their nodes, without recreating them"""
+    manager.set_window_resolution(size)
+    for node, element in elements.items():
+        if "rect" in node.attrs:
+            rect = pygame.Rect(node.attrs["rect"])
+            element.set_relative_position(rect.topleft)
+            element.set_dimensions(rect.size)
+        elif node.name == "body":
+            element.set_dimensions(size)
     
 
+_unflushed = object()
 
 class GUIState(Generic[T]):
-    def __init__(self, value: T):
+    """
+    A value whose subscribers are notified once per flush rather than on every set
+
+    Setting an equal value does nothing, and a value set back to what was last flushed notifies no one
+    """
+    def __init__(self, value: T, store: "GUIStateStore | None" = None, key: str = ""):
         self._value = value
+        self._flushed = _unflushed
+        self._dirty = False
+        self._store = store
+        self._key = key
         self._subscribed: dict[str, Callable[[T], None]] = {}
 
     def subscribe(self, _id: str, callback: Callable[[T], None]):
@@ -256,40 +493,657 @@ class GUIState(Generic[T]):
     def _fire(self):
         for callback in self._subscribed.values():
             callback(self._value)
+
+    def _mark_dirty(self):
+        if not self._dirty:
+            self._dirty = True
+            if not self._store is None:
+                self._store._dirty[self._key] = self
     
     def set(self, value: T):
-        self._value = value
+        if self._flushed is _unflushed or value != self._value:
+            self._value = value
+            self._mark_dirty()
 
     def get(self) -> T:
         return self._value
 
+    def flush(self) -> bool:
+        """Notifies the subscribers if the value changed since the last flush, returning whether it did"""
+        if not self._dirty:
+            return False
+        self._dirty = False
+        if not self._flushed is _unflushed and self._flushed == self._value:
+            return False
+        self._flushed = self._value
+        self._fire()
+        return True
+
+class GUIStateStore():
+    """The keyed GUIStates which bind attributes of a GUI, holding a queue of the states set since the last flush"""
+    def __init__(self):
+        self._states: dict[str, GUIState] = {}
+        self._dirty: dict[str, GUIState] = {}
+
+    def __getitem__(self, key: str) -> GUIState:
+        return self._states[key]
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._states
+
+    def get_state(self, key: str, default=None) -> GUIState:
+        """The state of key, created with default as its value if it does not exist yet"""
+        if not key in self._states:
+            self._states[key] = GUIState(default, self, key)
+        return self._states[key]
+
+    def set(self, key: str, value):
+        self.get_state(key).set(value)
+
+    def get(self, key: str, default=None):
+        state = self._states.get(key)
+        return default if state is None else state.get()
+
+    def flush(self) -> list[str]:
+        """Flushes every state set since the last flush, returning the keys whose values changed"""
+        dirty, self._dirty = self._dirty, {}
+        return [ key for key, state in dirty.items() if state.flush() ]
+
+Binding = tuple[pygame_gui_xml.xmlast.XMLNode, str]
+
+def get_bindings(node: pygame_gui_xml.xmlast.XMLNode) -> dict[str, list[Binding]]:
+    """The nodes bound to each state key, along with the bound target"""
+    bindings: dict[str, list[Binding]] = {}
+    for bound in node.find_all_with_attrs(["bind"]):
+        for target, key in bound.attrs["bind"].items():
+            bindings.setdefault(key, []).append((bound, target))
+    return bindings
+
+def apply_binding(node: pygame_gui_xml.xmlast.XMLNode, element: pygame_gui.core.UIElement, target: str, value):
+    """
+    Shows value on the bound target of element, where "{}" in the text of node is replaced by the value when present
+
+    The bind schema of each tag only accepts the targets its element can show, see _config.get_bind_targets
+    """
+    if target == "text" and hasattr(element, "set_text"):
+        text = node.text.replace("{}", str(value)) if "{}" in node.text else str(value)
+        element.set_text(text)
+    elif target == "rect":
+        rect = pygame.Rect(value)
+        element.set_relative_position(rect.topleft)
+        element.set_dimensions(rect.size)
+    elif target == "visible":
+        if value and not element.visible:
+            element.show()
+        elif not value and element.visible:
+            element.hide()
+    elif target == "value" and isinstance(element, pygame_gui.elements.UISelectionList):
+        element.set_item_list(value)
+    elif target == "value" and isinstance(element, pygame_gui_xml.virtuallist.VirtualDropDownMenu):
+        element.set_options(value)
+    elif target == "value" and isinstance(element, pygame_gui.elements.UIHorizontalSlider):
+        element.set_current_value(value)
+    elif target == "value" and isinstance(element, pygame_gui.elements.UIStatusBar):
+        element.percent_full = value
+    elif target == "value" and hasattr(element, "set_text"):
+        element.set_text(str(value))
+    else:
+        raise ValueError(f'Could not bind {target} of {node.name}, {type(element).__name__} cannot show it')
+
+# tags whose element text can be changed without recreating the element
+_textSettableTags: set[str] = {"label", "button", "textbox"}
+
+class StaticLayer(pygame_gui.elements.UIImage):
+    """
+    The elements of a node marked static and of every node below it, drawn once into a single surface and shown as one
+    image, so that the manager updates and draws one element in place of the whole subtree
+
+    The subtree is baked again on the next update after the layer is resized, after the theme changes or after a state
+    bound inside of it changes, by creating its elements for a moment and drawing them into a new surface. bake_count
+    counts the bakes
+    """
+    def __init__(self, node: pygame_gui_xml.xmlast.XMLNode, info: ParsingInfo):
+        self.node = node
+        self.info = info
+        self.bound_values: dict[Binding, object] = {}
+        self.bake_count = 0
+        surface, rect = self._render()
+        super().__init__(rect, surface, info["manager"], image_is_alpha_premultiplied=True, container=info["container"], parent_element=info["parent_element"], anchors=node.attrs.get("anchors") or {}, object_id=get_object_id(node))
+        self._needs_bake = False
+
+    def _render(self) -> tuple[pygame.Surface, pygame.Rect]:
+        elements: dict[pygame_gui_xml.xmlast.XMLNode, pygame_gui.core.UIElement] = {}
+        top = parse_node(self.node, self.info, elements, bake=False)
+        # keeps the size of a layer resized apart from its node, such as by a bound rect
+        current: pygame.Rect | None = getattr(self, "relative_rect", None)
+        if not current is None and current.size != top.relative_rect.size:
+            top.set_dimensions(current.size)
+        for (node, target), value in self.bound_values.items():
+            if node in elements:
+                apply_binding(node, elements[node], target, value)
+                # changed text is drawn into the image of an element on its next update
+                elements[node].update(0.0)
+        created = set(elements.values())
+        origin = top.rect.topleft
+        surface = pygame.Surface(top.rect.size, pygame.SRCALPHA)
+        # element images are alpha premultiplied, and are drawn in the same order and blend mode as the manager draws them
+        surface.blits([ (sprite.image, sprite.rect.move(-origin[0], -origin[1]), None, sprite.blit_data[3])
+            for sprite in self.info["manager"].get_sprite_group().sprites() if sprite in created and sprite.visible and not sprite.image is None ])
+        rect = top.relative_rect.copy()
+        top.kill()
+        self.bake_count += 1
+        return surface, rect
+
+    def bake(self):
+        """Draws the subtree into a new surface right away"""
+        surface, rect = self._render()
+        if rect.size != self.rect.size:
+            super().set_dimensions(rect.size)
+        self.set_image(surface, image_is_alpha_premultiplied=True)
+        self._needs_bake = False
+
+    def set_node(self, node: pygame_gui_xml.xmlast.XMLNode, renamed: dict[pygame_gui_xml.xmlast.XMLNode, pygame_gui_xml.xmlast.XMLNode] | None = None):
+        """
+        Shows the subtree of node in place of the current one. Given renamed, which maps every node of the current
+        subtree to an unchanged node of the new one, the surface and the bound values are kept. Otherwise the subtree is
+        baked again, forgetting the values bound inside the current one
+        """
+        self.node = node
+        if renamed is None:
+            self.bound_values.clear()
+            self._needs_bake = True
+            return
+        self.bound_values = { (renamed[boundNode], target): value for (boundNode, target), value in self.bound_values.items() if boundNode in renamed }
+
+    def set_binding(self, binding: Binding, value):
+        """Shows value on the bound target of a node of the subtree, where the visibility and rect of the layer itself need no bake"""
+        node, target = binding
+        if node is self.node and target in ("visible", "rect"):
+            apply_binding(node, self, target, value)
+            return
+        if binding in self.bound_values and self.bound_values[binding] == value:
+            return
+        self.bound_values[binding] = value
+        self._needs_bake = True
+
+    def set_dimensions(self, dimensions, clamp_to_container: bool = False):
+        super().set_dimensions(dimensions, clamp_to_container)
+        self._needs_bake = True
+
+    def rebuild_from_changed_theme_data(self):
+        super().rebuild_from_changed_theme_data()
+        self._needs_bake = True
+
+    def update(self, time_delta: float):
+        super().update(time_delta)
+        if self._needs_bake:
+            self.bake()
+
+def get_nearest_container(node: pygame_gui_xml.xmlast.XMLNode | None, elements: ElementMap) -> pygame_gui.core.IContainerLikeInterface | None:
+    while not node is None:
+        element = elements.get(node)
+        if isinstance(element, pygame_gui.core.IContainerLikeInterface):
+            return element
+        node = node.parent
+    return None
+
+def get_parsing_info(manager: pygame_gui.UIManager, node: pygame_gui_xml.xmlast.XMLNode, elements: ElementMap) -> ParsingInfo:
+    """The parsing info parse_node would pass to node, rebuilt from the elements of its ancestors"""
+    return {
+        "manager": manager,
+        "parent_element": elements.get(node.parent) if not node.parent is None else None,
+        "container": get_nearest_container(node.parent, elements)
+    }
+
+def kill_subtree_elements(node: pygame_gui_xml.xmlast.XMLNode, elements: ElementMap):
+    for subnode in [node, *node.find_all_with_attrs([])]:
+        element = elements.pop(subnode, None)
+        if not element is None and element.alive():
+            element.kill()
+
+def get_element_owner(node: pygame_gui_xml.xmlast.XMLNode | None, elements: ElementMap) -> pygame_gui_xml.xmlast.XMLNode | None:
+    """The closest node, starting from node itself, which has an element"""
+    while not node is None and not node in elements:
+        node = node.parent
+    return node
+
+def patch_elements(manager: pygame_gui.UIManager, elements: ElementMap, diff: pygame_gui_xml.xmldiff.XMLTreeDiff) -> pygame_gui_xml.guitree.GUITree | None:
+    """
+    Applies a diff between an old and a new node tree to the live elements of the old tree, returning the element of each new node
+
+    Matched elements are kept with their state, rect and text changes are applied in place, and any other change recreates the
+    closest element holding the changed node. Returns None when a change lies outside of every element, which needs a full rebuild
+    """
+    firstMatch = next(iter(diff.matches), None)
+    patched = pygame_gui_xml.guitree.GUITree(None if firstMatch is None else firstMatch.get_root())
+    for new, old in diff.matches.items():
+        if old in elements:
+            patched[new] = elements[old]
+    oldToNew = { old: new for new, old in diff.matches.items() }
+    # the static layers holding a change are baked again, the others only move to their new nodes
+    changedSubtrees: set[pygame_gui_xml.xmlast.XMLNode] = set()
+    for change in diff.changes:
+        node = change.new if change.kind != "kill" else oldToNew.get(change.old.parent)
+        while not node is None and not node in changedSubtrees:
+            changedSubtrees.add(node)
+            node = node.parent
+    for new, old in diff.matches.items():
+        if isinstance(elements.get(old), StaticLayer):
+            elements[old].set_node(new, None if new in changedSubtrees else oldToNew)
+    recreated: set[pygame_gui_xml.xmlast.XMLNode] = set()
+    creates: list[pygame_gui_xml.xmlast.XMLNode] = []
+    kills: list[pygame_gui_xml.xmlast.XMLNode] = []
+    updates: list[pygame_gui_xml.xmldiff.XMLNodeChange] = []
+
+    for change in diff.changes:
+        if change.kind == "kill" and change.old in elements:
+            kills.append(change.old)
+            continue
+        if change.kind == "create" and change.new.name in parsingFunctions and change.new.parent in patched:
+            creates.append(change.new)
+            continue
+        if change.kind == "update" and change.new in patched and change.attrs <= {"rect", "bind"} and (not change.text or change.new.name in _textSettableTags) and not isinstance(patched[change.new], StaticLayer):
+            updates.append(change)
+            continue
+
+        if change.kind == "kill":
+            oldOwner = get_element_owner(change.old.parent, elements)
+            owner = oldToNew.get(oldOwner) if not oldOwner is None else None
+        else:
+            owner = get_element_owner(change.new if change.kind == "update" else change.new.parent, patched)
+        if owner is None:
+            return None
+        recreated.add(owner)
+
+    def is_recreated(node: pygame_gui_xml.xmlast.XMLNode | None) -> bool:
+        while not node is None:
+            if node in recreated:
+                return True
+            node = node.parent
+        return False
+
+    for old in kills:
+        kill_subtree_elements(old, elements)
+    for new in recreated:
+        if is_recreated(new.parent):
+            continue
+        kill_subtree_elements(diff.matches[new], elements)
+        for subnode in [new, *new.find_all_with_attrs([])]:
+            patched.pop(subnode, None)
+        parse_node(new, get_parsing_info(manager, new, patched), patched)
+    for change in updates:
+        if is_recreated(change.new):
+            continue
+        element = patched[change.new]
+        if "rect" in change.attrs:
+            rect = pygame.Rect(change.new.attrs["rect"])
+            element.set_relative_position(rect.topleft)
+            element.set_dimensions(rect.size)
+        if change.text:
+            element.set_text(change.new.text)
+    for new in creates:
+        if not is_recreated(new.parent):
+            parse_node(new, get_parsing_info(manager, new, patched), patched)
+    return patched
+
+resizeModes: list[str] = ["rebuild", "relayout"]
+
+def parse_source(source: str, cache: pygame_gui_xml.xmlcache.ASTCache | None = None, stats: pygame_gui_xml.profiling.ProfileStats | None = None) -> pygame_gui_xml.xmlast.XMLNode:
+    """
+    Parses and validates the layout file at source with xmlparser.parse_pygame_xml
+
+    xmlparser is imported on the first parse, so that interfaces built from compiled modules never load the schemas
+    """
+    import pygame_gui_xml.xmlparser
+    return pygame_gui_xml.xmlparser.parse_pygame_xml(source, cache, stats=stats)
+
+def preload_document(source: str, themes: Iterable[str] = (), use_themes_in_file: bool = True, cache: pygame_gui_xml.xmlcache.ASTCache | None = None) -> pygame_gui_xml.xmlast.XMLNode:
+    """
+    Parses source and reads its themes and images into the shared asset caches, leaving only work that needs the main
+    thread, creating elements and converting surfaces, to building the interface. Safe to call from any thread
+    """
+    nodetree = parse_source(source, cache)
+    for path in get_theme_paths(nodetree, themes) if use_themes_in_file else []:
+        try:
+            pygame_gui_xml.assets.theme_cache.get(path)
+        except (OSError, ValueError):
+            pass # reported when the themes are applied
+    for image in nodetree.find_all_with_attrs(["src"]):
+        pygame_gui_xml.assets.image_cache.preload(image.attrs["src"])
+    return nodetree
+
+_loaderPool: concurrent.futures.ThreadPoolExecutor | None = None
+
+def get_loader_pool() -> concurrent.futures.ThreadPoolExecutor:
+    """The shared worker pool of GUI.load_async"""
+    global _loaderPool
+    if _loaderPool is None:
+        _loaderPool = concurrent.futures.ThreadPoolExecutor(thread_name_prefix="pygame_gui_xml")
+    return _loaderPool
+
+class GUILoad():
+    """
+    Handle of a GUI loading in the background, to be polled from the game loop
+
+    poll returns None while the document is being parsed and its assets read, then builds and returns the GUI on
+    the calling thread, which must be the main thread. An error raised while loading is raised again by poll
+    """
+    def __init__(self, future: concurrent.futures.Future, finalize: Callable[[pygame_gui_xml.xmlast.XMLNode], "GUI"]):
+        self._future = future
+        self._finalize = finalize
+        self._gui: GUI | None = None
+
+    def done(self) -> bool:
+        return self._future.done()
+
+    def poll(self) -> "GUI | None":
+        if not self._gui is None:
+            return self._gui
+        if not self._future.done():
+            return None
+        self._gui = self._finalize(self._future.result())
+        return self._gui
+
+    def result(self, timeout: float | None = None) -> "GUI":
+        """Waits for the background work to complete, then builds and returns the GUI"""
+        self._future.result(timeout)
+        return self.poll()
+
+    def cancel(self) -> bool:
+        return self._future.cancel()
+
 class GUI():
-    def __init__(self, source: str, *themes: str, use_themes_in_file: bool = True):
-        self.source = source
+    """
+    Builds and runs a pygame_gui interface from a pygame_gui_xml file, from the node tree of an already parsed file,
+    or from a module compiled by pygame_gui_xml.compiler, which is built without parsing or validating any XML.
+    Compiled layouts are not hot reloaded
+
+    On window resizes layout resolves every rect again from the lengths in the source, scaling pixels from the base
+    resolution and relative units from the new sizes (see pygame_gui_xml.layout), then the interface is either rebuilt from scratch
+    (resize_mode "rebuild") or its existing elements are moved and resized in place (resize_mode "relayout").
+    Resize events only record the latest size: the resize itself happens once in update, after no resize event
+    arrived for resize_debounce seconds. resize_count counts the resizes applied
+
+    With hot_reload, the source file is checked for changes every hot_reload_interval seconds during update, and the
+    elements are patched to match the edited layout while unchanged elements keep their state
+
+    elements is the GUITree of the created elements, which looks up elements by node, id or class in constant time
+
+    Elements with a bind attribute show the values of state, a GUIStateStore. Setting a state only queues it, and all
+    of the states set during a frame are shown at once in update, touching only the targets whose value changed
+
+    With profile, or when given a profile_callback, stats is a ProfileStats timing every phase of loading, building,
+    resizing and reloading the interface, and profile_callback is called with each measurement. Otherwise stats is None
+    and nothing is measured
+
+    With incremental, construct only starts an IncrementalBuild, and update creates elements for up to build_budget
+    seconds per frame until it completes, calling on_build_complete with the GUI. build_progress tells how far it got
+
+    The rects resolved for the layout_cache_size most recent window sizes are kept, so that switching back to a size
+    seen before applies its stored rects directly. With resize_mode "relayout", that switch only moves and resizes the
+    existing elements
+    """
+    def __init__(self, source: str | pygame_gui_xml.xmlast.XMLNode | types.ModuleType, *themes: str, use_themes_in_file: bool = True, cache: pygame_gui_xml.xmlcache.ASTCache | None = None, resize_mode: str = "rebuild", resize_debounce: float = 0, hot_reload: bool = False, hot_reload_interval: float = 0.5, profile: bool = False, profile_callback: pygame_gui_xml.profiling.ProfileCallback | None = None, incremental: bool = False, build_budget: float = DEFAULT_BUILD_BUDGET, on_build_complete: Callable[["GUI"], None] | None = None, layout_cache_size: int = pygame_gui_xml.layout.DEFAULT_CACHE_SIZE):
+        if not resize_mode in resizeModes:
+            raise ValueError(f'Unknown resize mode {resize_mode}, expected one of {resizeModes}')
+        self.compiled: types.ModuleType | None = source if isinstance(source, types.ModuleType) else None
+        if not self.compiled is None:
+            check_compiled_module(self.compiled)
+            nodetree = self.compiled.get_node_tree()
+            self.source: str | None = None
+        else:
+            nodetree = source if isinstance(source, pygame_gui_xml.xmlast.XMLNode) else None
+            self.source = source if nodetree is None else nodetree.attrs.get("path")
         self.themes = themes
         self.use_themes_in_file = use_themes_in_file
-        self.manager = pygame_gui.UIManager(pygame.display.get_window_size())
-        self.nodetree: pygame_gui_xml.xmlast.XMLNode = pygame_gui_xml.xmlparser.parse_pygame_xml(source)
-        parse_xml_tree(self.manager, self.nodetree, self.themes, self.use_themes_in_file)
+        self.cache = cache
+        self.resize_mode = resize_mode
+        self.resize_debounce = resize_debounce
+        self.resize_count = 0
+        self._pending_size: tuple[int, int] | None = None
+        self._last_resize_event = 0.0
+        self.hot_reload = hot_reload
+        self.hot_reload_interval = hot_reload_interval
+        self._source_mtime = os.path.getmtime(self.source) if not self.source is None else 0.0
+        self._last_reload_check = time.perf_counter()
+        self.stats = pygame_gui_xml.profiling.ProfileStats(profile_callback) if profile or not profile_callback is None else None
+        with pygame_gui_xml.profiling.timed(self.stats, "manager"):
+            self.manager = pygame_gui.UIManager(pygame.display.get_window_size())
+        self.incremental = incremental
+        self.build_budget = build_budget
+        self.on_build_complete = on_build_complete
+        self._build: IncrementalBuild | None = None
+        self.state = GUIStateStore()
+        self.bindings: dict[str, list[Binding]] = {}
+        self._bound_values: dict[Binding, object] = {}
+        self._event_bindings: dict[str, tuple[str, int, pygame_gui_xml.guitree.EventHandler]] = {}
+        self.nodetree: pygame_gui_xml.xmlast.XMLNode = nodetree if not nodetree is None else parse_source(source, cache, self.stats)
+        self.base_resolution: tuple[int, int] = tuple(self.manager.window_resolution)
+        self.size = self.base_resolution
+        self.layout_cache_size = layout_cache_size
+        self.layout = pygame_gui_xml.layout.Layout(self.nodetree, layout_cache_size)
+        self._apply_layout()
+        self._construct_elements()
+
+    @classmethod
+    def load_async(cls, source: str, *themes: str, use_themes_in_file: bool = True, cache: pygame_gui_xml.xmlcache.ASTCache | None = None, executor: concurrent.futures.Executor | None = None, **kwargs) -> GUILoad:
+        """
+        Parses source and reads its assets on a worker thread, returning a GUILoad which builds the GUI once polled
+        after the work is done. The other keyword arguments are passed to GUI
+        """
+        future = (executor or get_loader_pool()).submit(preload_document, source, themes, use_themes_in_file, cache)
+        return GUILoad(future, lambda nodetree: cls(nodetree, *themes, use_themes_in_file=use_themes_in_file, cache=cache, **kwargs))
+
+    def get_element(self, _id: str) -> pygame_gui.core.UIElement | None:
+        return self.elements.get_element(_id)
+
+    def construct(self, size: tuple[int, int] | None = None):
+        with pygame_gui_xml.profiling.timed(self.stats, "clear"):
+            self.manager.clear_and_reset()
+            self.manager.set_window_resolution(size or pygame.display.get_window_size())
+        self._construct_elements()
+
+    def _construct_elements(self):
+        if self.incremental:
+            self._build = IncrementalBuild(self.manager, self.nodetree, self.themes, self.use_themes_in_file, self.build_budget, stats=self.stats, resolve_layout=False)
+            self.elements = self._build.elements
+            return
+        self._build = None
+        if self.compiled is None:
+            self.elements = parse_xml_tree(self.manager, self.nodetree, self.themes, self.use_themes_in_file, self.stats, resolve_layout=False)
+        else:
+            self.elements = build_compiled_tree(self.manager, self.compiled, self.nodetree, self.themes, self.use_themes_in_file, self.stats, resolve_layout=False)
+        self._finish_elements()
+
+    def _finish_elements(self):
+        self.bind_elements()
+        self._bind_events()
+
+    @property
+    def build_progress(self) -> float:
+        """The fraction of the elements built so far, which is 1 once the interface is complete"""
+        return 1.0 if self._build is None else self._build.progress
+
+    def is_building(self) -> bool:
+        return not self._build is None
+
+    def step_build(self, budget: float | None = None) -> bool:
+        """Continues an incremental build for up to budget seconds, returning whether the interface is complete"""
+        if self._build is None:
+            return True
+        if not self._build.step(budget):
+            return False
+        self._build = None
+        self._finish_elements()
+        if not self.on_build_complete is None:
+            self.on_build_complete(self)
+        return True
+
+    def finish_build(self):
+        """Builds every remaining element of an incremental build right away"""
+        self.step_build(math.inf)
+
+    def relayout(self, size: tuple[int, int] | None = None):
+        with pygame_gui_xml.profiling.timed(self.stats, "relayout"):
+            relayout_elements(self.manager, self.elements, size or pygame.display.get_window_size())
+
+    def _apply_layout(self):
+        """Resolves every rect from its original lengths for the current size, scaling pixels from the base resolution"""
+        scale = ( self.size[0] / self.base_resolution[0], self.size[1] / self.base_resolution[1] )
+        with pygame_gui_xml.profiling.timed(self.stats, "layout"):
+            self.layout.apply(self.size, scale)
 
-    def construct(self):
-        self.manager.clear_and_reset()
-        self.manager.set_window_resolution(pygame.display.get_window_size())
-        parse_xml_tree(self.manager, self.nodetree, self.themes, self.use_themes_in_file)
+    def resize(self, size: tuple[int, int]):
+        """Resolves every rect from its original lengths for the new window size, then rebuilds or relays out the interface"""
+        self.size = tuple(size)
+        self.resize_count += 1
+        self._apply_layout()
+        if self.resize_mode == "relayout":
+            self.relayout(size)
+            self.bind_elements()
+        else:
+            self.construct(size)
+
+    def bind_event(self, _id: str, elementId: str, eventType: int, callback: pygame_gui_xml.guitree.EventHandler):
+        """Binds callback to the events of eventType targeting the elements with the id elementId, kept across rebuilds and hot reloads"""
+        self.unbind_event(_id)
+        self._event_bindings[_id] = (elementId, eventType, callback)
+        if self._build is None:
+            self.elements.bind_event(_id, elementId, eventType, callback)
+
+    def unbind_event(self, _id: str):
+        binding = self._event_bindings.pop(_id, None)
+        if not binding is None:
+            for element in self.elements.get_element_by_id(binding[0]):
+                self.elements.get_tree_element(element).unbind_event(_id)
+
+    def _bind_events(self):
+        for _id, (elementId, eventType, callback) in self._event_bindings.items():
+            self.elements.bind_event(_id, elementId, eventType, callback)
 
-    def process_events(self, event: pygame.event.Event):
+    def process_events(self, event: pygame.event.Event) -> bool:
+        """Passes event to the manager, then to the handlers bound to its type and target. Returns whether the manager consumed it"""
         if event.type == pygame.VIDEORESIZE:
-            lastSize = self.manager.window_resolution
-            scale = ( event.size[0] / lastSize[0], event.size[1] / lastSize[1] )
-            nodesWithRect = self.nodetree.find_all_with_attrs(["rect"])
-            for node in nodesWithRect:
-                rect = node.attrs["rect"]
-                node.attrs["rect"] = ( rect[0] * scale[0], rect[1] * scale[1], rect[2] * scale[0], rect[3] * scale[1] )
-            self.construct()
-
-        self.manager.process_events(event)
+            self._request_resize(event.size)
+        elif event.type == pygame.WINDOWRESIZED:
+            self._request_resize((event.x, event.y))
+
+        consumed = self.manager.process_events(event)
+        self.elements.dispatch(event)
+        return consumed
+
+    def _request_resize(self, size: tuple[int, int]):
+        self._pending_size = tuple(size)
+        self._last_resize_event = time.perf_counter()
+
+    def apply_pending_resize(self, force: bool = False):
+        """Applies the latest requested window size, once the debounce interval has passed or when forced"""
+        if self._pending_size is None:
+            return
+        if not force and time.perf_counter() - self._last_resize_event < self.resize_debounce:
+            return
+        size, self._pending_size = self._pending_size, None
+        if size != self.size:
+            self.resize(size)
+    
+    def reload(self) -> bool:
+        """
+        Re-parses the source and patches the live elements to match it, falling back to a full construct when themes or
+        tags outside of any element changed. A source which fails to parse is reported and leaves the interface untouched
+        """
+        if self.source is None:
+            return False
+        try:
+            nodetree = parse_source(self.source, self.cache, self.stats)
+        except ValueError as error:
+            warnings.warn(f'Could not hot reload {self.source}: {error}', UserWarning)
+            return False
+
+        # the trees are diffed on their own lengths, as the resolved rects of every node differ at any other than the base size
+        shownRects = { node: node.attrs["rect"] for node in self.layout.nodes }
+        self.layout.restore()
+        oldtree, self.nodetree = self.nodetree, nodetree
+        self.layout = pygame_gui_xml.layout.Layout(nodetree, self.layout_cache_size)
+
+        oldBody, newBody = oldtree.find("body"), nodetree.find("body")
+        diff = None
+        # a build in progress is restarted rather than patched
+        if self._build is None and get_theme_names(oldtree) == get_theme_names(nodetree) and not oldBody is None and not newBody is None:
+            with pygame_gui_xml.profiling.timed(self.stats, "diff"):
+                diff = pygame_gui_xml.xmldiff.diff_trees(oldBody, newBody)
+        self._apply_layout()
+        patched = None
+        if not diff is None:
+            with pygame_gui_xml.profiling.timed(self.stats, "diff"):
+                pygame_gui_xml.xmldiff.add_changed_values(diff, "rect", shownRects)
+            with pygame_gui_xml.profiling.timed(self.stats, "patch"):
+                patched = patch_elements(self.manager, self.elements, diff)
+        if patched is None:
+            self.construct(self.size)
+        else:
+            self.elements = patched
+            self.bind_elements()
+            self._bind_events()
+        return True
+
+    def check_for_reload(self, force: bool = False) -> bool:
+        """Reloads the source if it was modified since it was last loaded, checking at most every hot_reload_interval seconds unless forced"""
+        now = time.perf_counter()
+        if self.source is None or not force and now - self._last_reload_check < self.hot_reload_interval:
+            return False
+        self._last_reload_check = now
+        try:
+            mtime = os.path.getmtime(self.source)
+        except OSError:
+            return False
+        if mtime == self._source_mtime:
+            return False
+        self._source_mtime = mtime
+        return self.reload()
     
+    def bind_elements(self):
+        """Collects the bindings of the node tree and shows the current value of every bound state on the current elements"""
+        self.bindings = get_bindings(self.nodetree)
+        self._bound_values.clear()
+        for key, bindings in self.bindings.items():
+            if key in self.state:
+                value = self.state.get(key)
+                for binding in bindings:
+                    self._apply_binding(binding, value)
+
+    def _apply_binding(self, binding: Binding, value):
+        if binding in self._bound_values and self._bound_values[binding] == value:
+            return
+        element = self.elements.get(binding[0])
+        if element is None:
+            # nodes below a static node are shown by the StaticLayer of the static node
+            owner = get_element_owner(binding[0], self.elements)
+            element = self.elements.get(owner) if not owner is None else None
+            if not isinstance(element, StaticLayer):
+                return
+        if isinstance(element, StaticLayer):
+            element.set_binding(binding, value)
+        else:
+            apply_binding(binding[0], element, binding[1], value)
+        self._bound_values[binding] = value
+
+    def flush_state(self) -> int:
+        """Shows every state changed since the last flush on its bound elements, returning the number of changed states"""
+        changed = self.state.flush()
+        for key in changed:
+            bindings = self.bindings.get(key)
+            if not bindings is None:
+                value = self.state.get(key)
+                for binding in bindings:
+                    self._apply_binding(binding, value)
+        return len(changed)
+
     def update(self, dt: float):
+        self.apply_pending_resize()
+        self.step_build()
+        if self.hot_reload and self._build is None:
+            self.check_for_reload()
+        self.flush_state()
         self.manager.update(dt)
 
     def draw_ui(self, target: pygame.surface.Surface):
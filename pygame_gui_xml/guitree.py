@@ -1,49 +1,226 @@
 import pygame
 import pygame_gui
 import pygame_gui_xml.xmlast as xmlast
-from typing import Callable
+from typing import Callable, Iterator
+from collections.abc import MutableMapping
 import warnings
 
 # Basically, there are some types when it comes to elements, containers
 
+EventHandler = Callable[[pygame.event.Event], None]
 
 class GUITreeElement():
-    def __init__(self, elementName: str):
-        self._elementName = elementName
-        self._container: GUITreeElement | None = None
-        self._window: GUITreeElement | None = None
-        self._parent: GUITreeElement | None = None
-        self._children = list[GUITreeElement] = []
-        self._events: dict[pygame.event.Event, dict[str, Callable]] = {}
-        self._bindedevents: dict[str, pygame.event.Event] = {}
-
-    def bind_event(self, _id: str, event: pygame.event.Event):
-        if _id in self._events:
+    """A created pygame_gui element along with the node it was created from and its closest ancestor and descendant elements"""
+    def __init__(self, node: xmlast.XMLNode, element: pygame_gui.core.UIElement, parent: "GUITreeElement | None" = None, tree: "GUITree | None" = None):
+        self._elementName = node.name
+        self.node = node
+        self.element = element
+        self._parent: GUITreeElement | None = parent
+        self._children: dict[GUITreeElement, None] = {}
+        self._tree = tree
+        self._events: dict[int, dict[str, EventHandler]] = {}
+        self._bindedevents: dict[str, int] = {}
+
+    @property
+    def parent(self) -> "GUITreeElement | None":
+        return self._parent
+
+    @property
+    def children(self) -> tuple["GUITreeElement", ...]:
+        return tuple(self._children)
+
+    def get_container(self) -> "GUITreeElement | None":
+        """The closest ancestor whose element is a container"""
+        current = self._parent
+        while not current is None and not isinstance(current.element, pygame_gui.core.IContainerLikeInterface):
+            current = current._parent
+        return current
+
+    def get_window(self) -> "GUITreeElement | None":
+        current = self._parent
+        while not current is None and not isinstance(current.element, pygame_gui.elements.UIWindow):
+            current = current._parent
+        return current
+
+    def bind_event(self, _id: str, eventType: int, callback: EventHandler):
+        """Calls callback with every event of eventType targeting this element, or with every such event when it has no ui_element"""
+        if _id in self._bindedevents:
             warnings.warn("Overwriting binded user event " + _id + ", already present in GUI Element", UserWarning)
+            self.unbind_event(_id)
 
-        if event in self._events:
-            self._events[event][_id] = event
-        else:
-            self._events[event] = {_id: event}
-        self._bindedevents[_id] = event
+        handlers = self._events.get(eventType)
+        if handlers is None:
+            handlers = self._events[eventType] = {}
+            if not self._tree is None:
+                self._tree._dispatch.setdefault(eventType, {})[self.element] = handlers
+        handlers[_id] = callback
+        self._bindedevents[_id] = eventType
 
     def unbind_event(self, _id: str):
         if _id in self._bindedevents:
-            eventType = self._bindedevents[_id]
-            del self._events[eventType][_id]
-            del self._bindedevents[_id]
+            eventType = self._bindedevents.pop(_id)
+            handlers = self._events[eventType]
+            del handlers[_id]
+            if len(handlers) == 0:
+                del self._events[eventType]
+                if not self._tree is None:
+                    self._tree._remove_handlers(eventType, self.element)
+
+    def __str__(self) -> str:
+        return f'GUITreeElement {self._elementName}: {self.element}'
+
+def get_prefixed(name: str, prefix: str) -> str:
+    return name if name.startswith(prefix) else prefix + name
+
+class GUITree(MutableMapping):
+    """
+    Think of it as the DOM Tree
+
+    Maps each node of a document to the pygame_gui element created for it, linking every element to its closest
+    ancestor and descendant elements. Elements are also indexed by id and class as they are added, so lookups
+    cost one hash lookup no matter the size of the interface
+    """
+    def __init__(self, root: xmlast.XMLNode | None = None):
+        self.root = root
+        self._nodes: dict[xmlast.XMLNode, GUITreeElement] = {}
+        self._elements: dict[pygame_gui.core.UIElement, GUITreeElement] = {}
+        # dicts instead of sets so lookups keep the order in which elements were created
+        self._id_dict: dict[str, dict[pygame_gui.core.UIElement, None]] = {}
+        self._class_dict: dict[str, dict[pygame_gui.core.UIElement, None]] = {}
+        # removed node -> the child elements moved up to its parent, moved back once the node is given an element again
+        self._moved: dict[xmlast.XMLNode, dict[GUITreeElement, None]] = {}
+        # event type -> targeted element -> handlers, sharing the handler dicts of the tree elements
+        self._dispatch: dict[int, dict[pygame_gui.core.UIElement, dict[str, EventHandler]]] = {}
+
+    def __getitem__(self, node: xmlast.XMLNode) -> pygame_gui.core.UIElement:
+        return self._nodes[node].element
+
+    def __setitem__(self, node: xmlast.XMLNode, element: pygame_gui.core.UIElement):
+        if node in self._nodes:
+            del self[node]
+        parent = self.get_owner(node.parent)
+        treeElement = GUITreeElement(node, element, parent, self)
+        if not parent is None:
+            parent._children[treeElement] = None
+        # the elements moved up when a previous element of node was removed move back below it
+        for child in self._moved.pop(node, {}):
+            if child._tree is self:
+                if not child._parent is None:
+                    del child._parent._children[child]
+                child._parent = treeElement
+                treeElement._children[child] = None
+        self._nodes[node] = treeElement
+        self._elements[element] = treeElement
+        if "id" in node.attrs:
+            self._id_dict.setdefault(node.attrs["id"], {})[element] = None
+        if "class" in node.attrs:
+            self._class_dict.setdefault(node.attrs["class"], {})[element] = None
 
-class GUITree():
-    """Think of it as the DOM Tree"""
-    def __init__(self, node: xmlast.XMLNode):
-        self._id_dict: dict[str, list[pygame_gui.core.UIElement]] = {}
-        self._class_dict: dict[str, list[pygame_gui.core.UIElement]] = {}
+    def __delitem__(self, node: xmlast.XMLNode):
+        treeElement = self._nodes.pop(node)
+        element = treeElement.element
+        if self._elements.get(element) is treeElement:
+            del self._elements[element]
+        for attrname, index in [("id", self._id_dict), ("class", self._class_dict)]:
+            if attrname in node.attrs:
+                elements = index.get(node.attrs[attrname], {})
+                elements.pop(element, None)
+                if len(elements) == 0:
+                    index.pop(node.attrs[attrname], None)
+        if not treeElement._parent is None:
+            del treeElement._parent._children[treeElement]
+        # the children of a removed element move up to its parent, their closest ancestor element left
+        for child in treeElement._children:
+            child._parent = treeElement._parent
+            if not treeElement._parent is None:
+                treeElement._parent._children[child] = None
+        if len(treeElement._children) > 0:
+            self._moved[node] = treeElement._children
+            treeElement._children = {}
+        for eventType in treeElement._events:
+            self._remove_handlers(eventType, element)
+        treeElement._tree = None
+
+    def __iter__(self) -> Iterator[xmlast.XMLNode]:
+        return iter(self._nodes)
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def __contains__(self, node: object) -> bool:
+        return node in self._nodes
+
+    def _remove_handlers(self, eventType: int, element: pygame_gui.core.UIElement):
+        targets = self._dispatch.get(eventType)
+        if not targets is None:
+            targets.pop(element, None)
+            if len(targets) == 0:
+                del self._dispatch[eventType]
+
+    def bind_event(self, _id: str, elementId: str, eventType: int, callback: EventHandler) -> bool:
+        """Binds callback to the events of eventType of every element with the id elementId, returning whether any element has that id"""
+        elements = self.get_element_by_id(elementId)
+        for element in elements:
+            self._elements[element].bind_event(_id, eventType, callback)
+        return len(elements) > 0
+
+    def dispatch(self, event: pygame.event.Event) -> int:
+        """
+        Calls the handlers bound to the type of event on its ui_element, or the handlers of every element for events
+        that target no element, returning the number of handlers called
+        """
+        targets = self._dispatch.get(event.type)
+        if targets is None:
+            return 0
+        target = getattr(event, "ui_element", None)
+        if target is None:
+            handlers = [ handler for elementHandlers in targets.values() for handler in elementHandlers.values() ]
+        else:
+            elementHandlers = targets.get(target)
+            if elementHandlers is None:
+                return 0
+            handlers = list(elementHandlers.values())
+        for handler in handlers:
+            handler(event)
+        return len(handlers)
+
+    def get_owner(self, node: xmlast.XMLNode | None) -> GUITreeElement | None:
+        """The tree element of the closest node, starting from node itself, which has an element"""
+        while not node is None:
+            treeElement = self._nodes.get(node)
+            if not treeElement is None:
+                return treeElement
+            node = node.parent
+        return None
+
+    def get_tree_element(self, key: xmlast.XMLNode | pygame_gui.core.UIElement) -> GUITreeElement | None:
+        """The tree element of a node or of a created element"""
+        if isinstance(key, xmlast.XMLNode):
+            return self._nodes.get(key)
+        return self._elements.get(key)
+
+    def get_node(self, element: pygame_gui.core.UIElement) -> xmlast.XMLNode | None:
+        treeElement = self._elements.get(element)
+        return None if treeElement is None else treeElement.node
 
     def get_element_by_object_id(self, objID: pygame_gui.core.ObjectID) -> list[pygame_gui.core.UIElement]:
-        return [ elem for elem in self.get_element_by_class(objID.class_id) if elem in self.get_element_by_id(objID.object_id) ] 
+        """The elements matching both the object id and the class id of objID, where an empty id matches any element"""
+        if not objID.object_id:
+            return self.get_element_by_class(objID.class_id) if objID.class_id else list(self._elements)
+        byId = self._id_dict.get(get_prefixed(objID.object_id, "#"), {})
+        if not objID.class_id:
+            return list(byId)
+        byClass = self._class_dict.get(get_prefixed(objID.class_id, "@"), {})
+        smaller, larger = (byId, byClass) if len(byId) <= len(byClass) else (byClass, byId)
+        return [ elem for elem in smaller if elem in larger ]
 
     def get_element_by_class(self, _class: str) -> list[pygame_gui.core.UIElement]:
-        return self._class_dict.get(_class) or []
-    
+        return list(self._class_dict.get(get_prefixed(_class, "@"), {}))
+
     def get_element_by_id(self, _id: str) -> list[pygame_gui.core.UIElement]:
-        return self._id_dict.get(_id) or []
\ No newline at end of file
+        return list(self._id_dict.get(get_prefixed(_id, "#"), {}))
+
+    def get_element(self, _id: str) -> pygame_gui.core.UIElement | None:
+        """The first created element with the id _id, or None"""
+        elements = self._id_dict.get(get_prefixed(_id, "#"))
+        return next(iter(elements)) if elements else None
@@ -0,0 +1,248 @@
+"""
+Resolution of element rects written in relative units into pixel rects, in one top-down pass over a node tree
+
+Each of the four values of a rect is a length:
+
+- a plain number or "px", design pixels which GUI scales along with the window from the resolution it was built at
+- a percentage or fraction, such as "25%" or "1/4", of the width or height of the parent, the closest ancestor with a
+  rect or otherwise the window
+- "vw" or "vh", a percentage of the width or height of the window
+
+x and width are relative to widths, y and height to heights. The min-size and max-size attributes take a width and a
+height in the same units and constrain the resolved size, where their pixels are never scaled
+
+Rects are always resolved from the lengths written in the layout, so resizing any number of times does not drift.
+With NumPy installed, large trees are resolved as arrays of lengths and parent indices, one vectorized step per depth
+of the tree rather than one step per node. NumPy is only imported once a tree is resolved that way, so that parsing
+and validating layouts never loads it
+"""
+from typing import Any, Iterable
+from collections import OrderedDict
+import pygame_gui_xml.xmlast as xmlast
+from pygame_gui_xml._util import is_num_str
+
+_notImported = object()
+# set by get_numpy, None when NumPy is not installed
+numpy: Any = _notImported
+
+def get_numpy() -> Any:
+    """The numpy module, imported on the first call, or None when it is not installed"""
+    global numpy
+    if numpy is _notImported:
+        try:
+            import numpy
+        except ImportError: # numpy is only required to resolve large trees as arrays
+            numpy = None
+    return numpy
+
+# pixels are stored as plain floats, as rects without units always were, and any other length as a value and a unit
+Length = float | tuple[float, str]
+LayoutRect = tuple[Length, Length, Length, Length]
+Size = tuple[Length, Length]
+Rect = tuple[float, float, float, float]
+
+units: list[str] = ["px", "%", "fr", "vw", "vh"]
+_unitCodes: dict[str, int] = { unit: code for code, unit in enumerate(units) }
+# the axis x, y, width and height are relative to
+_axes: tuple[int, int, int, int] = (0, 1, 0, 1)
+
+# trees with fewer rects are resolved faster one node at a time than by building arrays
+VECTORIZE_THRESHOLD = 512
+DEFAULT_CACHE_SIZE = 8
+
+LayoutKey = tuple[tuple[float, float], tuple[float, float]]
+
+def parse_length(data: str) -> Length:
+    """Parses a length such as "12", "12px", "25%", "1/4", "50vw" or "10vh", returning pixels as a plain float"""
+    data = data.strip()
+    if "/" in data:
+        numerator, _, denominator = data.partition("/")
+        if is_num_str(numerator) and is_num_str(denominator) and float(denominator) != 0:
+            return (float(numerator) / float(denominator), "fr")
+        raise ValueError(f'Could not parse length {data}')
+    for unit in ["px", "%", "vw", "vh"]:
+        if data.endswith(unit) and is_num_str(data[:-len(unit)]):
+            value = float(data[:-len(unit)])
+            return value if unit == "px" else (value, unit)
+    if is_num_str(data):
+        return float(data)
+    raise ValueError(f'Could not parse length {data}')
+
+def parse_lengths(data: str, count: int) -> tuple[Length, ...]:
+    lengths = tuple([ parse_length(string) for string in data.split(" ") if len(string) > 0 ])
+    if len(lengths) != count:
+        raise ValueError(f'Could not parse {data}, expected {count} lengths but got {len(lengths)}')
+    return lengths
+
+def is_absolute(lengths: Iterable[Length]) -> bool:
+    return all([ not isinstance(length, tuple) for length in lengths ])
+
+def resolve_length(length: Length, axis: int, reference: tuple[float, float], window: tuple[float, float], scale: tuple[float, float]) -> float:
+    """The pixels of length along axis, 0 for widths and 1 for heights, inside of a parent of the size reference"""
+    if not isinstance(length, tuple):
+        return length * scale[axis]
+    value, unit = length
+    if unit == "%":
+        return value * (reference[axis] / 100)
+    if unit == "fr":
+        return value * reference[axis]
+    if unit == "vw":
+        return value * (window[0] / 100)
+    if unit == "vh":
+        return value * (window[1] / 100)
+    raise ValueError(f'Unknown length unit {unit}, expected one of {units}')
+
+def needs_layout(node: xmlast.XMLNode) -> bool:
+    """Whether any rect below node has relative lengths or size constraints, which must be resolved before building"""
+    return any( not is_absolute(subnode.attrs["rect"]) or "min-size" in subnode.attrs or "max-size" in subnode.attrs for subnode in node.find_all_with_attrs(["rect"]) )
+
+def resolve_tree(node: xmlast.XMLNode, window: tuple[float, float]):
+    """Resolves the rects below node for the window size in place, leaving trees of plain pixel rects untouched"""
+    if needs_layout(node):
+        Layout(node, cache_size=0).apply(window)
+
+class Layout():
+    """
+    The lengths of every rect below a node, captured once so that the rects can be resolved again for any window size
+
+    resolve returns the pixel rect of each node of nodes, and apply writes them into the rect attribute of the nodes.
+    restore writes the captured lengths back
+
+    apply keeps the rects of the cache_size most recently applied window sizes and scales, so that returning to a size
+    seen before, such as when toggling fullscreen, writes the stored rects without resolving anything
+    """
+    def __init__(self, node: xmlast.XMLNode, cache_size: int = DEFAULT_CACHE_SIZE):
+        self.nodes: list[xmlast.XMLNode] = node.find_all_with_attrs(["rect"])
+        self.rects: list[LayoutRect] = [ subnode.attrs["rect"] for subnode in self.nodes ]
+        self.min_sizes: list[Size | None] = [ subnode.attrs.get("min-size") for subnode in self.nodes ]
+        self.max_sizes: list[Size | None] = [ subnode.attrs.get("max-size") for subnode in self.nodes ]
+        indexes = { subnode: index for index, subnode in enumerate(self.nodes) }
+        # the index of the closest ancestor with a rect, which comes earlier in document order, or -1 for the window
+        self.parents: list[int] = []
+        for subnode in self.nodes:
+            parent = subnode.parent
+            while not parent is None and not parent in indexes:
+                parent = parent.parent
+            self.parents.append(-1 if parent is None else indexes[parent])
+        self._arrays: dict | None = None
+        self.cache_size = cache_size
+        self._cache: OrderedDict[LayoutKey, list[Rect]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def resolve(self, window: tuple[float, float], scale: tuple[float, float] = (1.0, 1.0), vectorize: bool | None = None) -> list[Rect]:
+        """
+        The pixel rect of every node for a window of the given size, where scale multiplies plain pixel lengths
+
+        vectorize selects NumPy, which is used by default when installed and there are at least VECTORIZE_THRESHOLD rects
+        """
+        if vectorize is None:
+            vectorize = len(self.nodes) >= VECTORIZE_THRESHOLD and not get_numpy() is None
+        if vectorize:
+            return list(map(tuple, self.resolve_array(window, scale).tolist()))
+        return self._resolve_nodes(window, scale)
+
+    def get_rects(self, window: tuple[float, float], scale: tuple[float, float] = (1.0, 1.0), vectorize: bool | None = None) -> list[Rect]:
+        """The rects of resolve, taken from the cache when the same window size and scale were applied recently"""
+        key: LayoutKey = ((window[0], window[1]), (scale[0], scale[1]))
+        rects = self._cache.get(key)
+        if not rects is None:
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return rects
+        self.misses += 1
+        rects = self.resolve(window, scale, vectorize)
+        if self.cache_size > 0:
+            self._cache[key] = rects
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+                self.evictions += 1
+        return rects
+
+    def apply(self, window: tuple[float, float], scale: tuple[float, float] = (1.0, 1.0), vectorize: bool | None = None):
+        for node, rect in zip(self.nodes, self.get_rects(window, scale, vectorize)):
+            node.attrs["rect"] = rect
+
+    def get_stats(self) -> dict[str, int]:
+        return { "entries": len(self._cache), "hits": self.hits, "misses": self.misses, "evictions": self.evictions }
+
+    def clear_cache(self):
+        self._cache.clear()
+
+    def restore(self):
+        for node, rect in zip(self.nodes, self.rects):
+            node.attrs["rect"] = rect
+
+    def _resolve_nodes(self, window: tuple[float, float], scale: tuple[float, float]) -> list[Rect]:
+        resolved: list[Rect] = []
+        unscaled = (1.0, 1.0)
+        for rect, parent, minSize, maxSize in zip(self.rects, self.parents, self.min_sizes, self.max_sizes):
+            reference = window if parent < 0 else resolved[parent][2:]
+            x, y, width, height = [ resolve_length(length, axis, reference, window, scale) for length, axis in zip(rect, _axes) ]
+            if not minSize is None:
+                width = max(width, resolve_length(minSize[0], 0, reference, window, unscaled))
+                height = max(height, resolve_length(minSize[1], 1, reference, window, unscaled))
+            if not maxSize is None:
+                width = min(width, resolve_length(maxSize[0], 0, reference, window, unscaled))
+                height = min(height, resolve_length(maxSize[1], 1, reference, window, unscaled))
+            resolved.append((x, y, width, height))
+        return resolved
+
+    def _get_arrays(self) -> dict:
+        """The lengths of every rect as arrays of values and unit codes, along with the indexes of the rects at each depth"""
+        if not self._arrays is None:
+            return self._arrays
+        def split(lengths: Iterable[Length]) -> tuple[list[float], list[int]]:
+            values = [ length[0] if isinstance(length, tuple) else length for length in lengths ]
+            return values, [ _unitCodes[length[1]] if isinstance(length, tuple) else 0 for length in lengths ]
+        values, codes = zip(*[ split(rect) for rect in self.rects ])
+        inf = float("inf")
+        minValues, minCodes = zip(*[ split(size if not size is None else (-inf, -inf)) for size in self.min_sizes ])
+        maxValues, maxCodes = zip(*[ split(size if not size is None else (inf, inf)) for size in self.max_sizes ])
+        depths: list[int] = []
+        for parent in self.parents:
+            depths.append(0 if parent < 0 else depths[parent] + 1)
+        depthArray = numpy.array(depths, dtype=numpy.intp)
+        self._arrays = {
+            "values": numpy.array(values, dtype=numpy.float64).reshape(-1, 4),
+            "codes": numpy.array(codes, dtype=numpy.int8).reshape(-1, 4),
+            "minValues": numpy.array(minValues, dtype=numpy.float64).reshape(-1, 2),
+            "minCodes": numpy.array(minCodes, dtype=numpy.int8).reshape(-1, 2),
+            "maxValues": numpy.array(maxValues, dtype=numpy.float64).reshape(-1, 2),
+            "maxCodes": numpy.array(maxCodes, dtype=numpy.int8).reshape(-1, 2),
+            "parents": numpy.array(self.parents, dtype=numpy.intp),
+            "levels": [ numpy.flatnonzero(depthArray == depth) for depth in range(max(depths, default=-1) + 1) ],
+        }
+        return self._arrays
+
+    @staticmethod
+    def _get_factors(codes, references, window: tuple[float, float], scale) -> "numpy.ndarray":
+        """The pixels per unit of every length, the array counterpart of resolve_length"""
+        return numpy.select(
+            [codes == _unitCodes["px"], codes == _unitCodes["%"], codes == _unitCodes["fr"], codes == _unitCodes["vw"], codes == _unitCodes["vh"]],
+            [numpy.broadcast_to(scale, codes.shape), references / 100, references, numpy.full(codes.shape, window[0] / 100), numpy.full(codes.shape, window[1] / 100)]
+        )
+
+    def resolve_array(self, window: tuple[float, float], scale: tuple[float, float] = (1.0, 1.0)) -> "numpy.ndarray":
+        """The rects of resolve as an array of shape (len(nodes), 4), resolved with NumPy"""
+        if get_numpy() is None:
+            raise ValueError("Could not resolve layout with vectorize, NumPy is not installed")
+        if len(self.nodes) == 0:
+            return numpy.empty((0, 4), dtype=numpy.float64)
+        arrays = self._get_arrays()
+        windowArray = numpy.array(window, dtype=numpy.float64)
+        scaleArray = numpy.array(scale, dtype=numpy.float64)
+        resolved = numpy.empty((len(self.nodes), 4), dtype=numpy.float64)
+        for level in arrays["levels"]:
+            parents = arrays["parents"][level]
+            references = numpy.where((parents < 0)[:, None], windowArray, resolved[parents, 2:])
+            values = arrays["values"][level] * self._get_factors(arrays["codes"][level], references[:, _axes], window, scaleArray[list(_axes)])
+            minimums = arrays["minValues"][level] * self._get_factors(arrays["minCodes"][level], references, window, numpy.ones(2))
+            maximums = arrays["maxValues"][level] * self._get_factors(arrays["maxCodes"][level], references, window, numpy.ones(2))
+            values[:, 2:] = numpy.minimum(numpy.maximum(values[:, 2:], minimums), maximums)
+            resolved[level] = values
+        return resolved
@@ -0,0 +1,94 @@
+import time
+import contextlib
+from typing import Any, Callable, Iterator
+
+ProfileCallback = Callable[[str, str | None, float], None]
+
+class PhaseStats():
+    """The number of times a phase ran along with its total and longest wall time in seconds"""
+    __slots__ = ("count", "total", "max")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds: float, count: int = 1):
+        self.count += count
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def as_dict(self) -> dict[str, float]:
+        return { "count": self.count, "total": self.total, "max": self.max }
+
+class ProfileStats():
+    """
+    Wall time and counts of the phases of loading an interface, such as reading, parsing, validating, theme loading
+    and building elements, along with the validation and build times of each tag
+
+    Profiled functions take a ProfileStats as an optional argument and skip all measurement when given None.
+    callback, when given, is called with the phase, the tag (or None) and the seconds of every recorded measurement
+    """
+    def __init__(self, callback: ProfileCallback | None = None):
+        self.callback = callback
+        self.phases: dict[str, PhaseStats] = {}
+        self.tags: dict[str, dict[str, PhaseStats]] = {}
+
+    def record(self, phase: str, seconds: float, tag: str | None = None, count: int = 1):
+        if tag is None:
+            stats = self.phases.get(phase)
+            if stats is None:
+                stats = self.phases[phase] = PhaseStats()
+        else:
+            tagStats = self.tags.setdefault(phase, {})
+            stats = tagStats.get(tag)
+            if stats is None:
+                stats = tagStats[tag] = PhaseStats()
+        stats.add(seconds, count)
+        if not self.callback is None:
+            self.callback(phase, tag, seconds)
+
+    @contextlib.contextmanager
+    def timed(self, phase: str, tag: str | None = None) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(phase, time.perf_counter() - start, tag)
+
+    def wrap(self, phase: str, tag: str, func: Callable[..., Any]) -> Callable[..., Any]:
+        """func, recording each of its calls under phase and tag"""
+        def timed_func(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.record(phase, time.perf_counter() - start, tag)
+        return timed_func
+
+    def reset(self):
+        self.phases.clear()
+        self.tags.clear()
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "phases": { phase: stats.as_dict() for phase, stats in self.phases.items() },
+            "tags": { phase: { tag: stats.as_dict() for tag, stats in tagStats.items() } for phase, tagStats in self.tags.items() }
+        }
+
+    def report(self) -> str:
+        """A table of the phases and tags, slowest first"""
+        lines: list[str] = []
+        for phase, stats in sorted(self.phases.items(), key=lambda item: -item[1].total):
+            lines.append(f'{phase:<24} {stats.count:>8} calls {stats.total * 1000:>10.3f} ms total {stats.max * 1000:>10.3f} ms max')
+        for phase, tagStats in self.tags.items():
+            for tag, stats in sorted(tagStats.items(), key=lambda item: -item[1].total):
+                lines.append(f'{phase + " " + tag:<24} {stats.count:>8} calls {stats.total * 1000:>10.3f} ms total {stats.max * 1000:>10.3f} ms max')
+        return "\n".join(lines)
+
+_untimed = contextlib.nullcontext()
+
+def timed(stats: ProfileStats | None, phase: str, tag: str | None = None) -> contextlib.AbstractContextManager:
+    """Times a block into stats, or does nothing when stats is None"""
+    return _untimed if stats is None else stats.timed(phase, tag)
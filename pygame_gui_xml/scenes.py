@@ -0,0 +1,221 @@
+"""
+Pools of prebuilt interfaces, one GUI with its own UIManager per scene, switched between without rebuilding anything
+"""
+import types
+import logging
+import pygame
+from typing import Iterator
+from collections import OrderedDict
+import pygame_gui_xml.xmlast
+import pygame_gui_xml.guitree
+import pygame_gui_xml.assets
+import pygame_gui_xml.gui
+
+logger = logging.getLogger(__name__)
+
+SceneSource = str | pygame_gui_xml.xmlast.XMLNode | types.ModuleType
+
+def get_element_bytes(elements: pygame_gui_xml.gui.ElementMap) -> int:
+    """Estimates the memory held by elements from the pixels of the surfaces they are drawn with"""
+    total = 0
+    for element in elements.values():
+        image = getattr(element, "image", None)
+        if isinstance(image, pygame.Surface):
+            total += pygame_gui_xml.assets.ImageCache.get_surface_bytes(image)
+    return total
+
+class Scene():
+    """
+    A named layout of a ScenePool, holding its parsed node tree for as long as it is in the pool and its GUI only
+    while it is built. The state and event bindings of the GUI are carried over when the scene is rebuilt
+    """
+    def __init__(self, name: str, source: SceneSource, themes: tuple[str, ...], kwargs: dict):
+        self.name = name
+        # compiled modules rebuild their own node tree, anything else is parsed only once
+        self.source: pygame_gui_xml.xmlast.XMLNode | types.ModuleType = source if isinstance(source, types.ModuleType) else pygame_gui_xml.gui.parse_source(source, kwargs.get("cache")) if isinstance(source, str) else source
+        self.themes = themes
+        self.kwargs = kwargs
+        self.gui: pygame_gui_xml.gui.GUI | None = None
+        self.state: pygame_gui_xml.gui.GUIStateStore | None = None
+        self.event_bindings: dict[str, tuple[str, int, pygame_gui_xml.guitree.EventHandler]] = {}
+        self.base_resolution: tuple[int, int] | None = None
+        self.element_count = 0
+        self.bytes = 0
+        self.builds = 0
+
+    def is_built(self) -> bool:
+        return not self.gui is None
+
+    def measure(self):
+        if not self.gui is None:
+            self.element_count = len(self.gui.elements)
+            self.bytes = get_element_bytes(self.gui.elements)
+
+class ScenePool():
+    """
+    Keeps several interfaces built at once, each in its own UIManager, so that switching to a built scene is a lookup
+    rather than a rebuild. Only the active scene receives events, updates and draws
+
+    Once the built scenes exceed max_elements elements or an estimated max_bytes of surfaces, the least recently
+    active scenes are evicted: their elements are killed and their GUI dropped, keeping only the parsed node tree,
+    from which the scene is rebuilt the next time it is switched to. The active scene is never evicted
+
+    The keyword arguments given to add are passed to GUI. Killed elements are only freed once the events pygame_gui
+    posted about them were taken off the queue with pygame.event.get, as the game loop does every frame
+    """
+    def __init__(self, max_elements: int | None = None, max_bytes: int | None = None):
+        self.max_elements = max_elements
+        self.max_bytes = max_bytes
+        self._scenes: OrderedDict[str, Scene] = OrderedDict()
+        self._active: Scene | None = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._scenes
+
+    def __len__(self) -> int:
+        return len(self._scenes)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._scenes)
+
+    def add(self, name: str, source: SceneSource, *themes: str, prebuild: bool = False, **kwargs) -> Scene:
+        """Parses source into a new scene, replacing any scene of the same name, and builds it right away with prebuild"""
+        if name in self._scenes:
+            self.remove(name)
+        scene = Scene(name, source, themes, kwargs)
+        self._scenes[name] = scene
+        self._scenes.move_to_end(name, last=False)
+        if prebuild:
+            self.build(name)
+        return scene
+
+    def remove(self, name: str):
+        scene = self.get_scene(name)
+        if scene is self._active:
+            raise ValueError(f'Cannot remove the active scene {name}')
+        self._release(scene)
+        del self._scenes[name]
+
+    def get_scene(self, name: str) -> Scene:
+        scene = self._scenes.get(name)
+        if scene is None:
+            raise ValueError(f'Unknown scene {name}, expected one of {list(self._scenes)}')
+        return scene
+
+    @property
+    def active(self) -> pygame_gui_xml.gui.GUI | None:
+        return None if self._active is None else self._active.gui
+
+    @property
+    def active_name(self) -> str | None:
+        return None if self._active is None else self._active.name
+
+    def build(self, name: str) -> pygame_gui_xml.gui.GUI:
+        """The GUI of the scene name, building it from its node tree if it is not built, without switching to it"""
+        scene = self.get_scene(name)
+        if scene.gui is None:
+            self._build(scene)
+            self.enforce_limits()
+        return scene.gui
+
+    def _build(self, scene: Scene):
+        self.misses += 1
+        scene.builds += 1
+        gui = pygame_gui_xml.gui.GUI(scene.source, *scene.themes, **scene.kwargs)
+        if scene.base_resolution is None:
+            scene.base_resolution = gui.base_resolution
+        elif gui.base_resolution != scene.base_resolution:
+            # rects are authored for the resolution the scene was first built at
+            size, gui.base_resolution = gui.size, scene.base_resolution
+            gui.resize(size)
+        if not scene.state is None:
+            gui.state = scene.state
+            gui.bind_elements()
+        for _id, (elementId, eventType, callback) in scene.event_bindings.items():
+            gui.bind_event(_id, elementId, eventType, callback)
+        scene.gui = gui
+        scene.measure()
+        logger.debug("Built scene %s with %d elements", scene.name, scene.element_count)
+
+    def switch(self, name: str) -> pygame_gui_xml.gui.GUI:
+        """
+        Makes name the active scene and returns its GUI, which is only built if it was not built before or was evicted.
+        A scene last active at another window size is resized to the current one
+        """
+        scene = self.get_scene(name)
+        if scene is self._active:
+            return scene.gui
+        if not self._active is None:
+            self._active.measure()
+        if scene.gui is None:
+            self._build(scene)
+        else:
+            self.hits += 1
+            size = pygame.display.get_window_size()
+            if scene.gui.size != size:
+                scene.gui.resize(size)
+        self._active = scene
+        self._scenes.move_to_end(name)
+        self.enforce_limits()
+        return scene.gui
+
+    def get_totals(self) -> tuple[int, int]:
+        """The number of elements and the estimated bytes of every built scene"""
+        built = [ scene for scene in self._scenes.values() if scene.is_built() ]
+        return sum([ scene.element_count for scene in built ]), sum([ scene.bytes for scene in built ])
+
+    def is_over_limits(self) -> bool:
+        elements, size = self.get_totals()
+        return not self.max_elements is None and elements > self.max_elements or not self.max_bytes is None and size > self.max_bytes
+
+    def enforce_limits(self):
+        """Evicts the least recently active built scenes other than the active one until the pool fits its limits"""
+        for scene in list(self._scenes.values()):
+            if not self.is_over_limits():
+                return
+            if scene.is_built() and not scene is self._active:
+                self.evict(scene.name)
+
+    def evict(self, name: str) -> bool:
+        """Kills the elements of the scene name and drops its GUI, returning False if it was not built"""
+        scene = self.get_scene(name)
+        if scene is self._active:
+            raise ValueError(f'Cannot evict the active scene {name}')
+        if scene.gui is None:
+            return False
+        self._release(scene)
+        self.evictions += 1
+        logger.debug("Evicted scene %s", name)
+        return True
+
+    def _release(self, scene: Scene):
+        gui = scene.gui
+        if gui is None:
+            return
+        scene.state = gui.state
+        scene.event_bindings = dict(gui._event_bindings)
+        if not isinstance(scene.source, types.ModuleType):
+            # keeps the latest layout of hot reloaded scenes
+            scene.source = gui.nodetree
+        # the rebuilt GUI resolves the rects of the node tree again from their original lengths
+        gui.layout.restore()
+        gui.manager.clear_and_reset()
+        scene.gui = None
+
+    def process_events(self, event: pygame.event.Event) -> bool:
+        return False if self.active is None else self.active.process_events(event)
+
+    def update(self, dt: float):
+        if not self.active is None:
+            self.active.update(dt)
+
+    def draw_ui(self, target: pygame.surface.Surface):
+        if not self.active is None:
+            self.active.draw_ui(target)
+
+    def get_stats(self) -> dict[str, int]:
+        elements, size = self.get_totals()
+        return { "scenes": len(self._scenes), "built": sum([ 1 for scene in self._scenes.values() if scene.is_built() ]), "elements": elements, "bytes": size, "hits": self.hits, "misses": self.misses, "evictions": self.evictions }
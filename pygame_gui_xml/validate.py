@@ -0,0 +1,200 @@
+"""
+Batch validation of pygame_gui_xml layouts, for checking whole directories of layouts in CI
+
+Files are validated against xmlparser.schemas in a pool of worker processes, every error of a file is reported
+rather than only the first, and results are kept in a JSON cache keyed by the content of each file, the files it
+names and the schema fingerprint, so that unchanged files are not validated again. Nothing here imports pygame
+
+usage: python -m pygame_gui_xml.validate [paths ...] [--jobs N] [--cache FILE] [--no-cache] [--format text|json]
+"""
+import os
+import io
+import sys
+import json
+import fnmatch
+import hashlib
+import argparse
+import concurrent.futures
+from typing import Iterable, TypedDict
+import pygame_gui_xml
+import pygame_gui_xml.xmlast as xmlast
+import pygame_gui_xml.xmlparser as xmlparser
+
+RESULTS_FORMAT_VERSION = 2
+DEFAULT_CACHE_FILE = ".pygame_gui_xml_validate.json"
+DEFAULT_PATTERN = "*.xml"
+
+# the absolute path a file attribute resolves to, and its modification time and size, which are None for a missing file,
+# as a list so that stamps read back from the JSON cache compare equal
+FileStamp = list[str | float | int | None]
+
+class FileResult(TypedDict):
+    path: str
+    hash: str
+    valid: bool
+    errors: list[xmlast.XMLValidationError]
+    dependencies: dict[str, FileStamp]
+    cached: bool
+
+def find_layouts(paths: Iterable[str], pattern: str = DEFAULT_PATTERN) -> list[str]:
+    """The files given in paths and the files matching pattern anywhere below the directories given in paths, sorted and listed once"""
+    found: list[str] = []
+    for path in paths:
+        if os.path.isdir(path):
+            for directory, _, filenames in os.walk(path):
+                found.extend([ os.path.join(directory, filename) for filename in filenames if fnmatch.fnmatch(filename, pattern) ])
+        else:
+            found.append(path)
+    return sorted(dict.fromkeys([ os.path.normpath(path) for path in found ]))
+
+def get_cache_key() -> str:
+    """Identifies the schemas and library version results were produced with, so that a schema change invalidates every cached result"""
+    return f'{xmlparser.get_schema_fingerprint()}:{pygame_gui_xml.__version__}:{RESULTS_FORMAT_VERSION}'
+
+def get_file_stamp(data: str) -> FileStamp:
+    path = os.path.abspath(data)
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return [path, None, None]
+    return [path, stat.st_mtime, stat.st_size]
+
+def get_dependencies(references: Iterable[str]) -> dict[str, FileStamp]:
+    """Stamps the files named by the file attributes of a layout, resolved against the working directory as when validated"""
+    return { data: get_file_stamp(data) for data in references }
+
+def validate_content(content: bytes, backend: str = "expat") -> tuple[list[xmlast.XMLValidationError], dict[str, FileStamp]]:
+    """Validates a layout, returning its errors and the stamps of the files it names"""
+    references: dict[str, list[str]] = { attr: [] for attr in xmlparser.fileAttrs }
+    errors = xmlast.XMLParser(xmlparser.schemas).validate_stream(io.BytesIO(content), backend, references)
+    return errors, get_dependencies([ data for values in references.values() for data in values ])
+
+def validate_file(path: str, backend: str = "expat") -> FileResult:
+    """Validates a single layout, reporting unreadable files as an error of the file"""
+    try:
+        with open(path, "rb") as f:
+            content = f.read()
+    except OSError as error:
+        return { "path": path, "hash": "", "valid": False, "errors": [{ "line": None, "column": None, "tag": None, "message": f'Could not read file: {error}' }], "dependencies": {}, "cached": False }
+    errors, dependencies = validate_content(content, backend)
+    return { "path": path, "hash": hashlib.sha256(content).hexdigest(), "valid": len(errors) == 0, "errors": errors, "dependencies": dependencies, "cached": False }
+
+def _validate_paths(paths: list[str], backend: str) -> list[FileResult]:
+    return [ validate_file(path, backend) for path in paths ]
+
+class ResultCache():
+    """
+    JSON file of the results of earlier runs, keyed by path and valid only for the same content hash and cache key
+
+    Hashing a file is far cheaper than validating it, so files are always hashed, which also keeps results valid
+    across checkouts that change modification times. The files a layout names are only stamped, and a result is
+    dropped once any of them is created, removed or modified, or resolves to another path
+    """
+    def __init__(self, path: str | None):
+        self.path = path
+        self.key = get_cache_key()
+        self.results: dict[str, FileResult] = {}
+        if path is None:
+            return
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if isinstance(data, dict) and data.get("key") == self.key:
+            self.results = data.get("results", {})
+
+    def get(self, path: str, content: bytes) -> FileResult | None:
+        result = self.results.get(os.path.abspath(path))
+        if result is None or result["hash"] != hashlib.sha256(content).hexdigest():
+            return None
+        if get_dependencies(result["dependencies"]) != result["dependencies"]:
+            return None
+        return { **result, "path": path, "cached": True }
+
+    def update(self, results: Iterable[FileResult]):
+        for result in results:
+            if result["hash"] != "":
+                self.results[os.path.abspath(result["path"])] = { **result, "cached": False }
+
+    def save(self):
+        if self.path is None:
+            return
+        temp = f'{self.path}.{os.getpid()}.tmp'
+        with open(temp, "w") as f:
+            json.dump({ "key": self.key, "results": self.results }, f)
+        os.replace(temp, self.path)
+
+def validate_files(paths: list[str], jobs: int | None = None, cache: ResultCache | None = None, backend: str = "expat") -> list[FileResult]:
+    """
+    Validates every file in paths, in order, reusing the cached results of unchanged files
+
+    The remaining files are split into one batch per worker process, or validated in this process when jobs is 1
+    or there is only one file to validate
+    """
+    results: dict[str, FileResult] = {}
+    pending: list[str] = []
+    for path in paths:
+        cached = None
+        if not cache is None:
+            try:
+                with open(path, "rb") as f:
+                    cached = cache.get(path, f.read())
+            except OSError:
+                pass
+        if cached is None:
+            pending.append(path)
+        else:
+            results[path] = cached
+
+    jobs = jobs or os.cpu_count() or 1
+    if jobs == 1 or len(pending) <= 1:
+        validated = _validate_paths(pending, backend)
+    else:
+        batches = [ pending[i::jobs] for i in range(jobs) if len(pending[i::jobs]) > 0 ]
+        with concurrent.futures.ProcessPoolExecutor(max_workers=len(batches)) as executor:
+            validated = [ result for batch in executor.map(_validate_paths, batches, [backend] * len(batches)) for result in batch ]
+    results.update({ result["path"]: result for result in validated })
+
+    if not cache is None:
+        cache.update(validated)
+        cache.save()
+    return [ results[path] for path in paths ]
+
+def format_text(results: list[FileResult]) -> str:
+    lines: list[str] = []
+    for result in results:
+        for error in result["errors"]:
+            position = f'{error["line"]}:{error["column"]}:' if not error["line"] is None else ""
+            lines.append(f'{result["path"]}:{position} {error["message"]}')
+    invalid = sum([ 1 for result in results if not result["valid"] ])
+    lines.append(f'{len(results)} files checked, {invalid} invalid, {sum([ 1 for result in results if result["cached"] ])} from cache')
+    return "\n".join(lines)
+
+def format_json(results: list[FileResult]) -> str:
+    return json.dumps({
+        "format": RESULTS_FORMAT_VERSION,
+        "files": [ { key: value for key, value in result.items() if not key in ("hash", "dependencies") } for result in results ],
+        "checked": len(results),
+        "invalid": sum([ 1 for result in results if not result["valid"] ])
+    }, indent=2)
+
+def main(argv: list[str] | None = None) -> int:
+    argparser = argparse.ArgumentParser(prog="python -m pygame_gui_xml.validate", description="Validates pygame_gui_xml layouts in parallel, reporting every error of every file")
+    argparser.add_argument("paths", nargs="*", default=["."], help="layout files and directories to search for layouts")
+    argparser.add_argument("--pattern", default=DEFAULT_PATTERN, help="file name pattern of layouts inside of directories")
+    argparser.add_argument("-j", "--jobs", type=int, default=None, help="number of worker processes, the number of CPUs by default")
+    argparser.add_argument("--cache", default=DEFAULT_CACHE_FILE, help="file the results are cached in")
+    argparser.add_argument("--no-cache", action="store_true", help="validate every file, neither reading nor writing the cache")
+    argparser.add_argument("--format", choices=["text", "json"], default="text", help="output format")
+    argparser.add_argument("--backend", choices=["expat", "lxml"], default="expat", help="XML parsing backend")
+    args = argparser.parse_args(argv)
+
+    paths = find_layouts(args.paths, args.pattern)
+    cache = None if args.no_cache else ResultCache(args.cache)
+    results = validate_files(paths, args.jobs, cache, args.backend)
+    print(format_json(results) if args.format == "json" else format_text(results))
+    return 0 if all([ result["valid"] for result in results ]) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
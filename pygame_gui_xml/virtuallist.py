@@ -0,0 +1,375 @@
+"""
+A selection list for very large item sets, which creates row buttons only for the rows that fit in its height
+
+UISelectionList keeps a dict for every item and visits every item whenever it scrolls, creating and killing buttons
+as items come into and out of view. VirtualList instead reads its items from any sequence, such as a list or a
+Python data source implementing __len__ and __getitem__, and owns a fixed pool of rows. Scrolling only moves the rows
+and gives the rows that came into view the text of their new items, so its cost depends on the height of the list
+rather than on the number of items. A source with an estimate_len method, such as a datasource file, is sized by its
+estimate until its items are read to the end, so building the list does not read the whole source
+
+VirtualDropDownMenu is a UIDropDownMenu which lists its options in a VirtualList once expanded
+"""
+import math
+import pygame
+import pygame_gui
+from typing import Iterable, Sequence
+from pygame_gui._constants import UI_BUTTON_PRESSED, UI_BUTTON_DOUBLE_CLICKED, UI_SELECTION_LIST_NEW_SELECTION, UI_SELECTION_LIST_DROPPED_SELECTION, UI_SELECTION_LIST_DOUBLE_CLICKED_SELECTION, UI_DROP_DOWN_MENU_CHANGED
+from pygame_gui.elements.ui_drop_down_menu import UIExpandedDropDownState
+
+# an item is its text, or its text and the object id of its row
+Item = str | tuple[str, str]
+ItemSource = Sequence[Item]
+
+DEFAULT_ITEM_OBJECT_ID = "#item_list_item"
+
+def get_item_parts(item: Item) -> tuple[str, str]:
+    if isinstance(item, str):
+        return item, DEFAULT_ITEM_OBJECT_ID
+    if isinstance(item, tuple) and len(item) == 2:
+        return item
+    raise ValueError(f'Could not show list item {item!r}, expected a string or a tuple of a string and an object id')
+
+def get_item_count(items: ItemSource) -> int:
+    """The estimated length of items which can estimate it, and the length of any other items"""
+    estimate = getattr(items, "estimate_len", None)
+    return len(items) if estimate is None else estimate()
+
+class VirtualList(pygame_gui.elements.UISelectionList):
+    """
+    A UISelectionList showing the items of a sequence through a pool of recycled rows, themed as a selection list
+
+    The item at index is always shown by the row at index modulo the number of rows, so scrolling by a row retargets a
+    single row. Selections are kept as item indexes in selected and posted as the events of UISelectionList, along
+    with the index of the item. set_item_list replaces the data source and clears the selection. row_updates counts
+    the rows given a new item. item_count is the number of items the list is sized for, laid out again whenever
+    reading the items shown refines an estimated count
+
+    The scroll offset is kept in pixels, as the scroll bar rounds its position to a ten thousandth of the list, which
+    spans several rows of a long list. scroll_to_item scrolls to an exact row
+    """
+    def __init__(self, relative_rect: pygame.Rect, items: ItemSource, manager: pygame_gui.core.interfaces.IUIManagerInterface | None = None, *, selected: Iterable[int] = (), **kwargs):
+        self.items: ItemSource = items
+        self.item_count = 0
+        self.selected: set[int] = set()
+        self.rows: list[pygame_gui.elements.UIButton] = []
+        self._row_items: list[int] = []
+        self._row_object_ids: list[str] = []
+        self.row_updates = 0
+        self.scroll_offset = 0.0
+        super().__init__(relative_rect, items, manager, **kwargs)
+        self.set_selection(selected)
+
+    def get_item(self, index: int) -> tuple[str, str]:
+        """The text and the row object id of the item at index"""
+        return get_item_parts(self.items[index])
+
+    def _get_shown_item(self, index: int) -> tuple[str, str] | None:
+        """The item at index, or None past the end of the items, which comes before item_count when it was overestimated"""
+        if not 0 <= index < self.item_count:
+            return None
+        try:
+            return self.get_item(index)
+        except IndexError:
+            return None
+
+    def set_item_list(self, new_item_list: ItemSource):
+        if not new_item_list is self.items:
+            self.selected.clear()
+            self.scroll_offset = 0.0
+            if not self.scroll_bar is None:
+                self.scroll_bar.set_scroll_from_start_percentage(0.0)
+        self.items = new_item_list
+        self._raw_item_list = new_item_list
+        self._layout_rows()
+
+    def set_selection(self, indexes: Iterable[int]):
+        """Selects the items at indexes in place of the current selection, without posting events"""
+        selected = set(indexes)
+        for index in selected:
+            if not 0 <= index < get_item_count(self.items) or self._get_shown_item(index) is None:
+                raise ValueError(f'Could not select item {index}, the list has {get_item_count(self.items)} items')
+        if len(selected) > 1 and not self.allow_multi_select:
+            raise ValueError(f'Could not select items {sorted(selected)}, multiple items selected in a single selection list')
+        self.selected = selected
+        self._sync_selection()
+
+    def get_single_selection(self, include_object_id: bool = False) -> str | tuple[str, str] | None:
+        if self.allow_multi_select:
+            raise RuntimeError("Requesting single selection, from multi-selection list")
+        if len(self.selected) == 0:
+            return None
+        text, objectId = self.get_item(next(iter(self.selected)))
+        return (text, objectId) if include_object_id else text
+
+    def get_multi_selection(self, include_object_id: bool = False) -> list[str] | list[tuple[str, str]]:
+        if not self.allow_multi_select:
+            raise RuntimeError("Requesting multi selection, from single-selection list")
+        items = [ self.get_item(index) for index in sorted(self.selected) ]
+        return items if include_object_id else [ text for text, _ in items ]
+
+    def get_single_selection_start_percentage(self) -> float:
+        if len(self.selected) == 0 or self.total_height_of_list == 0:
+            return 0.0
+        return min(self.selected) * self.list_item_height / self.total_height_of_list
+
+    def scroll_to_item(self, index: int):
+        """Scrolls the item at index to the top of the list, or as close to it as the list can scroll"""
+        self.scroll_offset = max(min(index * self.list_item_height, self.lowest_list_pos), 0)
+        if not self.scroll_bar is None:
+            self.scroll_bar.set_scroll_from_start_percentage(self.scroll_offset / self.total_height_of_list)
+            self.scroll_bar.has_moved_recently = False
+        self._place_rows()
+
+    def get_visible_range(self) -> range:
+        """The indexes of the items shown by the rows"""
+        first = int(self.scroll_offset // self.list_item_height)
+        return range(first, min(first + len(self.rows), self.item_count))
+
+    def _layout_rows(self):
+        """Sizes the scroll bar, the row container and the pool of rows to the list and its items"""
+        self.item_count = get_item_count(self.items)
+        outer = self.list_and_scroll_bar_container
+        if outer is None:
+            return
+        visibleHeight = int(outer.relative_rect.height)
+        self.total_height_of_list = self.list_item_height * self.item_count
+        self.lowest_list_pos = max(self.total_height_of_list - visibleHeight, 0)
+        self.scroll_offset = max(min(self.scroll_offset, self.lowest_list_pos), 0)
+        if self.total_height_of_list > visibleHeight:
+            self.current_scroll_bar_width = self.scroll_bar_width
+            visiblePercentage = visibleHeight / self.total_height_of_list
+            if self.scroll_bar is None:
+                self.scroll_bar = pygame_gui.elements.UIVerticalScrollBar(pygame.Rect(-self.scroll_bar_width, 0, self.scroll_bar_width, visibleHeight), visiblePercentage, self.ui_manager, container=outer, parent_element=self,
+                                                                          anchors={ "left": "right", "right": "right", "top": "top", "bottom": "bottom" })
+                self.join_focus_sets(self.scroll_bar)
+            else:
+                self.scroll_bar.set_visible_percentage(visiblePercentage)
+        else:
+            if not self.scroll_bar is None:
+                self.scroll_bar.kill()
+                self.scroll_bar = None
+            self.current_scroll_bar_width = 0
+
+        size = (int(outer.relative_rect.width) - self.current_scroll_bar_width, visibleHeight)
+        if self.item_list_container is None:
+            self.item_list_container = pygame_gui.core.UIContainer(pygame.Rect((0, 0), size), self.ui_manager, starting_height=0, container=outer, parent_element=self, object_id="#item_list_container",
+                                                                   anchors={ "left": "left", "right": "right", "top": "top", "bottom": "bottom" })
+            self.join_focus_sets(self.item_list_container)
+        elif self.item_list_container.relative_rect.size != size:
+            self.item_list_container.set_dimensions(size)
+
+        # one row more than fits, for the partly shown rows at both ends
+        count = min(self.item_count, math.ceil(visibleHeight / self.list_item_height) + 1)
+        while len(self.rows) > count:
+            self.rows.pop().kill()
+        # the rows kept are given their items again by _place_rows, as the number of rows decides which row shows an item
+        rowItems = [-1] * len(self.rows)
+        rowObjectIds = self._row_object_ids[:len(self.rows)]
+        first = int(self.scroll_offset // self.list_item_height)
+        while len(self.rows) < count:
+            # new rows are created showing their items rather than given them afterwards
+            index = first + (len(self.rows) - first) % count
+            item = self._get_shown_item(index)
+            text, objectId = ("", DEFAULT_ITEM_OBJECT_ID) if item is None else item
+            row = pygame_gui.elements.UIButton(pygame.Rect(0, int(index * self.list_item_height - self.scroll_offset), size[0], self.list_item_height), text, self.ui_manager, container=self.item_list_container, parent_element=self,
+                                               object_id=pygame_gui.core.ObjectID(objectId, "@selection_list_item"), allow_double_clicks=self.allow_double_clicks,
+                                               anchors={ "left": "left", "right": "right", "top": "top", "bottom": "top" })
+            self.join_focus_sets(row)
+            if index in self.selected:
+                row.select()
+            self.rows.append(row)
+            rowItems.append(-1 if item is None else index)
+            rowObjectIds.append(objectId)
+            self.row_updates += 1
+        self._row_items = rowItems
+        self._row_object_ids = rowObjectIds
+        self._place_rows()
+
+    def _place_rows(self):
+        """Moves every row to its item for the current scroll offset, giving a new item to the rows which need one"""
+        if len(self.rows) == 0:
+            return
+        offset = self.scroll_offset
+        visible = self.get_visible_range()
+        for index in visible:
+            slot = index % len(self.rows)
+            row = self.rows[slot]
+            if self._row_items[slot] != index:
+                item = self._get_shown_item(index)
+                if item is None:
+                    # past the end of overestimated items, hidden below
+                    break
+                self._row_items[slot] = index
+                text, objectId = item
+                if objectId != self._row_object_ids[slot]:
+                    row.change_object_id(pygame_gui.core.ObjectID(objectId, "@selection_list_item"))
+                    self._row_object_ids[slot] = objectId
+                row.set_text(text)
+                row.select() if index in self.selected else row.unselect()
+                if not row.visible:
+                    row.show()
+                self.row_updates += 1
+            row.set_relative_position((0, int(index * self.list_item_height - offset)))
+        for slot, row in enumerate(self.rows):
+            if not self._row_items[slot] in visible:
+                self._row_items[slot] = -1
+                if row.visible:
+                    row.hide()
+        if get_item_count(self.items) != self.item_count:
+            # the items read refined their estimated count
+            self._layout_rows()
+            if not self.scroll_bar is None:
+                self.scroll_bar.set_scroll_from_start_percentage(self.scroll_offset / self.total_height_of_list)
+                self.scroll_bar.has_moved_recently = False
+
+    def _sync_selection(self):
+        for slot, row in enumerate(self.rows):
+            index = self._row_items[slot]
+            if index >= 0:
+                row.select() if index in self.selected else row.unselect()
+
+    def _set_default_selection(self):
+        # the selection is given as indexes by selected, since looking up texts visits every item
+        pass
+
+    def _post_selection_event(self, eventType: int, index: int):
+        text = self.get_item(index)[0]
+        pygame.event.post(pygame.event.Event(eventType, { "text": text, "index": index, "ui_element": self, "ui_object_id": self.most_specific_combined_id }))
+
+    def process_event(self, event: pygame.event.Event) -> bool:
+        if not self.is_enabled or not event.type in [UI_BUTTON_PRESSED, UI_BUTTON_DOUBLE_CLICKED] or not event.ui_element in self.rows:
+            return False
+        index = self._row_items[self.rows.index(event.ui_element)]
+        if index < 0:
+            return False
+        if event.type == UI_BUTTON_DOUBLE_CLICKED:
+            self._post_selection_event(UI_SELECTION_LIST_DOUBLE_CLICKED_SELECTION, index)
+        elif index in self.selected:
+            self.selected.discard(index)
+            event.ui_element.unselect()
+            self._post_selection_event(UI_SELECTION_LIST_DROPPED_SELECTION, index)
+        else:
+            if not self.allow_multi_select:
+                for dropped in sorted(self.selected):
+                    self._post_selection_event(UI_SELECTION_LIST_DROPPED_SELECTION, dropped)
+                self.selected.clear()
+                self._sync_selection()
+            self.selected.add(index)
+            event.ui_element.select()
+            self._post_selection_event(UI_SELECTION_LIST_NEW_SELECTION, index)
+        return False
+
+    def update(self, time_delta: float):
+        # skips UISelectionList.update, which visits every item
+        pygame_gui.core.UIElement.update(self, time_delta)
+        if not self.scroll_bar is None and self.scroll_bar.check_has_moved_recently():
+            self.scroll_offset = max(min(self.scroll_bar.start_percentage * self.total_height_of_list, self.lowest_list_pos), 0)
+            self._place_rows()
+
+    def set_dimensions(self, dimensions, clamp_to_container: bool = False):
+        pygame_gui.core.UIElement.set_dimensions(self, dimensions, clamp_to_container)
+        if not self.list_and_scroll_bar_container is None:
+            self.list_and_scroll_bar_container.set_dimensions((
+                self.relative_rect.width - (2 * self.shadow_width) - (self.border_width["left"] + self.border_width["right"]),
+                self.relative_rect.height - (2 * self.shadow_width) - (self.border_width["top"] + self.border_width["bottom"]),
+            ))
+        self._layout_rows()
+
+    def disable(self):
+        super().disable()
+        self.selected.clear()
+        self._sync_selection()
+
+class VirtualExpandedDropDownState(UIExpandedDropDownState):
+    """The expanded state of a VirtualDropDownMenu, which shows the options in a VirtualList scrolled to the selected option"""
+    def start(self, should_rebuild: bool = True):
+        # follows UIExpandedDropDownState.start, which lists the options in a UISelectionList
+        self.should_transition = False
+        menu: VirtualDropDownMenu = self.drop_down_menu_ui
+        horizontalBorder = menu.shadow_width + menu.border_width["left"]
+        verticalBorder = menu.shadow_width + menu.border_width["top"]
+        self.active_buttons[:] = []
+        objectId = pygame_gui.core.ObjectID("#selected_option" if self.selected_option[0] == self.selected_option[1] else self.selected_option[1], "@selected_option")
+        self.selected_option_button = pygame_gui.elements.UIButton(pygame.Rect((horizontalBorder, verticalBorder), (self.base_position_rect.width - self.close_button_width, self.base_position_rect.height)), self.selected_option[0], self.ui_manager, self.ui_container,
+                                                                   starting_height=2, parent_element=menu, object_id=objectId)
+        menu.join_focus_sets(self.selected_option_button)
+        self.active_buttons.append(self.selected_option_button)
+
+        listIds = self.ui_manager.get_theme().build_all_combined_ids([*menu.element_base_ids, None], [*menu.element_ids, "selection_list"], [*menu.class_ids, None], [*menu.object_ids, "#drop_down_options_list"])
+        self._calculate_options_list_sizes(listIds)
+        expandSymbol = self._setup_expansion_params_based_on_direction()
+        if self.close_button_width > 0:
+            self.close_button = pygame_gui.elements.UIButton(pygame.Rect((horizontalBorder + self.base_position_rect.width - self.close_button_width, horizontalBorder), (self.close_button_width, self.base_position_rect.height)), expandSymbol, self.ui_manager, self.ui_container,
+                                                             starting_height=2, parent_element=menu, object_id="#expand_button")
+            menu.join_focus_sets(self.close_button)
+            self.active_buttons.append(self.close_button)
+
+        listRect = pygame.Rect(menu.relative_rect.left, self.option_list_y_pos, menu.relative_rect.width - self.close_button_width, self.options_list_height)
+        selected = [] if menu.selected_index is None else [menu.selected_index]
+        self.options_selection_list = VirtualList(listRect, self.options_list, self.ui_manager, starting_height=3, allow_double_clicks=False, parent_element=menu, container=menu.ui_container,
+                                                  anchors=menu.anchors, object_id="#drop_down_options_list", selected=selected)
+        menu.join_focus_sets(self.options_selection_list)
+        if len(selected) > 0:
+            self.options_selection_list.scroll_to_item(selected[0])
+        if should_rebuild:
+            self.rebuild()
+
+    def _calculate_options_list_sizes(self, final_ids):
+        # sized by the estimated count of options, as UIExpandedDropDownState takes their length
+        options = self.options_list
+        self.options_list = range(get_item_count(options))
+        try:
+            super()._calculate_options_list_sizes(final_ids)
+        finally:
+            self.options_list = options
+
+    def _on_new_item_selected(self):
+        if self.options_selection_list is None or len(self.options_selection_list.selected) == 0:
+            return
+        menu: VirtualDropDownMenu = self.drop_down_menu_ui
+        menu.select_option(next(iter(self.options_selection_list.selected)))
+        self.should_transition = True
+        pygame.event.post(pygame.event.Event(UI_DROP_DOWN_MENU_CHANGED, { "text": menu.selected_option[0], "selected_option_id": menu.selected_option[1], "index": menu.selected_index,
+                                                                         "ui_element": menu, "ui_object_id": menu.most_specific_combined_id }))
+
+class VirtualDropDownMenu(pygame_gui.elements.UIDropDownMenu):
+    """
+    A UIDropDownMenu reading its options from any sequence, which are only read once shown in its expanded VirtualList
+
+    selected_index is the index of the selected option, the first one by default, or None when there are no options.
+    The options are replaced with set_options rather than add_options and remove_options, which need a list
+    """
+    def __init__(self, options: ItemSource, relative_rect: pygame.Rect, manager: pygame_gui.core.interfaces.IUIManagerInterface | None = None, *, selected: int = 0, **kwargs):
+        self.selected_index: int | None = None
+        super().__init__([], "", relative_rect, manager, **kwargs)
+        self.menu_states["expanded"] = VirtualExpandedDropDownState(self, options, self.selected_option, self.background_rect, self.open_button_width, self.expand_direction, self.ui_manager, self,
+                                                                    self.object_ids, self.element_ids, self.expand_on_option_click)
+        self.set_options(options, selected)
+
+    def set_options(self, options: ItemSource, selected: int = 0):
+        """Shows options in place of the current options, selecting the option at selected"""
+        self._close_dropdown_if_open()
+        self.options_list = options
+        self.menu_states["expanded"].options_list = options
+        if get_item_count(options) == 0:
+            self.selected_index = None
+            self.selected_option = ("", "")
+        else:
+            self.select_option(selected)
+        self.current_state.selected_option = self.selected_option
+        self.current_state.finish()
+        self.current_state.start()
+
+    def select_option(self, index: int):
+        """Selects the option at index without posting events, shown once the menu is closed"""
+        if not 0 <= index < get_item_count(self.options_list):
+            raise ValueError(f'Could not select option {index}, the menu has {get_item_count(self.options_list)} options')
+        try:
+            text, objectId = get_item_parts(self.options_list[index])
+        except IndexError:
+            # an estimated count of options past their end, which is exact once the end was read
+            raise ValueError(f'Could not select option {index}, the menu has {get_item_count(self.options_list)} options') from None
+        self.selected_index = index
+        # options without an object id use their text as one, as in UIDropDownMenu
+        self.selected_option = (text, text if objectId == DEFAULT_ITEM_OBJECT_ID else objectId)
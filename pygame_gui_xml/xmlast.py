@@ -1,7 +1,11 @@
-import bs4
-from typing import Generic, TypeVar, Union, Callable, Iterable, Any, TypedDict
+from typing import Generic, TypeVar, Union, Callable, Iterable, Any, TypedDict, BinaryIO, Mapping
 from collections import deque
+import sys
+import types
+import bisect
+import xml.parsers.expat
 from pygame_gui_xml._util import is_bool_string, is_num_str, parse_bool_string
+from pygame_gui_xml.profiling import ProfileStats
 
 
 T = TypeVar("T")
@@ -12,7 +16,7 @@ def is_bool_attr(data: str) -> bool:
 def is_int_str(string: str) -> bool:
     return is_num_str(string) and all([ char.isdigit() or char == "-" for char in string ])
 
-def get_num_tuple_attr(tag: bs4.Tag, attrname: str, length: int, default: tuple[int | float, ...]) -> tuple[int | float, ...]:
+def get_num_tuple_attr(tag: "bs4.Tag", attrname: str, length: int, default: tuple[int | float, ...]) -> tuple[int | float, ...]:
     if attrname in tag.attrs:
         values = [ string.strip() for string in tag[attrname].split(" ") if len(string) > 0 ]
         if all([ is_num_str(value) for value in values ]):
@@ -35,7 +39,7 @@ def get_num_attr(data: str) -> float | int:
     raise ValueError(f'Could not get num from {data}')
 
 
-def get_str_attr(tag: bs4.Tag, attrname: str, default: str, accepted: Iterable[str] = []) -> str:
+def get_str_attr(tag: "bs4.Tag", attrname: str, default: str, accepted: Iterable[str] = []) -> str:
     res = default
     
     if attrname in tag.attrs:
@@ -57,7 +61,8 @@ class TagDetails(TypedDict):
     parents: list[str]
     children: list[str]
 
-def get_tag_details(tag: bs4.Tag) -> TagDetails:
+def get_tag_details(tag: "bs4.Tag") -> TagDetails:
+    import bs4
     return {
         "name": tag.name,
         "attrs": tag.attrs,
@@ -67,41 +72,214 @@ def get_tag_details(tag: bs4.Tag) -> TagDetails:
     }
 
 
+_indexedAttrs: dict[str, str] = { "id": "#", "class": "@" }
+
+class XMLNodeIndex():
+    """
+    Document order index of a node tree, mapping tag names, attribute names, ids and classes to the nodes holding them
+
+    Every subtree occupies a contiguous run of positions, so the matches below any node are found by bisecting the position lists
+    """
+    def __init__(self, root: "XMLNode"):
+        self.nodes: list[XMLNode] = []
+        self.positions: dict[XMLNode, int] = {}
+        self.names: dict[str, list[int]] = {}
+        self.attrs: dict[str, list[int]] = {}
+        self.values: dict[str, dict[Any, list[int]]] = { attrname: {} for attrname in _indexedAttrs }
+
+        stack: list[XMLNode] = [root]
+        while len(stack) > 0:
+            node = stack.pop()
+            position = len(self.nodes)
+            self.nodes.append(node)
+            self.positions[node] = position
+            self.names.setdefault(node.name, []).append(position)
+            for attrname in node.attrs:
+                self.attrs.setdefault(attrname, []).append(position)
+                if attrname in self.values:
+                    self._add_value(attrname, node.attrs[attrname], position)
+            stack.extend(reversed(node.children))
+
+        self.ends: list[int] = [ position + 1 for position in range(len(self.nodes)) ]
+        for position in range(len(self.nodes) - 1, 0, -1):
+            parentPosition = self.positions[self.nodes[position].parent]
+            self.ends[parentPosition] = max(self.ends[parentPosition], self.ends[position])
+
+    def _add_value(self, attrname: str, value: Any, position: int):
+        try:
+            bisect.insort(self.values[attrname].setdefault(value, []), position)
+        except TypeError: # unhashable values are not indexed
+            pass
+
+    def _remove_value(self, attrname: str, value: Any, position: int):
+        try:
+            positions = self.values[attrname].get(value)
+        except TypeError:
+            return
+        if not positions is None and position in positions:
+            positions.remove(position)
+
+    def update_attr(self, node: "XMLNode", attrname: str, oldValue: Any, value: Any, isNew: bool):
+        position = self.positions[node]
+        if isNew:
+            bisect.insort(self.attrs.setdefault(attrname, []), position)
+        if attrname in self.values:
+            if not isNew:
+                self._remove_value(attrname, oldValue, position)
+            self._add_value(attrname, value, position)
+
+    def remove_attr(self, node: "XMLNode", attrname: str, oldValue: Any):
+        position = self.positions[node]
+        self.attrs[attrname].remove(position)
+        if attrname in self.values:
+            self._remove_value(attrname, oldValue, position)
+
+    def get_descendants(self, positions: list[int] | None, node: "XMLNode") -> list[int]:
+        """Narrows a sorted position list down to the descendants of node"""
+        if positions is None:
+            return []
+        position = self.positions[node]
+        return positions[bisect.bisect_right(positions, position):bisect.bisect_left(positions, self.ends[position])]
+
+    def get_value_positions(self, attrname: str, value: Any) -> list[int] | None:
+        lookup = self.values[attrname]
+        positions = lookup.get(value)
+        prefix = _indexedAttrs[attrname]
+        if positions is None and isinstance(value, str) and not value.startswith(prefix):
+            positions = lookup.get(prefix + value)
+        return positions
+
+
+_emptyAttrs: Mapping[str, Any] = types.MappingProxyType({})
+_emptyChildren: tuple["XMLNode", ...] = ()
+
 class XMLNode():
-    def __init__(self, name: str, attrs: dict[str, Any], text: str, parent: Union["XMLNode", None], children: list["XMLNode"]):
-        self.name = name
-        self.attrs = attrs
+    """
+    A validated and parsed XML tag
+
+    Nodes are kept compact for documents with tens of thousands of tags: they use __slots__, tag names are interned,
+    and nodes without attributes or children share one read-only empty mapping and one empty tuple.
+    Children are always a tuple, edited through the children setter and the child editing methods, and attributes
+    should be set with node[attrname] = value (the attrs of a node without attributes cannot be edited in place)
+
+    Queries are answered from an XMLNodeIndex built lazily on the root of the tree. Changes made through
+    __setitem__, __delitem__, the children setter and the child editing methods keep the index up to date,
+    while editing the attrs dict directly does not
+    """
+    __slots__ = ("name", "attrs", "text", "parent", "_children", "_index")
+
+    def __init__(self, name: str, attrs: dict[str, Any], text: str, parent: Union["XMLNode", None], children: Iterable["XMLNode"]):
+        self.name = sys.intern(name)
+        self.attrs: Mapping[str, Any] = attrs if len(attrs) > 0 else _emptyAttrs
         self.text = text
         self.parent = parent
+        self._children: tuple[XMLNode, ...] = tuple(children) or _emptyChildren
+        self._index: XMLNodeIndex | None = None
+
+    @property
+    def children(self) -> tuple["XMLNode", ...]:
+        return self._children
+
+    @children.setter
+    def children(self, children: Iterable["XMLNode"]):
+        self._children = tuple(children) or _emptyChildren
+        self.invalidate_index()
+
+    def get_root(self) -> "XMLNode":
+        root = self
+        while not root.parent is None:
+            root = root.parent
+        return root
+
+    def get_index(self) -> XMLNodeIndex:
+        root = self.get_root()
+        if root._index is None:
+            root._index = XMLNodeIndex(root)
+        return root._index
+
+    def invalidate_index(self):
+        self.get_root()._index = None
+
+    def append_child(self, child: "XMLNode"):
+        self.insert_child(len(self._children), child)
+
+    def insert_child(self, position: int, child: "XMLNode"):
+        child._index = None
+        child.parent = self
+        children = list(self._children)
+        children.insert(position, child)
         self.children = children
 
+    def remove_child(self, child: "XMLNode"):
+        children = list(self._children)
+        children.remove(child)
+        self.children = children
+        child.parent = None
+
     def find(self, name: str) -> Union["XMLNode", None]:
-        for child in self.children:
-            if child.name == name:
-                return child
-        for child in self.children:
-            result = child.find(name)
-            if not result is None:
-                return result
+        """Finds the first direct child named name, otherwise searches the subtree of each child in order"""
+        index = self.get_index()
+        positions = index.get_descendants(index.names.get(name), self)
+        current = self
+        while len(positions) > 0:
+            for position in positions:
+                if index.nodes[position].parent is current:
+                    return index.nodes[position]
+            childPositions = [ index.positions[child] for child in current.children ]
+            current = current.children[bisect.bisect_right(childPositions, positions[0]) - 1]
+            positions = index.get_descendants(positions, current)
         return None
 
     def find_all(self, name: str) -> Iterable["XMLNode"]:
-        found: list["XMLNode"] = [child for child in self.children if child.name == name]
-        for child in self.children:
-            found.extend(child.find_all(name))
-        return found
+        """Finds every descendant named name, in document order"""
+        index = self.get_index()
+        return [ index.nodes[position] for position in index.get_descendants(index.names.get(name), self) ]
 
     def find_all_with_attrs(self, attrs: Iterable[str]) -> Iterable["XMLNode"]:
-        found: list["XMLNode"] = [child for child in self.children if all([attr in child.attrs for attr in attrs])]
-        for child in self.children:
-            found.extend(child.find_all_with_attrs(attrs))
-        return found
+        """Finds every descendant holding all of the given attributes, in document order"""
+        index = self.get_index()
+        attrs = list(attrs)
+        if len(attrs) == 0:
+            position = index.positions[self]
+            return index.nodes[position + 1:index.ends[position]]
+        candidates = min([ index.get_descendants(index.attrs.get(attr), self) for attr in attrs ], key=len)
+        return [ index.nodes[position] for position in candidates if all([ attr in index.nodes[position].attrs for attr in attrs ]) ]
+
+    def find_all_by_id(self, _id: Any) -> list["XMLNode"]:
+        index = self.get_index()
+        return [ index.nodes[position] for position in index.get_descendants(index.get_value_positions("id", _id), self) ]
+
+    def find_by_id(self, _id: Any) -> Union["XMLNode", None]:
+        found = self.find_all_by_id(_id)
+        return found[0] if len(found) > 0 else None
+
+    def find_all_by_class(self, _class: Any) -> list["XMLNode"]:
+        index = self.get_index()
+        return [ index.nodes[position] for position in index.get_descendants(index.get_value_positions("class", _class), self) ]
 
     def __getitem__(self, attrname):
         return self.attrs[attrname]
 
     def __setitem__(self, attrname, value):
-        self.attrs[attrname] = value
+        isNew = not attrname in self.attrs
+        oldValue = self.attrs.get(attrname)
+        if self.attrs is _emptyAttrs:
+            self.attrs = {}
+        self.attrs[sys.intern(attrname) if isinstance(attrname, str) else attrname] = value
+        if isNew or attrname in _indexedAttrs:
+            index = self.get_root()._index
+            if not index is None:
+                index.update_attr(self, attrname, oldValue, value, isNew)
+
+    def __delitem__(self, attrname):
+        oldValue = self.attrs[attrname]
+        if len(self.attrs) == 1:
+            self.attrs = _emptyAttrs
+        else:
+            del self.attrs[attrname]
+        index = self.get_root()._index
+        if not index is None:
+            index.remove_attr(self, attrname, oldValue)
 
     def __contains__(self, attrname):
         return attrname in self.attrs
@@ -109,30 +287,54 @@ class XMLNode():
     def __str__(self) -> str:
         return f'XMLNode {self.name}: {{ attrs: {self.attrs}, text: {self.text}, parent: {self.parent.name if not self.parent is None else "None"}, children: {[ child.name for child in self.children ]}    }}'
 
+def get_checked_converter(parserfunc: Callable[[str], T], validator: Callable[[str], bool]) -> Callable[[str], T]:
+    """Wraps a validator and parser function pair into a single converter raising ValueError on invalid data"""
+    def convert(data: str) -> T:
+        if validator(data):
+            return parserfunc(data)
+        raise ValueError(f'Could not validate attribute data {data}')
+    return convert
+
+def identity_attr(data: str) -> str:
+    return data
+
+def get_int_attr(data: str) -> int:
+    if len(data) > 0 and all([ char.isdigit() or char == "-" for char in data ]):
+        return int(data)
+    raise ValueError(f'Could not get int from {data}')
+
 class XMLAttributeParserSchema(Generic[T]):
-    def __init__(self, name: str, required: bool, parserfunc: Callable[[str], T], validator: Callable[[str], bool]):
+    """
+    Describes how a single attribute is validated and parsed
+
+    converter, when given, must validate and parse the data in one pass, raising ValueError on invalid data.
+    Otherwise it is derived from the validator and parserfunc
+    """
+    def __init__(self, name: str, required: bool, parserfunc: Callable[[str], T], validator: Callable[[str], bool], converter: Callable[[str], T] | None = None):
         self.name = name
         self.type = T
         self.required = required
         self.parserfunc = parserfunc
         self.validator = validator
+        self.converter = converter or get_checked_converter(parserfunc, validator)
 
 class XMLBoolAttributeParserSchema(XMLAttributeParserSchema[bool]):
     def __init__(self, name: str, required: bool):
-        super().__init__(name, required, get_bool_attr, is_bool_attr)
+        super().__init__(name, required, get_bool_attr, is_bool_attr, parse_bool_string)
 
 class XMLStringAttributeParserSchema(XMLAttributeParserSchema[str]):
     def __init__(self, name: str, required: bool):
-        super().__init__(name, required, lambda data: data, lambda _: True)
+        super().__init__(name, required, identity_attr, lambda _: True, identity_attr)
 
 class XMLIntAttributeParserSchema(XMLAttributeParserSchema[int]):
     def __init__(self, name: str, required: bool):
-        super().__init__(name, required, get_num_attr, is_int_str)
+        super().__init__(name, required, get_num_attr, is_int_str, get_int_attr)
 
 class XMLFloatAttributeParserSchema(XMLAttributeParserSchema[float]):
     def __init__(self, name: str, required: bool):
-        super().__init__(name, required, get_num_attr, is_num_str)
+        super().__init__(name, required, get_num_attr, is_num_str, get_num_attr)
 
+CompiledTagParser = Callable[[dict[str, str], Iterable[str]], Union[dict[str, Any], None]]
 
 class XMLTagParserSchema():
     def __init__(self, name: str, attrSchema: Iterable[XMLAttributeParserSchema], acceptedChildren: Iterable[str]):
@@ -140,43 +342,269 @@ class XMLTagParserSchema():
         self.attrSchema: dict[str, XMLAttributeParserSchema] = { schema.name: schema  for schema in attrSchema }
         self.acceptedChildren = set(acceptedChildren)
 
-    def validate(self, tag: bs4.Tag):
+    def validate(self, tag: "bs4.Tag"):
+        import bs4
         return all([ child.name in self.acceptedChildren for child in tag.children if isinstance(child, bs4.Tag) ]) and all([ attribute in self.attrSchema for attribute in tag.attrs.keys() ]) and all([ self.attrSchema[attribute].validator(tag[attribute]) for attribute in tag.attrs.keys() ])
 
+    def compile(self) -> CompiledTagParser:
+        """
+        Builds a single pass routine which checks the child tag names and validates and converts every attribute exactly once
+
+        The routine returns the parsed attributes, or None if the tag does not follow this schema
+        """
+        converters = { name: (sys.intern(name), schema.converter) for name, schema in self.attrSchema.items() }
+        acceptedChildren = frozenset(self.acceptedChildren)
+
+        def parse_tag(attrs: dict[str, str], childNames: Iterable[str]) -> dict[str, Any] | None:
+            for childName in childNames:
+                if not childName in acceptedChildren:
+                    return None
+            parsed: dict[str, Any] = {}
+            for attr, data in attrs.items():
+                entry = converters.get(attr)
+                if entry is None:
+                    return None
+                key, converter = entry
+                try:
+                    parsed[key] = converter(data)
+                except ValueError:
+                    return None
+            return parsed
+        return parse_tag
+
+    def get_errors(self, attrs: dict[str, str]) -> list[str]:
+        """Describes every unknown or invalid attribute in attrs, rather than only whether the tag follows this schema"""
+        errors: list[str] = []
+        for attr, data in attrs.items():
+            schema = self.attrSchema.get(attr)
+            if schema is None:
+                errors.append(f'Unknown attribute {attr} on tag {self.name}')
+                continue
+            try:
+                schema.converter(data)
+            except ValueError as error:
+                errors.append(f'Invalid attribute {attr}="{data}" on tag {self.name}: {error}')
+        return errors
+
+class XMLValidationError(TypedDict):
+    """An error found while validating a document, at a line and column when the parsing backend reports them"""
+    line: int | None
+    column: int | None
+    tag: str | None
+    message: str
+
 
 class XMLParser():
-    """Parses XML"""
-    def __init__(self, tagSchemas: Iterable[XMLTagParserSchema]):
+    """
+    Parses XML
+
+    When given stats, the validation of every tag is timed under the "validate" phase of its tag name
+    """
+    def __init__(self, tagSchemas: Iterable[XMLTagParserSchema], stats: ProfileStats | None = None):
         self.tagSchemas = dict([ (tagSchema.name, tagSchema) for tagSchema in tagSchemas ])
         if not "[document]" in self.tagSchemas:
             self.tagSchemas["[document]"] = XMLTagParserSchema("[document]", [], list(self.tagSchemas.keys()) )
+        self._compiledSchemas: dict[str, CompiledTagParser] = { name: tagSchema.compile() for name, tagSchema in self.tagSchemas.items() }
+        if not stats is None:
+            self._compiledSchemas = { name: stats.wrap("validate", name, parse_tag) for name, parse_tag in self._compiledSchemas.items() }
+
+    def _get_tag_node(self, current: "bs4.Tag", parent: XMLNode | None) -> tuple[XMLNode, list["bs4.Tag"]]:
+        # bs4 is only imported by the "bs4" parsing backend, as importing it takes longer than parsing most layouts
+        import bs4
+        parse_tag = self._compiledSchemas.get(current.name)
+        if parse_tag is None:
+            raise ValueError(f'XML Parser Error: Could not find tag {get_tag_details(current)} in tag schema for parser ')
+
+        childTags = [ child for child in current.children if isinstance(child, bs4.Tag) ]
+        nodeAttrs = parse_tag(current.attrs, [ child.name for child in childTags ])
+        if nodeAttrs is None:
+            raise ValueError(f'XML Parser Error: Could not validate tag {get_tag_details(current)} according to given schema')
+
+        text = "" if current.string is None else str(current.string)
+        return XMLNode(current.name, nodeAttrs, text, parent, _emptyChildren), childTags
+
+    def get_ast_node(self, current: "bs4.Tag", parent: XMLNode | None) -> XMLNode:
+        """Builds the node tree below a bs4 tag in document order, iteratively so that deep documents cannot exceed the recursion limit"""
+        top, childTags = self._get_tag_node(current, parent)
+        childLists: list[tuple[XMLNode, list[XMLNode]]] = [(top, [])]
+        stack: list[tuple["bs4.Tag", XMLNode, list[XMLNode]]] = [ (child, top, childLists[0][1]) for child in reversed(childTags) ]
+        while len(stack) > 0:
+            tag, parentNode, siblings = stack.pop()
+            node, childTags = self._get_tag_node(tag, parentNode)
+            siblings.append(node)
+            if len(childTags) > 0:
+                childLists.append((node, []))
+                stack.extend([ (child, node, childLists[-1][1]) for child in reversed(childTags) ])
+        for node, children in childLists:
+            node._children = tuple(children)
+        return top
+
+    def get_ast(self, top: "bs4.Tag") -> XMLNode:
+        return self.get_ast_node(top, None)
 
-    def get_ast_node(self, current: bs4.Tag, parent: XMLNode | None) -> XMLNode:
-        if current.name in self.tagSchemas:
-            nodeAttrs: dict[str, Any] = {}
-            schema = self.tagSchemas[current.name]
-
-            if schema.validate(current):
-                for attr in current.attrs:
-                    if attr in schema.attrSchema:
-                        if schema.attrSchema[attr].validator(current[attr]):
-                            nodeAttrs[attr] = schema.attrSchema[attr].parserfunc(current[attr])
-                        else:
-                            raise ValueError(f'XML Parser Error: Could not validate attribute {attr} in schema for tag {get_tag_details(current)}')
-                    else:
-                        raise ValueError(f'XML Parser Error: Could not find attribute {attr} in schema for tag {get_tag_details(current)} ')
-                text = "" if str(current.string) is None else str(current.string)
-                node = XMLNode(current.name, nodeAttrs, text, parent, [])
-                node.children = [ self.get_ast_node(child, node) for child in current.children if isinstance(child, bs4.Tag) ]
-                return node
+    def get_ast_from_stream(self, source: BinaryIO, backend: str = "expat") -> XMLNode:
+        """
+        Builds the XMLNode tree straight from the parsing events of source, without building any intermediate document tree
+
+        backend is either "expat" (standard library) or "lxml"
+        """
+        builder = XMLNodeBuilder(self)
+        if backend == "expat":
+            return parse_with_expat(builder, source)
+        elif backend == "lxml":
+            return parse_with_lxml(builder, source)
+        raise ValueError(f'XML Parser Error: Unknown streaming backend {backend}')
+
+    def validate_stream(self, source: BinaryIO, backend: str = "expat", references: dict[str, list[str]] | None = None) -> list[XMLValidationError]:
+        """
+        Validates the document in source, returning every error found rather than raising on the first
+
+        Validation goes on past invalid tags, but stops at malformed XML. references collects raw attribute values as in XMLNodeBuilder
+        """
+        errors: list[XMLValidationError] = []
+        builder = XMLNodeBuilder(self, errors, references)
+        try:
+            if backend == "expat":
+                parse_with_expat(builder, source)
+            elif backend == "lxml":
+                parse_with_lxml(builder, source)
             else:
-                raise ValueError(f'XML Parser Error: Could not validate tag {get_tag_details(current)} according to given schema')
+                raise ValueError(f'XML Parser Error: Unknown streaming backend {backend}')
+        except ValueError as error:
+            errors.append(builder.get_error(None, str(error)))
+        return errors
+
+
+class _AnyTag():
+    """Accepts every child, for the children of tags which are not in the schema"""
+    def __contains__(self, name: str) -> bool:
+        return True
+
+_anyTag = _AnyTag()
+
+class _BuilderFrame():
+    def __init__(self, node: XMLNode, acceptedChildren: Iterable[str]):
+        self.node = node
+        self.acceptedChildren = acceptedChildren
+        self.children: list[XMLNode] = []
+        self.textParts: list[str] = []
+        self.contentCount = 0
+        self.lastWasText = False
+
+class XMLNodeBuilder():
+    """
+    Parser target building XMLNodes from start, data and end events, validating each tag against the schemas of an XMLParser as it opens
+
+    The text of a node follows the bs4 rules used by XMLParser.get_ast: the text of its only child, or an empty string when it has several
+
+    Invalid tags raise a ValueError, unless given errors, where every problem is recorded instead and building goes on
+
+    When given references, the raw value of every attribute named by its keys is appended to the list of that attribute,
+    whether or not the attribute is valid
+    """
+    def __init__(self, parser: XMLParser, errors: list[XMLValidationError] | None = None, references: dict[str, list[str]] | None = None):
+        self._parser = parser
+        self._errors = errors
+        self._references = references
+        self.get_position: Callable[[], tuple[int, int]] | None = None
+        root = XMLNode("[document]", {}, "", None, _emptyChildren)
+        self._stack: list[_BuilderFrame] = [ _BuilderFrame(root, parser.tagSchemas["[document]"].acceptedChildren) ]
+
+    def _get_details(self, frame: _BuilderFrame) -> TagDetails:
+        return {
+            "name": frame.node.name,
+            "attrs": frame.node.attrs,
+            "text": "".join(frame.textParts),
+            "parents": [ parentFrame.node.name for parentFrame in reversed(self._stack) if not parentFrame is frame ],
+            "children": [ child.name for child in frame.children ]
+        }
+
+    def _get_start_details(self, tag: str, attrs: dict[str, str]) -> TagDetails:
+        return { "name": tag, "attrs": attrs, "text": "", "parents": [ frame.node.name for frame in reversed(self._stack) ], "children": [] }
+
+    def get_error(self, tag: str | None, message: str) -> XMLValidationError:
+        line, column = self.get_position() if not self.get_position is None else (None, None)
+        return { "line": line, "column": column, "tag": tag, "message": message }
+
+    def _fail(self, error: str, tag: str, messages: Iterable[str]):
+        if self._errors is None:
+            raise ValueError(error)
+        self._errors.extend([ self.get_error(tag, message) for message in messages ])
+
+    def start(self, tag: str, attrs: dict[str, str]):
+        parentFrame = self._stack[-1]
+        if not self._references is None:
+            for attr, values in self._references.items():
+                if attr in attrs:
+                    values.append(attrs[attr])
+        if not tag in parentFrame.acceptedChildren:
+            self._fail(f'XML Parser Error: Could not validate tag {self._get_details(parentFrame)} according to given schema', tag, [f'Tag {tag} is not accepted inside of {parentFrame.node.name}'])
+
+        acceptedChildren = _anyTag
+        parse_tag = self._parser._compiledSchemas.get(tag)
+        if parse_tag is None:
+            self._fail(f'XML Parser Error: Could not find tag {self._get_start_details(tag, attrs)} in tag schema for parser ', tag, [f'Unknown tag {tag}'])
+            nodeAttrs = {}
         else:
-            raise ValueError(f'XML Parser Error: Could not find tag {get_tag_details(current)} in tag schema for parser ')
+            acceptedChildren = self._parser.tagSchemas[tag].acceptedChildren
+            nodeAttrs = parse_tag(attrs, ())
+            if nodeAttrs is None:
+                self._fail(f'XML Parser Error: Could not validate tag {self._get_start_details(tag, attrs)} according to given schema', tag, self._parser.tagSchemas[tag].get_errors(attrs))
+                nodeAttrs = {}
+
+        node = XMLNode(tag, nodeAttrs, "", parentFrame.node, _emptyChildren)
+        parentFrame.children.append(node)
+        parentFrame.contentCount += 1
+        parentFrame.lastWasText = False
+        self._stack.append(_BuilderFrame(node, acceptedChildren))
+
+    def data(self, text: str):
+        frame = self._stack[-1]
+        if not frame.lastWasText:
+            frame.contentCount += 1
+            frame.lastWasText = True
+        frame.textParts.append(text)
+
+    def end(self, tag: str):
+        frame = self._stack.pop()
+        node = frame.node
+        if frame.contentCount == 1:
+            node.text = "".join(frame.textParts) if frame.lastWasText else frame.children[0].text
+        node._children = tuple(frame.children) or _emptyChildren
+
+    def close(self) -> XMLNode | None:
+        """Finishes the document node, or returns None if parsing stopped with tags still open"""
+        if len(self._stack) != 1:
+            return None
+        frame = self._stack[0]
+        self.end(frame.node.name)
+        return frame.node
+
+def parse_with_expat(builder: XMLNodeBuilder, source: BinaryIO) -> XMLNode:
+    expatParser = xml.parsers.expat.ParserCreate()
+    expatParser.buffer_text = True
+    expatParser.StartElementHandler = builder.start
+    expatParser.EndElementHandler = builder.end
+    expatParser.CharacterDataHandler = builder.data
+    builder.get_position = lambda: (expatParser.CurrentLineNumber, expatParser.CurrentColumnNumber)
+    try:
+        expatParser.ParseFile(source)
+    except xml.parsers.expat.ExpatError as error:
+        raise ValueError(f'XML Parser Error: Malformed XML: {error}')
+    return get_built_document(builder.close())
 
+def parse_with_lxml(builder: XMLNodeBuilder, source: BinaryIO) -> XMLNode:
+    import lxml.etree
+    try:
+        # lxml calls builder.close itself and returns its result
+        return get_built_document(lxml.etree.parse(source, lxml.etree.XMLParser(target=builder)))
+    except lxml.etree.XMLSyntaxError as error:
+        raise ValueError(f'XML Parser Error: Malformed XML: {error}')
 
-    def get_ast(self, top: bs4.Tag) -> XMLNode:
-        return self.get_ast_node(top, None)
+def get_built_document(document: XMLNode | None) -> XMLNode:
+    if document is None:
+        raise ValueError("XML Parser Error: Malformed XML: document ended with unclosed tags")
+    return document
 
 vec4 = tuple[int, int, int, int]
 
@@ -189,6 +617,7 @@ def print_xml_node_tree(head: XMLNode):
 
 
 if __name__ == "__main__":
+    import bs4
     xml = bs4.BeautifulSoup("<panel id='3'> <name>Jacoby</name> </panel>", "lxml-xml")
     print(xml)
     id = XMLIntAttributeParserSchema("id", True)
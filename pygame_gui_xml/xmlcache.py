@@ -0,0 +1,132 @@
+import os
+import hashlib
+import pickle
+import threading
+from typing import Any, Iterable
+import pygame_gui_xml
+import pygame_gui_xml.xmlast as xmlast
+
+CACHE_FORMAT_VERSION = 1
+DEFAULT_MAX_CACHE_SIZE = 32 * 1024 * 1024
+_cacheExtension = ".ast"
+
+FlatXMLNode = tuple[str, dict[str, Any], str, int]
+
+def get_default_cache_dir() -> str:
+    """The directory used by an ASTCache when none is given, overridable with the PYGAME_GUI_XML_CACHE_DIR environment variable"""
+    if "PYGAME_GUI_XML_CACHE_DIR" in os.environ:
+        return os.environ["PYGAME_GUI_XML_CACHE_DIR"]
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "pygame_gui_xml")
+
+def get_schema_fingerprint(tagSchemas: Iterable[xmlast.XMLTagParserSchema], version: int | str = "") -> str:
+    """Hashes the tag names, attribute names and accepted children of a set of schemas, so that cached trees are dropped when the schema changes"""
+    hasher = hashlib.sha256(str(version).encode())
+    for schema in sorted(tagSchemas, key=lambda schema: schema.name):
+        attrs = sorted( (attr.name, attr.required) for attr in schema.attrSchema.values() )
+        hasher.update(repr((schema.name, attrs, sorted(schema.acceptedChildren))).encode())
+    return hasher.hexdigest()
+
+def flatten_xml_tree(head: xmlast.XMLNode) -> list[FlatXMLNode]:
+    """Lists a node tree in document order as (name, attrs, text, parent index) entries, avoiding deep recursion when pickling"""
+    flat: list[FlatXMLNode] = []
+    stack: list[tuple[xmlast.XMLNode, int]] = [(head, -1)]
+    while len(stack) > 0:
+        node, parentIndex = stack.pop()
+        flat.append((node.name, dict(node.attrs), node.text, parentIndex))
+        index = len(flat) - 1
+        stack.extend([ (child, index) for child in reversed(node.children) ])
+    return flat
+
+def unflatten_xml_tree(flat: list[FlatXMLNode]) -> xmlast.XMLNode:
+    """Rebuilds the node tree listed by flatten_xml_tree, creating children before their parents"""
+    if len(flat) == 0:
+        raise ValueError("Could not unflatten XML Node Tree: no nodes given")
+    childLists: list[list[xmlast.XMLNode]] = [ [] for _ in flat ]
+    node: xmlast.XMLNode | None = None
+    for index in range(len(flat) - 1, -1, -1):
+        name, attrs, text, parentIndex = flat[index]
+        children = childLists[index]
+        children.reverse()
+        node = xmlast.XMLNode(name, attrs, text, None, children)
+        for child in children:
+            child.parent = node
+        if parentIndex >= 0:
+            childLists[parentIndex].append(node)
+    return node
+
+
+class ASTCache():
+    """
+    Persistent cache of validated and parsed XMLNode trees
+
+    Entries are keyed by the hash of the source content, the schema fingerprint and the library version,
+    so editing a layout, changing the schema or upgrading the library never serves a stale tree. The files a tree
+    names are not part of the key, and parse_pygame_xml checks them again on every hit.
+    The least recently used entries are evicted once the directory grows over max_size bytes
+    """
+    def __init__(self, directory: str | None = None, max_size: int = DEFAULT_MAX_CACHE_SIZE, schema_fingerprint: str = ""):
+        self.directory = directory or get_default_cache_dir()
+        self.max_size = max_size
+        self.schema_fingerprint = schema_fingerprint
+
+    def get_key(self, content: bytes) -> str:
+        hasher = hashlib.sha256(content)
+        hasher.update(self.schema_fingerprint.encode())
+        hasher.update(f'{pygame_gui_xml.__version__}:{CACHE_FORMAT_VERSION}'.encode())
+        return hasher.hexdigest()
+
+    def _get_path(self, key: str) -> str:
+        return os.path.join(self.directory, key + _cacheExtension)
+
+    def load(self, key: str) -> xmlast.XMLNode | None:
+        path = self._get_path(key)
+        try:
+            with open(path, "rb") as f:
+                flat = pickle.load(f)
+            os.utime(path)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ValueError):
+            return None
+        return unflatten_xml_tree(flat)
+
+    def store(self, key: str, node: xmlast.XMLNode):
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._get_path(key)
+        temppath = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(temppath, "wb") as f:
+            pickle.dump(flatten_xml_tree(node), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temppath, path)
+        self.evict()
+
+    def get_size(self) -> int:
+        return sum([ size for _, _, size in self._get_entries() ])
+
+    def _get_entries(self) -> list[tuple[str, float, int]]:
+        entries: list[tuple[str, float, int]] = []
+        if not os.path.isdir(self.directory):
+            return entries
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(_cacheExtension) and entry.is_file():
+                stat = entry.stat()
+                entries.append((entry.path, stat.st_mtime, stat.st_size))
+        return entries
+
+    def evict(self):
+        """Removes the least recently used entries until the cache fits in max_size bytes"""
+        entries = sorted(self._get_entries(), key=lambda entry: entry[1])
+        total = sum([ size for _, _, size in entries ])
+        for path, _, size in entries:
+            if total <= self.max_size:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+
+    def clear(self):
+        for path, _, _ in self._get_entries():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
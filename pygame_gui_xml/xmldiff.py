@@ -0,0 +1,109 @@
+from typing import Any
+import pygame_gui_xml.xmlast as xmlast
+
+_missing = object()
+
+class XMLNodeChange():
+    """
+    A single difference between two node trees
+
+    kind is "create" (new has no counterpart), "kill" (old has no counterpart) or "update" (a matched pair whose attributes or text differ)
+    """
+    def __init__(self, kind: str, old: xmlast.XMLNode | None, new: xmlast.XMLNode | None, attrs: set[str] | None = None, text: bool = False):
+        self.kind = kind
+        self.old = old
+        self.new = new
+        self.attrs: set[str] = attrs or set()
+        self.text = text
+
+    def __str__(self) -> str:
+        node = self.new if not self.new is None else self.old
+        return f'XMLNodeChange {self.kind} {node.name}: {{ attrs: {sorted(self.attrs)}, text: {self.text} }}'
+
+class XMLTreeDiff():
+    """The changes turning one node tree into another, along with the new node matched to each kept old node"""
+    def __init__(self):
+        self.matches: dict[xmlast.XMLNode, xmlast.XMLNode] = {}
+        self.changes: list[XMLNodeChange] = []
+
+    def is_empty(self) -> bool:
+        return len(self.changes) == 0
+
+def get_changed_attrs(old: xmlast.XMLNode, new: xmlast.XMLNode) -> set[str]:
+    return { attrname for attrname in set(old.attrs) | set(new.attrs) if old.attrs.get(attrname, _missing) != new.attrs.get(attrname, _missing) }
+
+def match_children(oldChildren: tuple[xmlast.XMLNode, ...], newChildren: tuple[xmlast.XMLNode, ...]) -> list[tuple[xmlast.XMLNode | None, xmlast.XMLNode | None]]:
+    """
+    Pairs up the children of two matched nodes
+
+    Children with an id are matched by id, the others by their position among the siblings of the same name without an id.
+    Unmatched children are paired with None
+    """
+    oldById: dict[Any, xmlast.XMLNode] = {}
+    oldByName: dict[str, list[xmlast.XMLNode]] = {}
+    for child in oldChildren:
+        if "id" in child.attrs:
+            oldById.setdefault(child.attrs["id"], child)
+        else:
+            oldByName.setdefault(child.name, []).append(child)
+
+    pairs: list[tuple[xmlast.XMLNode | None, xmlast.XMLNode | None]] = []
+    matched: set[xmlast.XMLNode] = set()
+    positions: dict[str, int] = {}
+    for child in newChildren:
+        if "id" in child.attrs:
+            candidate = oldById.get(child.attrs["id"])
+        else:
+            position = positions.get(child.name, 0)
+            positions[child.name] = position + 1
+            siblings = oldByName.get(child.name, [])
+            candidate = siblings[position] if position < len(siblings) else None
+        if not candidate is None and candidate.name == child.name and not candidate in matched:
+            matched.add(candidate)
+            pairs.append((candidate, child))
+        else:
+            pairs.append((None, child))
+    pairs.extend([ (child, None) for child in oldChildren if not child in matched ])
+    return pairs
+
+def diff_trees(old: xmlast.XMLNode, new: xmlast.XMLNode) -> XMLTreeDiff:
+    """Matches the nodes of two trees by id or structural position and lists the creates, kills and updates between them, parents before children"""
+    diff = XMLTreeDiff()
+    if old.name != new.name:
+        diff.changes.append(XMLNodeChange("kill", old, None))
+        diff.changes.append(XMLNodeChange("create", None, new))
+        return diff
+
+    stack: list[tuple[xmlast.XMLNode, xmlast.XMLNode]] = [(old, new)]
+    while len(stack) > 0:
+        oldNode, newNode = stack.pop()
+        diff.matches[newNode] = oldNode
+        changedAttrs = get_changed_attrs(oldNode, newNode)
+        # the text of a node with children only mirrors the text of an only child, so it is compared on that child
+        changedText = oldNode.text != newNode.text and (len(oldNode.children) == 0 or len(newNode.children) == 0)
+        if len(changedAttrs) > 0 or changedText:
+            diff.changes.append(XMLNodeChange("update", oldNode, newNode, changedAttrs, changedText))
+
+        pairs = match_children(oldNode.children, newNode.children)
+        for oldChild, newChild in pairs:
+            if oldChild is None:
+                diff.changes.append(XMLNodeChange("create", None, newChild))
+            elif newChild is None:
+                diff.changes.append(XMLNodeChange("kill", oldChild, None))
+        stack.extend(reversed([ pair for pair in pairs if not pair[0] is None and not pair[1] is None ]))
+    return diff
+
+def add_changed_values(diff: XMLTreeDiff, attrname: str, oldValues: dict[xmlast.XMLNode, Any]):
+    """
+    Marks attrname as changed on every matched node whose value differs from the value of its old node in oldValues
+
+    Used for values written into the trees after diffing, such as rects resolved against the rect of their parent,
+    which can change when the lengths of the node itself did not
+    """
+    updates = { change.new: change for change in diff.changes if change.kind == "update" }
+    for new, old in diff.matches.items():
+        if old in oldValues and new.attrs.get(attrname, _missing) != oldValues[old]:
+            if new in updates:
+                updates[new].attrs.add(attrname)
+            else:
+                diff.changes.append(XMLNodeChange("update", old, new, {attrname}))
@@ -1,8 +1,17 @@
 import os
-import bs4
+import io
+import logging
+import importlib.util
+from typing import Iterable
 import pygame_gui_xml.xmlast as xmlast
+import pygame_gui_xml.xmlcache as xmlcache
+import pygame_gui_xml.profiling as profiling
+import pygame_gui_xml.layout as layout
+import pygame_gui_xml.datasource as datasource
 from pygame_gui_xml._util import is_num_str
-from pygame_gui_xml._config import is_valid_anchor, get_valid_tags, get_element_tags
+from pygame_gui_xml._config import is_valid_anchor, is_valid_bind_target, get_bind_targets, get_valid_tags, get_element_tags
+
+logger = logging.getLogger(__name__)
 
 
 
@@ -38,16 +47,31 @@ def get_hover_distance(data: str) -> tuple[int, int]:
 
 vec4 = tuple[int, int, int, int]
 def validate_rect(data: str) -> bool:
-    return all([ is_num_str(string) for string in data.split(" ") ]) and len(data.split(" ")) == 4
+    try:
+        layout.parse_lengths(data, 4)
+        return True
+    except ValueError:
+        return False
+
+def get_tag_rect(data: str) -> layout.LayoutRect:
+    """Parses the four lengths of a rect, where rects of plain pixels are a tuple of floats as before units were accepted"""
+    try:
+        return layout.parse_lengths(data, 4)
+    except ValueError:
+        raise ValueError(f'Could not parse rect data {data}')
+
+def validate_size(data: str) -> bool:
+    try:
+        layout.parse_lengths(data, 2)
+        return True
+    except ValueError:
+        return False
 
-def get_tag_rect(data: str) -> vec4:
-    splitted = data.split(" ")
-    if all([ is_num_str(splitstring) for splitstring in splitted]):
-        rect = [float(data) for data in splitted]
-        datapoints = len(rect)
-        if datapoints == 4:
-            return tuple(rect)
-    raise ValueError(f'Could not parse rect data {data}')
+def get_size(data: str) -> layout.Size:
+    try:
+        return layout.parse_lengths(data, 2)
+    except ValueError:
+        raise ValueError(f'Could not parse size data {data}')
 
 
 def validate_anchors(data: str) -> bool:
@@ -56,12 +80,62 @@ def validate_anchors(data: str) -> bool:
 def get_anchors(data: str) -> dict[str, str]:
     positioning = [ selection.strip() for selection in data.split(" ") ]
     positioning = [ position for position in positioning if is_valid_anchor(position) ]
-    print(positioning)
+    logger.debug("Parsed anchors %s", positioning)
     anchors: dict[str, str] = {}
     for position in positioning:
         anchors[position] = position
     return anchors
 
+def convert_anchors(data: str) -> dict[str, str]:
+    anchors: dict[str, str] = {}
+    for position in data.split(" "):
+        if not is_valid_anchor(position):
+            raise ValueError(f'Could not parse anchors data {data}, invalid anchor {position}')
+        anchors[position] = position
+    return anchors
+
+def validate_bind(data: str, targets: Iterable[str] | None = None) -> bool:
+    try:
+        convert_bind(data, targets)
+        return True
+    except ValueError:
+        return False
+
+def convert_bind(data: str, targets: Iterable[str] | None = None) -> dict[str, str]:
+    """
+    Parses "target:key" pairs, such as "text:score visible:alive", into a dict of bound state key by target
+
+    When given targets, only those targets can be bound
+    """
+    bindings: dict[str, str] = {}
+    for binding in data.split():
+        target, _, key = binding.partition(":")
+        if not is_valid_bind_target(target) or len(key) == 0:
+            raise ValueError(f'Could not parse bind data {data}, invalid binding {binding}')
+        if not targets is None and not target in targets:
+            raise ValueError(f'Could not parse bind data {data}, cannot bind {target}, expected one of {list(targets)}')
+        bindings[target] = key
+    if len(bindings) == 0:
+        raise ValueError(f'Could not parse bind data {data}, no bindings given')
+    return bindings
+
+def get_bind_schema(tag: str) -> xmlast.XMLAttributeParserSchema[dict[str, str]]:
+    """The bind attribute of a tag, accepting only the bind targets its element can show"""
+    targets = get_bind_targets(tag)
+    convert = lambda data: convert_bind(data, targets)
+    return xmlast.XMLAttributeParserSchema[dict[str, str]]("bind", False, convert, lambda data: validate_bind(data, targets), convert)
+
+def convert_src(data: str) -> str:
+    if os.path.exists(os.path.abspath(data)):
+        return data
+    raise ValueError(f'Could not find src file {data}')
+
+def convert_datasource(data: str) -> str:
+    # only checks the file, which is read once the element is built, so that parsing does not depend on its size
+    if datasource.is_datasource_file(data):
+        return data
+    raise ValueError(f'Could not find datasource file {data}')
+
 def get_class_id(data: str) -> bool:
     if not data[0] == "@":
         return "@" + data
@@ -73,23 +147,27 @@ def get_object_id(data: str) -> bool:
     return data
 
 
-rect = xmlast.XMLAttributeParserSchema[vec4]("rect", True, get_tag_rect, validate_rect)
-anchors = xmlast.XMLAttributeParserSchema[dict[str, str]]("anchors", False, get_anchors, validate_anchors)
+rect = xmlast.XMLAttributeParserSchema[vec4]("rect", True, get_tag_rect, validate_rect, get_tag_rect)
+anchors = xmlast.XMLAttributeParserSchema[dict[str, str]]("anchors", False, get_anchors, validate_anchors, convert_anchors)
 resizable = xmlast.XMLBoolAttributeParserSchema( "resizable", False)
 selected = xmlast.XMLBoolAttributeParserSchema("selected", False)
-src = xmlast.XMLAttributeParserSchema[str]("src", True, lambda data: data, lambda data: os.path.exists(os.path.abspath(data)) )
+src = xmlast.XMLAttributeParserSchema[str]("src", True, lambda data: data, lambda data: os.path.exists(os.path.abspath(data)), convert_src)
 multiselect = xmlast.XMLBoolAttributeParserSchema("multiselect", False)
 title = xmlast.XMLStringAttributeParserSchema("title", False)
 start = xmlast.XMLFloatAttributeParserSchema("start", False)
 starting = xmlast.XMLBoolAttributeParserSchema("start", False)
-range_value = xmlast.XMLAttributeParserSchema[tuple[float, float]]("range", False, get_range, validate_range)
+range_value = xmlast.XMLAttributeParserSchema[tuple[float, float]]("range", False, get_range, validate_range, get_range)
 click_increment = xmlast.XMLIntAttributeParserSchema("click-increment", False)
 placeholder = xmlast.XMLStringAttributeParserSchema("placeholder", False)
 initial = xmlast.XMLStringAttributeParserSchema("initial", False)
-hover_distance = xmlast.XMLAttributeParserSchema[tuple[int, int]]("hover-distance", False, get_hover_distance, validate_hover_distance)
-id_attr = xmlast.XMLAttributeParserSchema("id", False, get_object_id, lambda _: True)
-class_attr = xmlast.XMLAttributeParserSchema("class", False, get_class_id, lambda _: True)
+hover_distance = xmlast.XMLAttributeParserSchema[tuple[int, int]]("hover-distance", False, get_hover_distance, validate_hover_distance, get_hover_distance)
+id_attr = xmlast.XMLAttributeParserSchema("id", False, get_object_id, lambda _: True, get_object_id)
+class_attr = xmlast.XMLAttributeParserSchema("class", False, get_class_id, lambda _: True, get_class_id)
 tooltip_attr = xmlast.XMLStringAttributeParserSchema("tooltip", False);
+static = xmlast.XMLBoolAttributeParserSchema("static", False)
+min_size = xmlast.XMLAttributeParserSchema[layout.Size]("min-size", False, get_size, validate_size, get_size)
+max_size = xmlast.XMLAttributeParserSchema[layout.Size]("max-size", False, get_size, validate_size, get_size)
+datasource_attr = xmlast.XMLAttributeParserSchema[str]("datasource", False, lambda data: data, datasource.is_datasource_file, convert_datasource)
 
 pygamegui = xmlast.XMLTagParserSchema("pygamegui", [], get_valid_tags())
 
@@ -99,35 +177,99 @@ themes = xmlast.XMLTagParserSchema("themes", [], ["theme"])
 theme = xmlast.XMLTagParserSchema("theme", [], [])
 
 body = xmlast.XMLTagParserSchema("body", [rect], get_element_tags())
-window = xmlast.XMLTagParserSchema("window", [rect, title, id_attr, class_attr, resizable], get_element_tags())
-panel = xmlast.XMLTagParserSchema("panel", [rect, anchors, id_attr, class_attr], get_element_tags())
+window = xmlast.XMLTagParserSchema("window", [rect, min_size, max_size, title, id_attr, class_attr, resizable, get_bind_schema("window")], get_element_tags())
+panel = xmlast.XMLTagParserSchema("panel", [rect, min_size, max_size, anchors, id_attr, class_attr, get_bind_schema("panel"), static], get_element_tags())
 
-button = xmlast.XMLTagParserSchema("button", [rect, anchors, id_attr, class_attr, tooltip_attr], [])
-image = xmlast.XMLTagParserSchema("image", [src, rect, anchors, id_attr, class_attr], [])
-label = xmlast.XMLTagParserSchema("label", [rect, anchors, id_attr, class_attr], [])
-textbox = xmlast.XMLTagParserSchema("textbox", [rect, anchors, id_attr, class_attr], [])
-statusbar = xmlast.XMLTagParserSchema("statusbar", [rect, anchors, id_attr, class_attr], [])
+button = xmlast.XMLTagParserSchema("button", [rect, min_size, max_size, anchors, id_attr, class_attr, tooltip_attr, get_bind_schema("button")], [])
+image = xmlast.XMLTagParserSchema("image", [src, rect, min_size, max_size, anchors, id_attr, class_attr, get_bind_schema("image"), static], [])
+label = xmlast.XMLTagParserSchema("label", [rect, min_size, max_size, anchors, id_attr, class_attr, get_bind_schema("label"), static], [])
+textbox = xmlast.XMLTagParserSchema("textbox", [rect, min_size, max_size, anchors, id_attr, class_attr, get_bind_schema("textbox")], [])
+statusbar = xmlast.XMLTagParserSchema("statusbar", [rect, min_size, max_size, anchors, id_attr, class_attr, get_bind_schema("statusbar")], [])
 
-selectionlist = xmlast.XMLTagParserSchema("selectionlist", [rect, anchors, id_attr, class_attr], ["item"])
+selectionlist = xmlast.XMLTagParserSchema("selectionlist", [rect, min_size, max_size, anchors, id_attr, class_attr, get_bind_schema("selectionlist"), datasource_attr], ["item"])
+virtuallist = xmlast.XMLTagParserSchema("virtuallist", [rect, min_size, max_size, anchors, multiselect, id_attr, class_attr, get_bind_schema("virtuallist")], ["item"])
 item = xmlast.XMLTagParserSchema("item", [selected], [])
 
-horizontalslider = xmlast.XMLTagParserSchema("horizontalslider", [rect, anchors, start, range_value, click_increment, id_attr, class_attr], [])
-dropdownmenu = xmlast.XMLTagParserSchema("dropdownmenu", [rect, anchors, id_attr, class_attr], ["option"])
+horizontalslider = xmlast.XMLTagParserSchema("horizontalslider", [rect, min_size, max_size, anchors, start, range_value, click_increment, id_attr, class_attr, get_bind_schema("horizontalslider")], [])
+dropdownmenu = xmlast.XMLTagParserSchema("dropdownmenu", [rect, min_size, max_size, anchors, id_attr, class_attr, get_bind_schema("dropdownmenu"), datasource_attr], ["option"])
 option = xmlast.XMLTagParserSchema("option", [starting], [])
 
-textentryline = xmlast.XMLTagParserSchema("textentryline", [ rect, anchors, placeholder, initial, id_attr, class_attr ], [])
-textentrybox = xmlast.XMLTagParserSchema("textentrybox", [rect, anchors, initial, id_attr, class_attr], [])
+textentryline = xmlast.XMLTagParserSchema("textentryline", [ rect, min_size, max_size, anchors, placeholder, initial, id_attr, class_attr, get_bind_schema("textentryline") ], [])
+textentrybox = xmlast.XMLTagParserSchema("textentrybox", [rect, min_size, max_size, anchors, initial, id_attr, class_attr, get_bind_schema("textentrybox")], [])
 tooltip = xmlast.XMLTagParserSchema("tooltip", [anchors, hover_distance, id_attr, class_attr], [])
 
-schemas: list[xmlast.XMLTagParserSchema] = [pygamegui, head, themes, theme, body, button, image, window, panel, label, textbox, statusbar, selectionlist, item, horizontalslider, dropdownmenu, option, textentryline, textentrybox, tooltip]
+schemas: list[xmlast.XMLTagParserSchema] = [pygamegui, head, themes, theme, body, button, image, window, panel, label, textbox, statusbar, selectionlist, virtuallist, item, horizontalslider, dropdownmenu, option, textentryline, textentrybox, tooltip]
+
+# Bump whenever a parser function changes the values it produces, so that cached trees are rebuilt
+SCHEMA_VERSION = 5
+
+def get_schema_fingerprint() -> str:
+    return xmlcache.get_schema_fingerprint(schemas, SCHEMA_VERSION)
+
+def create_ast_cache(directory: str | None = None, max_size: int = xmlcache.DEFAULT_MAX_CACHE_SIZE) -> xmlcache.ASTCache:
+    """Creates an on-disk AST cache bound to the pygame_gui_xml schemas, to be passed to parse_pygame_xml"""
+    return xmlcache.ASTCache(directory, max_size, get_schema_fingerprint())
+
+backends: list[str] = ["expat", "lxml", "bs4"]
+# the packages each backend imports once used, none of which are imported before
+_backendPackages: dict[str, str | None] = { "expat": None, "lxml": "lxml", "bs4": "bs4" }
+
+def is_backend_available(backend: str) -> bool:
+    package = _backendPackages.get(backend)
+    return backend in _backendPackages and (package is None or not importlib.util.find_spec(package) is None)
+
+# attributes naming files, which are resolved against the working directory when validated
+fileAttrs: list[str] = ["src", "datasource"]
+
+def get_file_reference_errors(node: xmlast.XMLNode) -> list[str]:
+    """Validates the attributes naming files in a parsed tree again, describing every file which can no longer be found"""
+    tagSchemas = { schema.name: schema for schema in schemas }
+    errors: list[str] = []
+    for attr in fileAttrs:
+        for referencing in node.find_all_with_attrs([attr]):
+            errors.extend(tagSchemas[referencing.name].get_errors({ attr: referencing.attrs[attr] }))
+    return errors
+
+def parse_pygame_xml(file: str, cache: xmlcache.ASTCache | None = None, backend: str = "expat", stats: profiling.ProfileStats | None = None) -> xmlast.XMLNode:
+    """
+    Parses and validates a pygame_gui_xml file into an XMLNode tree
+
+    backend selects how the XML is read: "expat" and "lxml" build the tree straight from streamed parsing events,
+    while "bs4" builds a BeautifulSoup document first
+
+    When given stats, reading, cache lookups, parsing and the validation of each tag are timed into it
+    """
+    if not backend in backends:
+        raise ValueError(f'Unknown XML backend {backend}, expected one of {backends}')
+
+    with profiling.timed(stats, "read"):
+        with open(file, "rb") as f:
+            content = f.read()
 
-def parse_pygame_xml(file: str) -> xmlast.XMLNode:
-    with open(file, "r") as f:
-        doc = bs4.BeautifulSoup(f, "lxml-xml")
-        parser = xmlast.XMLParser(schemas)
-        node = parser.get_ast(doc)
-        node.attrs["path"] = file
-        print(node.attrs)
-        return node
-    raise ValueError(f'Could not open file {file}')        
+    key = cache.get_key(content) if not cache is None else ""
+    node = None
+    if not cache is None:
+        with profiling.timed(stats, "cache load"):
+            node = cache.load(key)
+            # the key only covers the content of the file, so the files it names are checked as an uncached parse would
+            errors = get_file_reference_errors(node) if not node is None else []
+        if len(errors) > 0:
+            raise ValueError(f'XML Parser Error: {"; ".join(errors)}')
+    if node is None:
+        parser = xmlast.XMLParser(schemas, stats)
+        if backend == "bs4":
+            import bs4
+            with profiling.timed(stats, "bs4"):
+                document = bs4.BeautifulSoup(content, "lxml-xml")
+            with profiling.timed(stats, "parse[bs4]"):
+                node = parser.get_ast(document)
+        else:
+            with profiling.timed(stats, f'parse[{backend}]'):
+                node = parser.get_ast_from_stream(io.BytesIO(content), backend)
+        if not cache is None:
+            with profiling.timed(stats, "cache store"):
+                cache.store(key, node)
 
+    node["path"] = file
+    logger.debug("Parsed %s with attributes %s", file, dict(node.attrs))
+    return node
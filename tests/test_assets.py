@@ -0,0 +1,85 @@
+import unittest
+import unittest.mock
+import sys
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.append(os.path.join(os.path.abspath(os.path.dirname(__file__)), "../"))
+import pygame
+import pygame_gui
+import pygame_gui_xml.assets as assets
+
+STYLES = os.path.join( os.path.dirname(os.path.abspath(__file__)), "data/styles.json" )
+CAMERA = os.path.join( os.path.dirname(os.path.abspath(__file__)), "data/Camera.png" )
+
+class ThemeCacheTest(unittest.TestCase):
+    def setUp(self):
+        pygame.init()
+        pygame.display.set_mode((800, 600))
+
+    def tearDown(self):
+        pygame.quit()
+
+    def test_themes_load_once(self):
+        cache = assets.ThemeCache()
+        manager = pygame_gui.UIManager((800, 600))
+        self.assertTrue(cache.apply(manager, [STYLES, STYLES]))
+        manager.clear_and_reset()
+        self.assertFalse(cache.apply(manager, [STYLES]))
+        self.assertTrue(cache.apply(pygame_gui.UIManager((800, 600)), [STYLES]))
+        self.assertEqual(cache.loads, 1)
+
+class ImageCacheTest(unittest.TestCase):
+    def setUp(self):
+        pygame.init()
+        pygame.display.set_mode((800, 600))
+
+    def tearDown(self):
+        pygame.quit()
+
+    def test_surfaces_shared_per_size(self):
+        cache = assets.ImageCache()
+        first = cache.get(CAMERA, (32, 32))
+        self.assertIs(cache.get(CAMERA, (32, 32)), first)
+        self.assertEqual(first.get_size(), (32, 32))
+        self.assertIsNot(cache.get(CAMERA, (64, 64)), first)
+        self.assertEqual(cache.get_stats()["hits"], 1)
+        self.assertEqual(cache.get_stats()["misses"], 2)
+
+    def test_eviction_by_budget(self):
+        cache = assets.ImageCache(max_bytes=32 * 32 * 4)
+        first = cache.get(CAMERA, (32, 32))
+        cache.get(CAMERA, (16, 16))
+        self.assertEqual(cache.get_stats()["evictions"], 1)
+        self.assertLessEqual(cache.size, cache.max_bytes)
+        self.assertIsNot(cache.get(CAMERA, (32, 32)), first)
+
+    def test_preloaded_image_is_not_decoded_again(self):
+        cache = assets.ImageCache()
+        self.assertTrue(cache.preload(CAMERA))
+        self.assertFalse(cache.preload(CAMERA))
+        with unittest.mock.patch("pygame.image.load", side_effect=AssertionError("decoded twice")):
+            surface = cache.get(CAMERA, (32, 32))
+        self.assertEqual(surface.get_size(), (32, 32))
+
+    def test_preloads_count_against_the_budget(self):
+        cache = assets.ImageCache()
+        cache.preload(CAMERA)
+        decodedBytes = cache.size
+        self.assertGreater(decodedBytes, 0)
+        cache.get(CAMERA, (32, 32))
+        self.assertEqual(cache.size, 32 * 32 * 4)
+
+        cache = assets.ImageCache(max_bytes=decodedBytes + 32 * 32 * 4 - 1)
+        cache.get(CAMERA, (32, 32))
+        cache.preload(CAMERA)
+        self.assertEqual(cache.get_stats()["evictions"], 1)
+        self.assertEqual(cache.get_stats()["entries"], 0)
+        self.assertEqual(cache.size, decodedBytes)
+        # a preload of a changed file replaces the preload of its earlier version
+        with unittest.mock.patch("os.path.getmtime", return_value=0.0):
+            cache.preload(CAMERA)
+        self.assertEqual(len(cache._decoded), 1)
+        self.assertEqual(cache.size, decodedBytes)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,13 +1,78 @@
 import unittest
 import sys
 import os
+import io
 sys.path.append(os.path.join(os.path.abspath(os.path.dirname(__file__)), "../")) 
+import bs4
 import pygame_gui_xml.xmlast as xmlast
 
 # Coming Soon once the library is more mature
 class XMLASTTest(unittest.TestCase):
     def test_(self):
         self.assertTrue(True)
+
+    def setUp(self):
+        self.panel = xmlast.XMLTagParserSchema("panel", [xmlast.XMLIntAttributeParserSchema("id", True), xmlast.XMLBoolAttributeParserSchema("open", False)], ["name"])
+        self.name = xmlast.XMLTagParserSchema("name", [], [])
+
+    def test_compiled_schema_converts_attributes(self):
+        parse_tag = self.panel.compile()
+        self.assertEqual(parse_tag({"id": "-3", "open": "yes"}, ["name"]), {"id": -3, "open": True})
+        self.assertIsNone(parse_tag({"id": "3.5"}, []))
+        self.assertIsNone(parse_tag({"unknown": "3"}, []))
+        self.assertIsNone(parse_tag({"id": "3"}, ["panel"]))
+
+    def test_parser_error_messages(self):
+        parser = xmlast.XMLParser([self.panel, self.name])
+        head = parser.get_ast(bs4.BeautifulSoup("<panel id='3'><name>Jacoby</name></panel>", "lxml-xml"))
+        self.assertEqual(head.find("panel").attrs, {"id": 3})
+        self.assertEqual(head.find("name").text, "Jacoby")
+        with self.assertRaisesRegex(ValueError, "Could not validate tag"):
+            parser.get_ast(bs4.BeautifulSoup("<panel id='three'></panel>", "lxml-xml"))
+
+    def test_indexed_queries(self):
+        root = xmlast.XMLNode("pygamegui", {}, "", None, [])
+        body = xmlast.XMLNode("body", {}, "", None, [])
+        root.append_child(body)
+        panel = xmlast.XMLNode("panel", {"rect": (0, 0, 10, 10), "id": "#menu"}, "", None, [])
+        body.append_child(panel)
+        button = xmlast.XMLNode("button", {"rect": (0, 0, 5, 5), "class": "@big"}, "", None, [])
+        panel.append_child(button)
+
+        self.assertIs(root.find("button"), button)
+        self.assertEqual(root.find_all_with_attrs(["rect"]), [panel, button])
+        self.assertEqual(panel.find_all_with_attrs(["rect"]), [button])
+        self.assertEqual(root.find_all_by_id("menu"), [panel])
+        self.assertEqual(root.find_all_by_class("@big"), [button])
+
+        button["id"] = "#play"
+        self.assertIs(root.find_by_id("play"), button)
+        del panel["rect"]
+        self.assertEqual(root.find_all_with_attrs(["rect"]), [button])
+
+        label = xmlast.XMLNode("label", {}, "", None, [])
+        body.insert_child(0, label)
+        self.assertEqual(root.find_all("label"), [label])
+        panel.remove_child(button)
+        self.assertIsNone(root.find("button"))
+
+    def test_deep_document(self):
+        depth = sys.getrecursionlimit() * 2
+        nested = xmlast.XMLTagParserSchema("n", [], ["n", "leaf"])
+        leaf = xmlast.XMLTagParserSchema("leaf", [], [])
+        parser = xmlast.XMLParser([nested, leaf])
+        source = ("<n>" * depth + "<leaf>end</leaf>" + "</n>" * depth).encode()
+        head = parser.get_ast_from_stream(io.BytesIO(source))
+        self.assertEqual(head.find("leaf").text, "end")
+        self.assertEqual(len(head.find_all("n")), depth)
+
+    def test_compact_nodes(self):
+        node = xmlast.XMLNode("".join(["lab", "el"]), {}, "", None, [])
+        self.assertIs(node.name, "label")
+        self.assertFalse(hasattr(node, "__dict__"))
+        self.assertEqual(node.children, ())
+        node["id"] = "#title"
+        self.assertEqual(node.attrs, {"id": "#title"})
         
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
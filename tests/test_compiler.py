@@ -0,0 +1,104 @@
+import unittest
+import sys
+import os
+import tempfile
+import subprocess
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.append(os.path.join(os.path.abspath(os.path.dirname(__file__)), "../"))
+import pygame
+import pygame_gui
+import pygame_gui_xml.gui as xmlgui
+import pygame_gui_xml.compiler as xmlcompiler
+
+DATA = os.path.join( os.path.dirname(os.path.abspath(__file__)), "data" )
+MAINMENU = os.path.join(DATA, "mainmenu.xml")
+
+ALLTAGS = f'''<pygamegui><body><panel rect="0 0 800 600" id="main" class="screen">
+    <button rect="10 10 120 40" id="ok" tooltip="Confirm">OK</button>
+    <image src="{os.path.join(DATA, "Camera.png")}" rect="10 60 64 64" class="icon"></image>
+    <image rect="80 60 64 64"></image>
+    <label rect="10 130 200 30">Label</label>
+    <textbox rect="10 170 200 80">Text</textbox>
+    <statusbar rect="10 260 200 20" anchors="bottom"></statusbar>
+    <selectionlist rect="220 10 200 100"><item>A</item><item selected="true">B</item></selectionlist>
+    <selectionlist rect="640 10 150 100" datasource="{os.path.join(DATA, "items.csv")}"></selectionlist>
+    <dropdownmenu rect="640 120 150 30" datasource="{os.path.join(DATA, "items.csv")}"></dropdownmenu>
+    <virtuallist rect="220 120 200 100" multiselect="true"><item selected="true">A</item><item>B</item><item selected="true">C</item></virtuallist>
+    <horizontalslider rect="220 230 200 20" start="5" range="0 10" click-increment="2"></horizontalslider>
+    <dropdownmenu rect="220 260 200 30"><option>A</option><option start="true">B</option></dropdownmenu>
+    <textentryline rect="430 10 200 30" placeholder="Name" initial="Bob"></textentryline>
+    <textentrybox rect="430 50 200 80" initial="Notes"></textentrybox>
+    <panel rect="430 140 100 60"><tooltip hover-distance="4 4">Tip</tooltip></panel>
+    <panel rect="540 140 100 60" static="true"><label rect="0 0 80 20">Baked</label><image rect="0 20 20 20"></image></panel>
+    <window rect="100 100 300 200" title="Window" resizable="true"><button rect="0 0 100 40" id="inner">Inner</button></window>
+</panel></body></pygamegui>'''
+
+def describe(element: pygame_gui.core.UIElement) -> tuple:
+    return (type(element), tuple(element.relative_rect), element.object_ids, element.class_ids, getattr(element, "text", None))
+
+class XMLCompilerTest(unittest.TestCase):
+    def setUp(self):
+        pygame.init()
+        pygame.display.set_mode((800, 600))
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+        pygame.quit()
+
+    def compile(self, source: str):
+        output = os.path.join(self.directory.name, os.path.splitext(os.path.basename(source))[0] + "_ui.py")
+        xmlcompiler.compile_layout(source, output)
+        return xmlcompiler.load_compiled_module(output)
+
+    def assertSameElements(self, source: str):
+        interpreted = xmlgui.GUI(source)
+        compiled = xmlgui.GUI(self.compile(source))
+        self.assertIsNone(compiled.source)
+        self.assertEqual([ node.name for node in compiled.elements ], [ node.name for node in interpreted.elements ])
+        self.assertEqual([ describe(element) for element in compiled.elements.values() ], [ describe(element) for element in interpreted.elements.values() ])
+
+    def test_every_tag_has_an_emitter(self):
+        self.assertEqual(set(xmlcompiler.emitters), set(xmlgui.parsingFunctions))
+        self.assertEqual(set(xmlcompiler.elementClasses), set(xmlgui.parsingFunctions))
+
+    def test_mainmenu_matches_interpreted(self):
+        self.assertSameElements(MAINMENU)
+
+    def test_all_tags_match_interpreted(self):
+        source = os.path.join(self.directory.name, "alltags.xml")
+        with open(source, "w") as f:
+            f.write(ALLTAGS)
+        self.assertSameElements(source)
+
+    def test_compiled_gui_resizes(self):
+        gui = xmlgui.GUI(self.compile(MAINMENU))
+        gui.resize((1600, 1200))
+        self.assertEqual(gui.get_element("play-button").relative_rect.size, (300, 200))
+        self.assertFalse(gui.check_for_reload(force=True))
+
+    def test_invalid_layout_is_not_compiled(self):
+        source = os.path.join(self.directory.name, "invalid.xml")
+        with open(source, "w") as f:
+            f.write('<pygamegui><body><button rect="0 0 10 10"><panel rect="0 0 10 10"></panel></button></body></pygamegui>')
+        with self.assertRaises(ValueError):
+            xmlcompiler.compile_layout(source)
+
+    def test_compiled_module_does_not_import_parsers(self):
+        output = os.path.join(self.directory.name, "menu_ui.py")
+        xmlcompiler.compile_layout(MAINMENU, output)
+        script = ("import sys, pygame; pygame.init(); pygame.display.set_mode((800, 600)); import menu_ui, pygame_gui_xml.gui; pygame_gui_xml.gui.GUI(menu_ui); "
+                  "print(sorted(name for name in ['pygame_gui_xml.xmlparser', 'bs4', 'lxml', 'numpy'] if name in sys.modules))")
+        env = { **os.environ, "PYTHONPATH": os.pathsep.join([os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."), self.directory.name]), "SDL_VIDEODRIVER": "dummy" }
+        result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, env=env, cwd=DATA)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout.splitlines()[-1], "[]")
+
+    def test_stale_format_is_rejected(self):
+        module = self.compile(MAINMENU)
+        module.COMPILED_FORMAT = xmlgui.COMPILED_FORMAT_VERSION - 1
+        with self.assertRaises(ValueError):
+            xmlgui.GUI(module)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,145 @@
+import unittest
+import sys
+import os
+import tempfile
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.append(os.path.join(os.path.abspath(os.path.dirname(__file__)), "../"))
+import unittest.mock
+import pygame
+import pygame_gui
+import pygame_gui_xml.xmlparser as xmlparser
+import pygame_gui_xml.datasource as xmldatasource
+import pygame_gui_xml.virtuallist as xmlvirtuallist
+import pygame_gui_xml.gui as xmlgui
+
+class XMLDataSourceTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        xmldatasource.datasource_cache.clear()
+        self.directory.cleanup()
+
+    def write(self, name: str, data: str) -> str:
+        path = os.path.join(self.directory.name, name)
+        with open(path, "w", newline="") as f:
+            f.write(data)
+        return path
+
+    def test_formats(self):
+        lines = xmldatasource.FileItemSource(self.write("items.txt", "Alpha\r\n\r\nBeta, b\n  \nGamma"))
+        self.assertEqual(list(lines), ["Alpha", "Beta, b", "Gamma"])
+        rows = xmldatasource.FileItemSource(self.write("items.csv", 'Alpha,#alpha\nBeta\n"Gamma, c",\n'))
+        self.assertEqual(list(rows), [("Alpha", "#alpha"), "Beta", "Gamma, c"])
+        records = xmldatasource.FileItemSource(self.write("items.jsonl", '"Alpha"\n["Beta", "#beta"]\n{"text": "Gamma"}\n{"text": "Delta", "object_id": "#delta"}\n'))
+        self.assertEqual(list(records), ["Alpha", ("Beta", "#beta"), "Gamma", ("Delta", "#delta")])
+        self.assertEqual(records[-1], ("Delta", "#delta"))
+        with self.assertRaises(IndexError):
+            records[4]
+        with self.assertRaises(ValueError):
+            xmldatasource.FileItemSource(self.write("invalid.jsonl", "12\n"))[0]
+        self.assertEqual(len(xmldatasource.FileItemSource(self.write("empty.txt", ""))), 0)
+        for source in [lines, rows, records]:
+            source.close()
+
+    def test_lines_are_indexed_in_chunks(self):
+        path = self.write("servers.txt", "".join([ f'Server {i}\n' for i in range(10000) ]) + "x" * 300 + "\nLast\n")
+        with unittest.mock.patch.object(xmldatasource, "CHUNK_SIZE", 256):
+            source = xmldatasource.FileItemSource(path)
+            self.assertEqual(source[3], "Server 3")
+            self.assertFalse(source.is_indexed())
+            self.assertLess(source._scanned, 512)
+            self.assertEqual(source[9999], "Server 9999")
+            # a line longer than a chunk is indexed whole
+            self.assertEqual(source[10000], "x" * 300)
+            self.assertEqual(len(source), 10002)
+            self.assertTrue(source.is_indexed())
+        self.assertEqual(source.decodes, 3)
+        source.close()
+
+    def test_length_is_estimated_from_the_indexed_chunks(self):
+        path = self.write("servers.txt", "\n\n" + "".join([ f'Server {i:05}\n' for i in range(10000) ]))
+        with unittest.mock.patch.object(xmldatasource, "CHUNK_SIZE", 256):
+            source = xmldatasource.FileItemSource(path)
+            self.assertAlmostEqual(source.estimate_len(), 10000, delta=100)
+            self.assertLess(source._scanned, 512)
+            self.assertEqual(len(source), 10000)
+            self.assertEqual(source.estimate_len(), 10000)
+        self.assertEqual(xmldatasource.FileItemSource(self.write("blank.txt", "\n \n")).estimate_len(), 0)
+        source.close()
+        with self.assertRaises(ValueError):
+            source[0]
+
+    def test_list_is_built_without_indexing_the_file(self):
+        # the lines get longer further down, so that the estimate from the first chunk is over the actual count
+        path = self.write("servers.txt", "".join([ f'Server {i}\n' for i in range(100000) ]))
+        pygame.init()
+        pygame.display.set_mode((800, 600))
+        try:
+            manager = pygame_gui.UIManager((800, 600))
+            source = xmldatasource.datasource_cache.get(path)
+            servers = xmlvirtuallist.VirtualList(pygame.Rect(0, 0, 300, 400), source, manager)
+            self.assertFalse(source.is_indexed())
+            self.assertEqual(servers.rows[0].text, "Server 0")
+            self.assertGreater(servers.item_count, 100000)
+            servers.scroll_to_item(servers.item_count - 1)
+            self.assertTrue(source.is_indexed())
+            self.assertEqual(servers.item_count, 100000)
+            self.assertEqual(servers.total_height_of_list, 100000 * servers.list_item_height)
+            self.assertEqual(servers.get_visible_range()[-1], 99999)
+            self.assertEqual(servers.rows[99999 % len(servers.rows)].text, "Server 99999")
+            menu = xmlvirtuallist.VirtualDropDownMenu(xmldatasource.FileItemSource(path), pygame.Rect(310, 0, 200, 30), manager)
+            self.assertEqual(menu.selected_option, ("Server 0", "Server 0"))
+            self.assertFalse(menu.options_list.is_indexed())
+            menu.options_list.close()
+        finally:
+            pygame.quit()
+
+    def test_replaced_sources_stay_open_until_collected(self):
+        path = self.write("servers.txt", "Alpha\nBeta\n")
+        source = xmldatasource.datasource_cache.get(path)
+        self.assertIs(xmldatasource.datasource_cache.get(path), source)
+        self.write("servers.txt", "Alpha\nBeta\nGamma\n")
+        replaced = xmldatasource.datasource_cache.get(path)
+        self.assertIsNot(replaced, source)
+        self.assertEqual(list(source), ["Alpha", "Beta"])
+        self.assertEqual(list(replaced), ["Alpha", "Beta", "Gamma"])
+        xmldatasource.datasource_cache.clear()
+        self.assertFalse(replaced.is_closed())
+        file = source._file
+        del source
+        self.assertTrue(file.closed)
+
+    def test_parsing_does_not_read_the_data(self):
+        data = self.write("servers.csv", "".join([ f'Server {i},#server\n' for i in range(5000) ]))
+        layout = self.write("browser.xml", f'<pygamegui><body><selectionlist rect="0 0 300 400" id="servers" datasource="{data}"></selectionlist>'
+            + f'<dropdownmenu rect="310 0 200 30" id="regions" datasource="{data}"></dropdownmenu></body></pygamegui>')
+        with unittest.mock.patch.object(xmldatasource, "FileItemSource", side_effect=AssertionError("read the datasource while parsing")):
+            node = xmlparser.parse_pygame_xml(layout)
+        self.assertEqual(node.find_by_id("servers").attrs["datasource"], data)
+        with self.assertRaises(ValueError):
+            xmlparser.parse_pygame_xml(self.write("missing.xml", '<pygamegui><body><selectionlist rect="0 0 300 400" datasource="missing.csv"></selectionlist></body></pygamegui>'))
+
+        pygame.init()
+        pygame.display.set_mode((800, 600))
+        try:
+            opens = xmldatasource.datasource_cache.opens
+            gui = xmlgui.GUI(node, use_themes_in_file=False)
+            servers, regions = gui.get_element("servers"), gui.get_element("regions")
+            self.assertIsInstance(servers, xmlvirtuallist.VirtualList)
+            self.assertIsInstance(regions, xmlvirtuallist.VirtualDropDownMenu)
+            self.assertEqual(servers.rows[0].text, "Server 0")
+            self.assertIn("#server", servers.rows[0].object_ids)
+            self.assertEqual(regions.selected_option, ("Server 0", "#server"))
+            source = servers.items
+            self.assertIs(regions.options_list, source)
+            self.assertLess(source.decodes, 2 * len(servers.rows))
+
+            gui.construct()
+            self.assertIs(gui.get_element("servers").items, source)
+            self.assertEqual(xmldatasource.datasource_cache.opens - opens, 1)
+        finally:
+            pygame.quit()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,14 +1,282 @@
 import unittest
 import sys
 import os
+import shutil
+import tempfile
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
 sys.path.append(os.path.join(os.path.abspath(os.path.dirname(__file__)), "../")) 
+import unittest.mock
+import pygame
+import pygame_gui
 import pygame_gui_xml.gui as xmlgui
+
+MAINMENU = os.path.join( os.path.dirname(os.path.abspath(__file__)), "data/mainmenu.xml" )
    
 # Coming Soon once the library is more mature
 
 class XMLGUITest(unittest.TestCase):
+    def setUp(self):
+        pygame.init()
+        pygame.display.set_mode((800, 600))
+
+    def tearDown(self):
+        pygame.quit()
+
     def test_(self):
         self.assertTrue(True)
-        
+
+    def test_relayout_keeps_elements(self):
+        gui = xmlgui.GUI(MAINMENU, resize_mode="relayout")
+        elements = dict(gui.elements)
+        button = gui.nodetree.find("button")
+        gui.resize((1600, 1200))
+        self.assertEqual(gui.elements, elements)
+        self.assertTrue(all([ element.alive() for element in elements.values() ]))
+        self.assertEqual(gui.elements[button].relative_rect.size, (300, 200))
+        self.assertEqual(gui.manager.window_resolution, (1600, 1200))
+
+    def test_resize_does_not_drift(self):
+        gui = xmlgui.GUI(MAINMENU)
+        button = gui.nodetree.find("button")
+        original = button.attrs["rect"]
+        for size in [(333, 777), (1021, 97), (800, 600)]:
+            gui.resize(size)
+        self.assertEqual(button.attrs["rect"], original)
+
+    def test_resize_events_are_coalesced(self):
+        gui = xmlgui.GUI(MAINMENU)
+        for width in range(810, 1000, 10):
+            gui.process_events(pygame.event.Event(pygame.VIDEORESIZE, size=(width, 600), w=width, h=600))
+            gui.process_events(pygame.event.Event(pygame.WINDOWRESIZED, x=width, y=600))
+        self.assertEqual(gui.resize_count, 0)
+        gui.update(0)
+        self.assertEqual(gui.resize_count, 1)
+        self.assertEqual(gui.manager.window_resolution, (990, 600))
+        gui.update(0)
+        self.assertEqual(gui.resize_count, 1)
+
+    def test_resize_debounce(self):
+        gui = xmlgui.GUI(MAINMENU, resize_debounce=60)
+        gui.process_events(pygame.event.Event(pygame.WINDOWRESIZED, x=1000, y=700))
+        gui.update(0)
+        self.assertEqual(gui.resize_count, 0)
+        gui.apply_pending_resize(force=True)
+        self.assertEqual(gui.resize_count, 1)
+
+    def test_hot_reload_patches_elements(self):
+        with tempfile.TemporaryDirectory() as directory:
+            shutil.copy(os.path.join(os.path.dirname(MAINMENU), "styles.json"), directory)
+            source = os.path.join(directory, "menu.xml")
+            layout = '<pygamegui><body><panel rect="0 0 400 400" id="menu">{}</panel></body></pygamegui>'
+            with open(source, "w") as f:
+                f.write(layout.format('<button rect="0 0 100 50" id="play">Play</button><textentryline rect="0 60 100 30" id="name"></textentryline><label rect="0 100 100 30">Old</label>'))
+            gui = xmlgui.GUI(source)
+            panel, play, name = [ gui.elements[gui.nodetree.find_by_id(_id)] for _id in ["menu", "play", "name"] ]
+            name.set_text("typed")
+
+            with open(source, "w") as f:
+                f.write(layout.format('<button rect="0 0 120 50" id="play">Start</button><textentryline rect="0 60 100 30" id="name"></textentryline><button rect="0 200 100 30" id="quit">Quit</button>'))
+            self.assertTrue(gui.reload())
+
+            elements = { node.attrs.get("id"): element for node, element in gui.elements.items() }
+            self.assertIs(elements["#menu"], panel)
+            self.assertIs(elements["#play"], play)
+            self.assertIs(elements["#name"], name)
+            self.assertEqual(play.text, "Start")
+            self.assertEqual(play.relative_rect.width, 120)
+            self.assertEqual(name.get_text(), "typed")
+            self.assertTrue(elements["#quit"].alive())
+            self.assertEqual(len([ node for node in gui.elements if node.name == "label" ]), 0)
+
+    def test_hot_reload_at_scaled_size(self):
+        with tempfile.TemporaryDirectory() as directory:
+            source = os.path.join(directory, "menu.xml")
+            layout = '<pygamegui><body><panel rect="0 0 400 400" id="menu"><button rect="0 0 100 50" id="play">{}</button><label rect="10% 100 50% 30" id="title">Title</label></panel></body></pygamegui>'
+            with open(source, "w") as f:
+                f.write(layout.format("Play"))
+            gui = xmlgui.GUI(source, use_themes_in_file=False, resize_mode="relayout")
+            gui.resize((1200, 900))
+            play = gui.get_element("play")
+            with open(source, "w") as f:
+                f.write(layout.format("Start"))
+            with unittest.mock.patch.object(xmlgui, "patch_elements", wraps=xmlgui.patch_elements) as patch:
+                self.assertTrue(gui.reload())
+            changes = patch.call_args.args[2].changes
+            self.assertEqual([ (change.kind, change.new.name, change.attrs, change.text) for change in changes ], [("update", "button", set(), True)])
+            self.assertIs(gui.get_element("play"), play)
+            self.assertEqual(play.text, "Start")
+            self.assertEqual(play.relative_rect.size, (150, 75))
+
+            with open(source, "w") as f:
+                f.write(layout.format("Start").replace('rect="0 0 400 400"', 'rect="0 0 200 400"'))
+            self.assertTrue(gui.reload())
+            self.assertEqual(gui.get_element("title").relative_rect.width, 150)
+
+    def test_state_flushes_once_per_frame(self):
+        with tempfile.TemporaryDirectory() as directory:
+            source = os.path.join(directory, "hud.xml")
+            with open(source, "w") as f:
+                f.write('<pygamegui><body>' + "".join([ f'<label rect="0 {i * 20} 200 20" id="score{i}" bind="text:score">Score: {{}}</label>' for i in range(100) ])
+                    + '<horizontalslider rect="0 0 200 20" id="health" bind="value:health visible:alive"></horizontalslider></body></pygamegui>')
+            gui = xmlgui.GUI(source, use_themes_in_file=False)
+            with unittest.mock.patch.object(pygame_gui.elements.UILabel, "set_text", autospec=True) as set_text:
+                for score in range(50):
+                    gui.state.set("score", score)
+                self.assertEqual(set_text.call_count, 0)
+                gui.update(0)
+                self.assertEqual(set_text.call_count, 100)
+                self.assertEqual(set_text.call_args.args[1], "Score: 49")
+
+                gui.state.set("score", 50)
+                gui.state.set("score", 49)
+                gui.update(0)
+                self.assertEqual(set_text.call_count, 100)
+
+            gui.state.set("health", 30)
+            gui.state.set("alive", False)
+            self.assertEqual(gui.flush_state(), 2)
+            slider = gui.get_element("health")
+            self.assertEqual(slider.get_current_value(), 30)
+            self.assertFalse(slider.visible)
+
+            gui.construct()
+            self.assertEqual(gui.get_element("score0").text, "Score: 49")
+            self.assertFalse(gui.get_element("health").visible)
+
+    def test_value_binding_of_lists_and_menus(self):
+        with tempfile.TemporaryDirectory() as directory:
+            source = os.path.join(directory, "bound.xml")
+            with open(source, "w") as f:
+                f.write('<pygamegui><body><selectionlist rect="0 0 200 100" id="list" bind="value:items"><item>a</item></selectionlist>'
+                    + '<dropdownmenu rect="0 100 200 30" id="menu" bind="value:options"><option>a</option><option start="true">b</option></dropdownmenu></body></pygamegui>')
+            gui = xmlgui.GUI(source, use_themes_in_file=False)
+            menu = gui.get_element("menu")
+            self.assertEqual(menu.selected_option[0], "b")
+            gui.state.set("items", ["x", "y"])
+            gui.state.set("options", ["c", "d", "e"])
+            gui.update(0)
+            self.assertEqual([ item["text"] for item in gui.get_element("list").item_list ], ["x", "y"])
+            self.assertEqual(menu.options_list, ["c", "d", "e"])
+            self.assertEqual(menu.selected_option[0], "c")
+
+    def test_static_subtree_is_baked(self):
+        with tempfile.TemporaryDirectory() as directory:
+            source = os.path.join(directory, "hud.xml")
+            layout = ('<pygamegui><body><panel rect="20 20 400 300" id="hud"{}><label rect="10 10 200 30" bind="text:score">Score: {{}}</label>'
+                + '<image rect="10 50 64 64"></image><panel rect="100 100 200 150"><label rect="0 0 150 30" anchors="bottom">Inner</label></panel></panel>'
+                + '<button rect="500 20 100 40" id="play">Play</button></body></pygamegui>')
+            def render(static: str) -> tuple[xmlgui.GUI, pygame.Surface]:
+                with open(source, "w") as f:
+                    f.write(layout.format(static))
+                gui = xmlgui.GUI(source, resize_mode="relayout")
+                gui.state.set("score", 7)
+                gui.update(0)
+                surface = pygame.Surface(gui.size)
+                gui.draw_ui(surface)
+                return gui, surface
+
+            baked, bakedSurface = render(' static="true"')
+            plain, plainSurface = render("")
+            layer = baked.get_element("hud")
+            self.assertIsInstance(layer, xmlgui.StaticLayer)
+            self.assertEqual(len(baked.manager.get_sprite_group().sprites()), len(plain.manager.get_sprite_group().sprites()) - 6)
+            self.assertIsNone(baked.elements.get(baked.nodetree.find("label")))
+            self.assertEqual(layer.bake_count, 2)
+            self.assertEqual(pygame.image.tobytes(bakedSurface, "RGB"), pygame.image.tobytes(plainSurface, "RGB"))
+
+            baked.update(0)
+            self.assertEqual(layer.bake_count, 2)
+            baked.resize((1600, 1200))
+            baked.update(0)
+            self.assertEqual(layer.bake_count, 3)
+            self.assertEqual(layer.rect.size, (800, 600))
+            layer.rebuild_from_changed_theme_data()
+            baked.update(0)
+            self.assertEqual(layer.bake_count, 4)
+
+    def test_hot_reload_keeps_unchanged_static_layers(self):
+        with tempfile.TemporaryDirectory() as directory:
+            source = os.path.join(directory, "hud.xml")
+            layout = ('<pygamegui><body><panel rect="20 20 400 300" id="hud" static="true"><label rect="10 10 200 30" bind="text:score">Score: {{}}</label>'
+                + '<label rect="10 50 200 30">{}</label></panel><button rect="500 20 100 40" id="play">{}</button></body></pygamegui>')
+            with open(source, "w") as f:
+                f.write(layout.format("Lives", "Play"))
+            gui = xmlgui.GUI(source)
+            gui.state.set("score", 7)
+            gui.update(0)
+            layer = gui.get_element("hud")
+            bakes = layer.bake_count
+
+            with open(source, "w") as f:
+                f.write(layout.format("Lives", "Start"))
+            self.assertTrue(gui.reload())
+            gui.update(0)
+            self.assertIs(gui.get_element("hud"), layer)
+            self.assertIs(layer.node, gui.nodetree.find_by_id("hud"))
+            self.assertEqual(layer.bake_count, bakes)
+            self.assertEqual(list(layer.bound_values.items()), [((gui.nodetree.find("label"), "text"), 7)])
+            self.assertEqual(gui.get_element("play").text, "Start")
+
+            with open(source, "w") as f:
+                f.write(layout.format("Time", "Start"))
+            self.assertTrue(gui.reload())
+            gui.update(0)
+            self.assertEqual(gui.get_element("hud").bound_values, { (gui.nodetree.find("label"), "text"): 7 })
+
+    def test_static_subtree_with_interactive_elements_is_not_baked(self):
+        with tempfile.TemporaryDirectory() as directory:
+            source = os.path.join(directory, "menu.xml")
+            with open(source, "w") as f:
+                f.write('<pygamegui><body><panel rect="0 0 400 300" id="menu" static="true"><button rect="0 0 100 40" id="play">Play</button></panel></body></pygamegui>')
+            with self.assertLogs("pygame_gui_xml.gui", "WARNING"):
+                gui = xmlgui.GUI(source)
+            self.assertIsInstance(gui.get_element("play"), pygame_gui.elements.UIButton)
+            self.assertNotIsInstance(gui.get_element("menu"), xmlgui.StaticLayer)
+
+    def test_incremental_build(self):
+        completed = []
+        gui = xmlgui.GUI(MAINMENU, incremental=True, build_budget=0, on_build_complete=completed.append)
+        self.assertEqual(len(gui.elements), 0)
+        self.assertEqual(gui.build_progress, 0)
+        progress = []
+        while gui.is_building():
+            gui.update(0)
+            progress.append(gui.build_progress)
+        self.assertEqual(progress, sorted(progress))
+        self.assertEqual(progress[-1], 1)
+        self.assertEqual(completed, [gui])
+
+        eager = xmlgui.GUI(MAINMENU)
+        self.assertEqual(len(gui.elements), len(eager.elements))
+        for _id in ["background", "bottom-bar", "play-button"]:
+            element, expected = gui.get_element(_id), eager.get_element(_id)
+            self.assertEqual(element.rect, expected.rect)
+            parent, expectedParent = gui.elements.get_tree_element(element).parent.node, eager.elements.get_tree_element(expected).parent.node
+            self.assertEqual((parent.name, parent.attrs.get("id")), (expectedParent.name, expectedParent.attrs.get("id")))
+
+        gui.construct()
+        self.assertTrue(gui.is_building())
+        gui.finish_build()
+        self.assertFalse(gui.is_building())
+        self.assertEqual(len(completed), 2)
+
+    def test_load_async(self):
+        handle = xmlgui.GUI.load_async(MAINMENU, resize_mode="relayout")
+        handle.result(timeout=10)
+        gui = handle.poll()
+        self.assertIs(handle.poll(), gui)
+        self.assertEqual(gui.resize_mode, "relayout")
+        self.assertEqual(gui.source, MAINMENU)
+        self.assertTrue(gui.get_element("play-button").alive())
+
+    def test_load_async_reports_errors(self):
+        with tempfile.TemporaryDirectory() as directory:
+            source = os.path.join(directory, "broken.xml")
+            with open(source, "w") as f:
+                f.write("<pygamegui><body><button>")
+            handle = xmlgui.GUI.load_async(source)
+            with self.assertRaises(ValueError):
+                handle.result(timeout=10)
+
 if __name__ == "__main__":
-    unittest.main()
\ No newline at end of file
+    unittest.main()
@@ -1,14 +1,102 @@
 import unittest
 import sys
 import os
-sys.path.append(os.path.join(os.path.abspath(os.path.dirname(__file__)), "../")) 
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.append(os.path.join(os.path.abspath(os.path.dirname(__file__)), "../"))
+import pygame
+import pygame_gui
+import pygame_gui_xml.gui as xmlgui
 import pygame_gui_xml.guitree as xmlguitree
-   
-# Coming Soon once the library is more mature
+
+MAINMENU = os.path.join( os.path.dirname(os.path.abspath(__file__)), "data/mainmenu.xml" )
 
 class XMLGUITreeTest(unittest.TestCase):
-    def test_(self):
-        self.assertTrue(True)
-        
+    def setUp(self):
+        pygame.init()
+        pygame.display.set_mode((800, 600))
+        self.gui = xmlgui.GUI(MAINMENU)
+        self.tree: xmlguitree.GUITree = self.gui.elements
+
+    def tearDown(self):
+        pygame.quit()
+
+    def test_filled_during_construction(self):
+        self.assertIsInstance(self.tree, xmlguitree.GUITree)
+        button = self.gui.nodetree.find_by_id("play-button")
+        self.assertIs(self.tree.get_element("play-button"), self.tree[button])
+        self.assertIs(self.tree.get_element("#play-button"), self.tree[button])
+        self.assertIs(self.tree.get_node(self.tree[button]), button)
+        self.assertIsNone(self.tree.get_element("missing"))
+
+    def test_parent_links(self):
+        play = self.tree.get_tree_element(self.tree.get_element("play-button"))
+        self.assertIs(play.parent.element, self.tree.get_element("bottom-bar"))
+        self.assertIn(play, play.parent.children)
+        self.assertEqual(len(play.parent.children), 3)
+        self.assertIs(play.get_container().element, self.tree.get_element("bottom-bar"))
+
+    def test_object_id_lookup(self):
+        node = self.gui.nodetree.find_by_id("quit-button")
+        node["class"] = "@danger"
+        self.gui.construct()
+        self.tree = self.gui.elements
+        quit = self.tree.get_element("quit-button")
+        self.assertEqual(self.tree.get_element_by_class("danger"), [quit])
+        self.assertEqual(self.tree.get_element_by_object_id(pygame_gui.core.ObjectID("#quit-button", "@danger")), [quit])
+        self.assertEqual(self.tree.get_element_by_object_id(pygame_gui.core.ObjectID("#play-button", "@danger")), [])
+        self.assertEqual(quit.object_ids[-1], "#quit-button")
+        self.assertEqual(quit.class_ids[-1], "@danger")
+
+    def test_removal_updates_indexes(self):
+        node = self.gui.nodetree.find_by_id("play-button")
+        parent = self.tree.get_tree_element(node).parent
+        del self.tree[node]
+        self.assertEqual(self.tree.get_element_by_id("play-button"), [])
+        self.assertEqual(len(parent.children), 2)
+
+    def test_removing_a_middle_element_reparents_its_children(self):
+        bar = self.gui.nodetree.find_by_id("bottom-bar")
+        background = self.tree.get_tree_element(self.tree.get_element("background"))
+        barElement = self.tree[bar]
+        del self.tree[bar]
+        play = self.tree.get_tree_element(self.tree.get_element("play-button"))
+        self.assertIs(play.parent, background)
+        self.assertIn(play, background.children)
+        self.assertIs(play.get_container(), background)
+
+        self.tree[bar] = barElement
+        self.assertIs(play.parent.element, barElement)
+        self.assertNotIn(play, background.children)
+        self.assertEqual(len(self.tree.get_tree_element(bar).children), 3)
+        self.tree[bar] = barElement
+        self.assertIs(play.parent, self.tree.get_tree_element(bar))
+
+    def test_event_dispatch(self):
+        play, quit = self.tree.get_element("play-button"), self.tree.get_element("quit-button")
+        pressed = []
+        self.tree.get_tree_element(play).bind_event("play", pygame_gui.UI_BUTTON_PRESSED, lambda event: pressed.append("play"))
+        self.tree.bind_event("quit", "quit-button", pygame_gui.UI_BUTTON_PRESSED, lambda event: pressed.append("quit"))
+        self.tree.bind_event("key", "quit-button", pygame.KEYDOWN, lambda event: pressed.append("key"))
+        self.assertEqual(self.tree.dispatch(pygame.event.Event(pygame_gui.UI_BUTTON_PRESSED, ui_element=quit)), 1)
+        self.assertEqual(self.tree.dispatch(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_a)), 1)
+        self.assertEqual(self.tree.dispatch(pygame.event.Event(pygame.MOUSEMOTION, pos=(0, 0))), 0)
+        self.assertEqual(pressed, ["quit", "key"])
+
+        self.tree.get_tree_element(quit).unbind_event("quit")
+        del self.tree[self.gui.nodetree.find_by_id("play-button")]
+        self.assertEqual(self.tree.dispatch(pygame.event.Event(pygame_gui.UI_BUTTON_PRESSED, ui_element=quit)), 0)
+        self.assertEqual(self.tree.dispatch(pygame.event.Event(pygame_gui.UI_BUTTON_PRESSED, ui_element=play)), 0)
+
+    def test_gui_event_bindings_survive_rebuild(self):
+        pressed = []
+        self.gui.bind_event("play", "play-button", pygame_gui.UI_BUTTON_PRESSED, lambda event: pressed.append(event.ui_element))
+        self.gui.construct((1000, 700))
+        play = self.gui.get_element("play-button")
+        self.gui.process_events(pygame.event.Event(pygame_gui.UI_BUTTON_PRESSED, ui_element=play))
+        self.assertEqual(pressed, [play])
+        self.gui.unbind_event("play")
+        self.gui.process_events(pygame.event.Event(pygame_gui.UI_BUTTON_PRESSED, ui_element=play))
+        self.assertEqual(pressed, [play])
+
 if __name__ == "__main__":
-    unittest.main()
\ No newline at end of file
+    unittest.main()
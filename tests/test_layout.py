@@ -0,0 +1,162 @@
+import unittest
+import sys
+import os
+import io
+import tempfile
+import subprocess
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.append(os.path.join(os.path.abspath(os.path.dirname(__file__)), "../"))
+import unittest.mock
+import pygame
+import pygame_gui_xml.xmlast as xmlast
+import pygame_gui_xml.xmlparser as xmlparser
+import pygame_gui_xml.layout as xmllayout
+import pygame_gui_xml.gui as xmlgui
+
+LAYOUT = '''<pygamegui><body>
+    <panel rect="10% 10% 50% 1/2" id="sidebar" min-size="300 0" max-size="100% 200">
+        <button rect="0 0 100% 25%" id="play">Play</button>
+        <label rect="10 40 50vw 10vh" id="title">Title</label>
+    </panel>
+    <button rect="20 -60 100 40" anchors="bottom" id="quit">Quit</button>
+</body></pygamegui>'''
+
+def parse(layout: str) -> xmlast.XMLNode:
+    return xmlast.XMLParser(xmlparser.schemas).get_ast_from_stream(io.BytesIO(layout.encode()))
+
+class XMLLayoutTest(unittest.TestCase):
+    def test_parse_length(self):
+        self.assertEqual(xmllayout.parse_length("12"), 12.0)
+        self.assertEqual(xmllayout.parse_length("-12.5px"), -12.5)
+        self.assertEqual(xmllayout.parse_length("25%"), (25.0, "%"))
+        self.assertEqual(xmllayout.parse_length("1/4"), (0.25, "fr"))
+        self.assertEqual(xmllayout.parse_length("50vw"), (50.0, "vw"))
+        self.assertEqual(xmllayout.parse_length("10vh"), (10.0, "vh"))
+        for invalid in ["", "px", "12em", "1/0", "a/2", "%"]:
+            with self.assertRaises(ValueError):
+                xmllayout.parse_length(invalid)
+
+    def test_rects_keep_pixels_as_floats(self):
+        node = parse('<pygamegui><body><button rect="1 2 3 4">A</button><button rect="1px 2 3% 4">B</button></body></pygamegui>')
+        plain, relative = node.find_all("button")
+        self.assertEqual(plain.attrs["rect"], (1.0, 2.0, 3.0, 4.0))
+        self.assertEqual(relative.attrs["rect"], (1.0, 2.0, (3.0, "%"), 4.0))
+        with self.assertRaises(ValueError):
+            parse('<pygamegui><body><button rect="1 2 3em 4">A</button></body></pygamegui>')
+
+    def test_resolves_relative_to_parents(self):
+        node = parse(LAYOUT)
+        layout = xmllayout.Layout(node)
+        rects = dict(zip([ subnode.attrs.get("id") for subnode in layout.nodes ], layout.resolve((800, 600), vectorize=False)))
+        # the panel is half of the width, raised to its minimum width, and half of the height, lowered to its maximum
+        self.assertEqual(rects["#sidebar"], (80.0, 60.0, 400.0, 200.0))
+        self.assertEqual(rects["#play"], (0.0, 0.0, 400.0, 50.0))
+        self.assertEqual(rects["#title"], (10.0, 40.0, 400.0, 60.0))
+        self.assertEqual(rects["#quit"], (20.0, -60.0, 100.0, 40.0))
+
+        rects = dict(zip([ subnode.attrs.get("id") for subnode in layout.nodes ], layout.resolve((400, 300), (0.5, 0.5), vectorize=False)))
+        self.assertEqual(rects["#sidebar"], (40.0, 30.0, 300.0, 150.0))
+        self.assertEqual(rects["#play"], (0.0, 0.0, 300.0, 37.5))
+        self.assertEqual(rects["#title"], (5.0, 20.0, 200.0, 30.0))
+        self.assertEqual(rects["#quit"], (10.0, -30.0, 50.0, 20.0))
+
+    def test_apply_and_restore(self):
+        node = parse(LAYOUT)
+        layout = xmllayout.Layout(node)
+        play = node.find_by_id("play")
+        layout.apply((800, 600))
+        self.assertEqual(play.attrs["rect"], (0.0, 0.0, 400.0, 50.0))
+        layout.restore()
+        self.assertEqual(play.attrs["rect"], (0.0, 0.0, (100.0, "%"), (25.0, "%")))
+
+    @unittest.skipIf(xmllayout.get_numpy() is None, "NumPy is not installed")
+    def test_vectorized_matches_nodes(self):
+        cards = "".join([ f'<panel rect="{i % 7}% {i * 3} 1/3 {10 + i % 5}vh" min-size="{i % 50} 20" max-size="90% {100 + i}"><label rect="5 5 50% 1/2">{i}</label><button rect="-10vw 2 25% 30" max-size="40 100%">{i}</button></panel>' for i in range(200) ])
+        node = parse(f'<pygamegui><body><panel rect="0 0 100% 100%"><panel rect="5 5 90% 90%">{cards}</panel></panel>{cards}</body></pygamegui>')
+        layout = xmllayout.Layout(node)
+        for window, scale in [((800, 600), (1.0, 1.0)), ((1920, 1080), (2.4, 1.8)), ((333, 777), (0.41625, 1.295))]:
+            self.assertEqual(layout.resolve(window, scale, vectorize=True), layout.resolve(window, scale, vectorize=False))
+
+    def test_cache_by_window_size(self):
+        node = parse(LAYOUT)
+        layout = xmllayout.Layout(node, cache_size=2)
+        play = node.find_by_id("play")
+        layout.apply((800, 600))
+        layout.apply((1600, 600), (2.0, 1.0))
+        with unittest.mock.patch.object(layout, "resolve", side_effect=AssertionError("resolved a cached size")):
+            layout.apply((800, 600))
+        self.assertEqual(play.attrs["rect"], (0.0, 0.0, 400.0, 50.0))
+        self.assertEqual(layout.get_stats(), { "entries": 2, "hits": 1, "misses": 2, "evictions": 0 })
+        # (1600, 600) is the least recently used and makes room for (400, 300)
+        layout.apply((400, 300), (0.5, 0.5))
+        layout.apply((800, 600))
+        layout.apply((1600, 600), (2.0, 1.0))
+        self.assertEqual(layout.get_stats(), { "entries": 2, "hits": 2, "misses": 4, "evictions": 2 })
+        self.assertEqual(play.attrs["rect"], (0.0, 0.0, 800.0, 50.0))
+
+        uncached = xmllayout.Layout(parse(LAYOUT), cache_size=0)
+        uncached.apply((800, 600))
+        uncached.apply((800, 600))
+        self.assertEqual(uncached.get_stats(), { "entries": 0, "hits": 0, "misses": 2, "evictions": 0 })
+
+    def test_vectorize_needs_numpy(self):
+        layout = xmllayout.Layout(parse(LAYOUT))
+        with unittest.mock.patch.object(xmllayout, "numpy", None):
+            with self.assertRaises(ValueError):
+                layout.resolve((800, 600), vectorize=True)
+            self.assertEqual(len(layout.resolve((800, 600))), len(layout))
+
+    def test_numpy_is_imported_on_the_first_vectorized_resolve(self):
+        script = "import sys, pygame_gui_xml.validate; pygame_gui_xml.xmlparser.parse_pygame_xml(sys.argv[1]); print('numpy' in sys.modules)"
+        result = subprocess.run([sys.executable, "-c", script, os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "mainmenu.xml")],
+                                capture_output=True, text=True, env={ **os.environ, "PYTHONPATH": os.path.join(os.path.dirname(os.path.abspath(__file__)), "..") })
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout.splitlines()[-1], "False")
+
+class XMLLayoutGUITest(unittest.TestCase):
+    def setUp(self):
+        pygame.init()
+        pygame.display.set_mode((800, 600))
+        self.directory = tempfile.TemporaryDirectory()
+        self.source = os.path.join(self.directory.name, "layout.xml")
+        with open(self.source, "w") as f:
+            f.write(LAYOUT)
+
+    def tearDown(self):
+        self.directory.cleanup()
+        pygame.quit()
+
+    def test_gui_resolves_relative_rects(self):
+        for mode in xmlgui.resizeModes:
+            gui = xmlgui.GUI(self.source, resize_mode=mode)
+            self.assertEqual(gui.get_element("sidebar").relative_rect, pygame.Rect(80, 60, 400, 200))
+            gui.resize((1600, 600))
+            self.assertEqual(gui.get_element("sidebar").relative_rect, pygame.Rect(160, 60, 800, 200))
+            self.assertEqual(gui.get_element("title").relative_rect, pygame.Rect(20, 40, 800, 60))
+            self.assertEqual(gui.get_element("quit").relative_rect.size, (200, 40))
+            for size in [(333, 777), (1021, 97), (800, 600)]:
+                gui.resize(size)
+            self.assertEqual(gui.get_element("play").relative_rect, pygame.Rect(0, 0, 400, 50))
+
+    def test_gui_toggles_with_cached_layout(self):
+        gui = xmlgui.GUI(self.source, resize_mode="relayout", layout_cache_size=4)
+        gui.resize((1600, 600))
+        with unittest.mock.patch.object(xmllayout.Layout, "resolve", side_effect=AssertionError("resolved a cached size")):
+            gui.resize((800, 600))
+            self.assertEqual(gui.get_element("sidebar").relative_rect, pygame.Rect(80, 60, 400, 200))
+            gui.resize((1600, 600))
+            self.assertEqual(gui.get_element("sidebar").relative_rect, pygame.Rect(160, 60, 800, 200))
+        self.assertEqual(gui.layout.get_stats()["hits"], 2)
+        with unittest.mock.patch.object(xmllayout, "needs_layout", side_effect=AssertionError("scanned a resolved tree")):
+            gui.resize((800, 600))
+            gui.construct()
+            xmlgui.GUI(self.source, incremental=True).finish_build()
+
+    def test_parse_xml_tree_resolves_relative_rects(self):
+        node = xmlparser.parse_pygame_xml(self.source)
+        manager = xmlgui.pygame_gui.UIManager((800, 600))
+        elements = xmlgui.parse_xml_tree(manager, node, [])
+        self.assertEqual(elements.get_element("title").relative_rect, pygame.Rect(10, 40, 400, 60))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,10 +1,13 @@
-   
 import unittest
 import sys
 import os
+import tempfile
 sys.path.append(os.path.join(os.path.abspath(os.path.dirname(__file__)), "../")) 
 import pygame_gui_xml.xmlparser as xmlparser
-   
+import pygame_gui_xml.xmlcache as xmlcache
+
+MAINMENU = os.path.join( os.path.dirname(os.path.abspath(__file__)), "data/mainmenu.xml" )
+
 # Coming Soon once the library is more mature
 class XMLParserTest(unittest.TestCase):
     def test_mainmenu_example(self):
@@ -13,6 +16,43 @@ class XMLParserTest(unittest.TestCase):
             self.assertTrue(True)
         except Exception as exep:
             self.fail(str(exep))
-        
+
+    def test_backends_build_same_tree(self):
+        trees = [ xmlcache.flatten_xml_tree(xmlparser.parse_pygame_xml(MAINMENU, backend=backend)) for backend in xmlparser.backends ]
+        for tree in trees[1:]:
+            self.assertEqual(trees[0], tree)
+
+    def test_streamed_node_text(self):
+        node = xmlparser.parse_pygame_xml(MAINMENU)
+        self.assertEqual(node.find("theme").text, "styles.json")
+        self.assertEqual(node.find("button").text, "Play")
+        self.assertEqual(node.find("body").text, "")
+        self.assertEqual(node.find("button").attrs["anchors"], {"centery": "centery"})
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            xmlparser.parse_pygame_xml(MAINMENU, backend="html5lib")
+
+    def test_bind_attribute(self):
+        self.assertEqual(xmlparser.convert_bind("text:score  visible:alive"), {"text": "score", "visible": "alive"})
+        self.assertTrue(xmlparser.validate_bind("value:health"))
+        for data in ["", "color:score", "text:", "text"]:
+            self.assertFalse(xmlparser.validate_bind(data))
+            with self.assertRaises(ValueError):
+                xmlparser.convert_bind(data)
+
+    def test_bind_targets_by_tag(self):
+        with tempfile.TemporaryDirectory() as directory:
+            source = os.path.join(directory, "bound.xml")
+            image = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data/Camera.png")
+            for element in [ '<panel rect="0 0 10 10" bind="text:t"></panel>', f'<image rect="0 0 10 10" src="{image}" bind="value:v"></image>', '<window rect="0 0 10 10" bind="value:v"></window>' ]:
+                with open(source, "w") as f:
+                    f.write(f'<pygamegui><body>{element}</body></pygamegui>')
+                with self.assertRaises(ValueError):
+                    xmlparser.parse_pygame_xml(source)
+            with open(source, "w") as f:
+                f.write(f'<pygamegui><body><panel rect="0 0 10 10" bind="rect:r visible:v"></panel><label rect="0 0 10 10" bind="text:t"></label></body></pygamegui>')
+            self.assertEqual(xmlparser.parse_pygame_xml(source).find("panel").attrs["bind"], {"rect": "r", "visible": "v"})
+
 if __name__ == "__main__":
-    unittest.main()
\ No newline at end of file
+    unittest.main()
@@ -0,0 +1,44 @@
+import unittest
+import sys
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.append(os.path.join(os.path.abspath(os.path.dirname(__file__)), "../"))
+import pygame
+import pygame_gui_xml.gui as xmlgui
+import pygame_gui_xml.xmlparser as xmlparser
+import pygame_gui_xml.profiling as profiling
+
+MAINMENU = os.path.join( os.path.dirname(os.path.abspath(__file__)), "data/mainmenu.xml" )
+
+class ProfilingTest(unittest.TestCase):
+    def setUp(self):
+        pygame.init()
+        pygame.display.set_mode((800, 600))
+
+    def tearDown(self):
+        pygame.quit()
+
+    def test_parse_phases_and_tags(self):
+        stats = profiling.ProfileStats()
+        xmlparser.parse_pygame_xml(MAINMENU, stats=stats)
+        self.assertEqual(stats.phases["read"].count, 1)
+        self.assertEqual(stats.phases["parse[expat]"].count, 1)
+        self.assertEqual(stats.tags["validate"]["button"].count, 3)
+        self.assertEqual(stats.tags["validate"]["panel"].count, 4)
+
+    def test_gui_stats_and_callback(self):
+        measured: list[tuple[str, str | None]] = []
+        gui = xmlgui.GUI(MAINMENU, profile_callback=lambda phase, tag, seconds: measured.append((phase, tag)))
+        self.assertIn(("build", "button"), measured)
+        self.assertEqual(gui.stats.tags["build"]["button"].count, 3)
+        self.assertIn("themes", gui.stats.phases)
+        self.assertIn("build tree", gui.stats.phases)
+        gui.construct()
+        self.assertEqual(gui.stats.phases["build tree"].count, 2)
+        self.assertIn("build button", gui.stats.report())
+
+    def test_disabled_by_default(self):
+        self.assertIsNone(xmlgui.GUI(MAINMENU).stats)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,127 @@
+import unittest
+import sys
+import os
+import tempfile
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.append(os.path.join(os.path.abspath(os.path.dirname(__file__)), "../"))
+import unittest.mock
+import pygame
+import pygame_gui
+import pygame_gui_xml.scenes as xmlscenes
+import pygame_gui_xml.datasource as xmldatasource
+
+MAINMENU = os.path.join( os.path.dirname(os.path.abspath(__file__)), "data/mainmenu.xml" )
+PAUSE = '''<pygamegui><body><panel rect="0 0 400 300" id="pause">
+    <label rect="10 10 200 30" bind="text:title">{}</label>
+    <button rect="10 50 100 40" id="resume">Resume</button>
+</panel></body></pygamegui>'''
+
+class XMLScenePoolTest(unittest.TestCase):
+    def setUp(self):
+        pygame.init()
+        pygame.display.set_mode((800, 600))
+        self.directory = tempfile.TemporaryDirectory()
+        self.pause = os.path.join(self.directory.name, "pause.xml")
+        with open(self.pause, "w") as f:
+            f.write(PAUSE)
+
+    def tearDown(self):
+        self.directory.cleanup()
+        pygame.quit()
+
+    def test_switch_reuses_built_scenes(self):
+        pool = xmlscenes.ScenePool()
+        pool.add("menu", MAINMENU)
+        pool.add("pause", self.pause)
+        menu = pool.switch("menu")
+        pause = pool.switch("pause")
+        self.assertIsNot(menu.manager, pause.manager)
+        self.assertEqual(pool.active_name, "pause")
+        with unittest.mock.patch("pygame_gui_xml.gui.GUI") as GUI:
+            self.assertIs(pool.switch("menu"), menu)
+            GUI.assert_not_called()
+        self.assertEqual(pool.get_stats()["hits"], 1)
+        self.assertEqual(pool.get_stats()["misses"], 2)
+
+    def test_parked_scene_keeps_a_changed_datasource(self):
+        items = os.path.join(self.directory.name, "items.txt")
+        with open(items, "w") as f:
+            f.write("".join([ f'Item {i}\n' for i in range(200) ]))
+        layout = os.path.join(self.directory.name, "list.xml")
+        with open(layout, "w") as f:
+            f.write(f'<pygamegui><body><selectionlist rect="0 0 300 400" id="items" datasource="{items}"></selectionlist></body></pygamegui>')
+        pool = xmlscenes.ScenePool()
+        pool.add("a", layout)
+        pool.add("b", layout)
+        try:
+            items_a = pool.switch("a").get_element("items")
+            with open(items, "a") as f:
+                f.write("Item 200\n")
+            os.utime(items, (0, 0))
+            items_b = pool.switch("b").get_element("items")
+            self.assertIsNot(items_b.items, items_a.items)
+            self.assertIs(pool.switch("a").get_element("items"), items_a)
+            items_a.scroll_to_item(100)
+            self.assertEqual(items_a.rows[100 % len(items_a.rows)].text, "Item 100")
+            items_b.scroll_to_item(200)
+            self.assertEqual(items_b.rows[200 % len(items_b.rows)].text, "Item 200")
+        finally:
+            xmldatasource.datasource_cache.clear()
+
+    def test_evicts_least_recently_active(self):
+        pool = xmlscenes.ScenePool()
+        pool.add("menu", MAINMENU, prebuild=True)
+        pool.add("pause", self.pause)
+        pool.add("other", self.pause)
+        pool.switch("menu")
+        pool.switch("pause")
+        menuElements = list(pool.get_scene("menu").gui.elements.values())
+        pool.max_elements = pool.get_scene("pause").element_count * 2
+        pool.switch("other")
+
+        self.assertFalse(pool.get_scene("menu").is_built())
+        self.assertTrue(pool.get_scene("pause").is_built())
+        self.assertFalse(any([ element.alive() for element in menuElements ]))
+        self.assertEqual(pool.get_stats()["evictions"], 1)
+        with self.assertRaises(ValueError):
+            pool.evict("other")
+
+    def test_rebuild_from_cached_tree(self):
+        pool = xmlscenes.ScenePool(max_elements=1)
+        pool.add("menu", MAINMENU)
+        pool.add("pause", self.pause)
+        gui = pool.switch("pause")
+        gui.state.set("title", "Still paused")
+        calls = []
+        gui.bind_event("resume", "resume", pygame_gui.UI_BUTTON_PRESSED, calls.append)
+        pool.switch("menu")
+        self.assertFalse(pool.get_scene("pause").is_built())
+
+        with unittest.mock.patch("pygame_gui_xml.xmlparser.parse_pygame_xml") as parse:
+            rebuilt = pool.switch("pause")
+            parse.assert_not_called()
+        self.assertIsNot(rebuilt, gui)
+        self.assertEqual(rebuilt.get_element("resume").relative_rect.size, (100, 40))
+        rebuilt.flush_state()
+        self.assertEqual(rebuilt.elements[rebuilt.nodetree.find("label")].text, "Still paused")
+        rebuilt.process_events(pygame.event.Event(pygame_gui.UI_BUTTON_PRESSED, { "ui_element": rebuilt.get_element("resume") }))
+        self.assertEqual(len(calls), 1)
+
+    def test_rebuild_keeps_base_resolution(self):
+        pool = xmlscenes.ScenePool(max_elements=1)
+        pool.add("menu", MAINMENU)
+        pool.add("pause", self.pause)
+        pool.switch("pause")
+        pool.switch("menu")
+        pygame.display.set_mode((1600, 1200))
+        gui = pool.switch("pause")
+        self.assertEqual(gui.base_resolution, (800, 600))
+        self.assertEqual(gui.get_element("resume").relative_rect.size, (200, 80))
+
+    def test_unknown_scene(self):
+        pool = xmlscenes.ScenePool()
+        with self.assertRaises(ValueError):
+            pool.switch("missing")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+import unittest
+import sys
+import os
+import io
+import json
+import tempfile
+import subprocess
+import contextlib
+sys.path.append(os.path.join(os.path.abspath(os.path.dirname(__file__)), "../"))
+import pygame_gui_xml.validate as xmlvalidate
+
+MAINMENU = os.path.join( os.path.dirname(os.path.abspath(__file__)), "data/mainmenu.xml" )
+
+INVALID = '''<pygamegui>
+<body>
+    <button rect="1 2 3" bogus="x">Button</button>
+    <unknown></unknown>
+    <panel rect="0 0 10 10"><item></item></panel>
+</body>
+</pygamegui>'''
+
+class XMLValidateTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.layouts = os.path.join(self.directory.name, "layouts")
+        os.makedirs(os.path.join(self.layouts, "nested"))
+        with open(MAINMENU, "rb") as f:
+            menu = f.read()
+        for name in ["menu.xml", "nested/menu.xml", "nested/notes.txt"]:
+            with open(os.path.join(self.layouts, name), "wb") as f:
+                f.write(menu)
+        self.invalid = os.path.join(self.layouts, "nested", "invalid.xml")
+        with open(self.invalid, "w") as f:
+            f.write(INVALID)
+        self.cache = os.path.join(self.directory.name, "results.json")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_finds_layouts(self):
+        paths = xmlvalidate.find_layouts([self.layouts, os.path.join(self.layouts, "menu.xml")])
+        self.assertEqual([ os.path.relpath(path, self.layouts) for path in paths ], ["menu.xml", os.path.join("nested", "invalid.xml"), os.path.join("nested", "menu.xml")])
+
+    def test_collects_every_error(self):
+        result = xmlvalidate.validate_file(self.invalid)
+        self.assertFalse(result["valid"])
+        messages = [ error["message"] for error in result["errors"] ]
+        self.assertEqual(len(messages), 5)
+        self.assertTrue(messages[0].startswith('Invalid attribute rect="1 2 3"'))
+        self.assertEqual(messages[1:], ["Unknown attribute bogus on tag button", "Tag unknown is not accepted inside of body", "Unknown tag unknown", "Tag item is not accepted inside of panel"])
+        self.assertEqual([ error["line"] for error in result["errors"] ], [3, 3, 4, 4, 5])
+
+    def test_malformed_file(self):
+        with open(self.invalid, "w") as f:
+            f.write("<pygamegui><body>")
+        result = xmlvalidate.validate_file(self.invalid)
+        self.assertEqual(len(result["errors"]), 1)
+        self.assertIn("Malformed XML", result["errors"][0]["message"])
+
+    def test_parallel_matches_serial(self):
+        paths = xmlvalidate.find_layouts([self.layouts])
+        self.assertEqual(xmlvalidate.validate_files(paths, jobs=2), xmlvalidate.validate_files(paths, jobs=1))
+
+    def test_unchanged_files_are_cached(self):
+        paths = xmlvalidate.find_layouts([self.layouts])
+        first = xmlvalidate.validate_files(paths, 1, xmlvalidate.ResultCache(self.cache))
+        self.assertFalse(any([ result["cached"] for result in first ]))
+        with open(os.path.join(self.layouts, "menu.xml"), "a") as f:
+            f.write("\n")
+        second = xmlvalidate.validate_files(paths, 1, xmlvalidate.ResultCache(self.cache))
+        self.assertEqual([ result["cached"] for result in second ], [False, True, True])
+        self.assertEqual([ result["errors"] for result in second ], [ result["errors"] for result in first ])
+
+    def test_cached_results_check_referenced_files(self):
+        image = os.path.join(self.directory.name, "image.png")
+        with open(image, "wb") as f:
+            f.write(b"")
+        layout = os.path.join(self.layouts, "image.xml")
+        with open(layout, "w") as f:
+            f.write(f'<pygamegui><body><image rect="0 0 10 10" src="{image}"></image></body></pygamegui>')
+        self.assertTrue(xmlvalidate.validate_files([layout], 1, xmlvalidate.ResultCache(self.cache))[0]["valid"])
+        self.assertTrue(xmlvalidate.validate_files([layout], 1, xmlvalidate.ResultCache(self.cache))[0]["cached"])
+        os.remove(image)
+        result = xmlvalidate.validate_files([layout], 1, xmlvalidate.ResultCache(self.cache))[0]
+        self.assertEqual((result["valid"], result["cached"]), (False, False))
+        self.assertEqual(result, { **xmlvalidate.validate_file(layout), "cached": False })
+        with open(image, "wb") as f:
+            f.write(b"")
+        self.assertTrue(xmlvalidate.validate_files([layout], 1, xmlvalidate.ResultCache(self.cache))[0]["valid"])
+
+    def test_json_output(self):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            code = xmlvalidate.main([self.layouts, "--format", "json", "--cache", self.cache, "--jobs", "1"])
+        report = json.loads(output.getvalue())
+        self.assertEqual(code, 1)
+        self.assertEqual((report["checked"], report["invalid"]), (3, 1))
+
+    def test_does_not_import_pygame(self):
+        script = "import sys, pygame_gui_xml.validate; sys.exit('pygame' in sys.modules)"
+        root = os.path.join(os.path.abspath(os.path.dirname(__file__)), "../")
+        self.assertEqual(subprocess.run([sys.executable, "-c", script], cwd=root).returncode, 0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+import unittest
+import sys
+import os
+import tempfile
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.append(os.path.join(os.path.abspath(os.path.dirname(__file__)), "../"))
+import pygame
+import pygame_gui
+import pygame_gui_xml.gui as xmlgui
+import pygame_gui_xml.virtuallist as xmlvirtuallist
+
+class CountingSource():
+    """A data source of generated items, recording the indexes read"""
+    def __init__(self, count: int):
+        self.count = count
+        self.reads: set[int] = set()
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, index: int) -> str:
+        self.reads.add(index)
+        return f'Server {index}'
+
+class XMLVirtualListTest(unittest.TestCase):
+    def setUp(self):
+        pygame.init()
+        pygame.display.set_mode((800, 600))
+        self.manager = pygame_gui.UIManager((800, 600))
+
+    def tearDown(self):
+        pygame.quit()
+
+    def get_shown(self, virtualList: xmlvirtuallist.VirtualList) -> dict[int, str]:
+        return { index: virtualList.rows[index % len(virtualList.rows)].text for index in virtualList.get_visible_range() }
+
+    def test_rows_are_recycled_while_scrolling(self):
+        source = CountingSource(100000)
+        virtualList = xmlvirtuallist.VirtualList(pygame.Rect(0, 0, 300, 400), source, self.manager)
+        rowCount = len(virtualList.rows)
+        self.assertLess(rowCount, 30)
+        self.assertEqual(self.get_shown(virtualList), { index: f'Server {index}' for index in range(rowCount) })
+        rows = list(virtualList.rows)
+
+        # scrolling by a single row gives a new item to a single row
+        updates = virtualList.row_updates
+        virtualList.scroll_to_item(1)
+        self.assertEqual(virtualList.get_visible_range().start, 1)
+        self.assertEqual(virtualList.row_updates - updates, 1)
+
+        virtualList.scroll_bar.set_scroll_from_start_percentage(0.5)
+        virtualList.update(0.0)
+        visible = virtualList.get_visible_range()
+        self.assertGreater(visible.start, 40000)
+        self.assertEqual(self.get_shown(virtualList), { index: f'Server {index}' for index in visible })
+        self.assertEqual(virtualList.rows, rows)
+        self.assertLess(len(source.reads), 3 * rowCount)
+
+    def test_selection(self):
+        items = [ f'Item {i}' for i in range(1000) ]
+        virtualList = xmlvirtuallist.VirtualList(pygame.Rect(0, 0, 300, 400), items, self.manager, selected=[2])
+        self.assertEqual(virtualList.get_single_selection(), "Item 2")
+        self.assertTrue(virtualList.rows[2].is_selected)
+        pygame.event.clear()
+
+        virtualList.process_event(pygame.event.Event(pygame_gui.UI_BUTTON_PRESSED, { "ui_element": virtualList.rows[5] }))
+        self.assertEqual(virtualList.selected, {5})
+        self.assertFalse(virtualList.rows[2].is_selected)
+        self.assertTrue(virtualList.rows[5].is_selected)
+        events = [ (event.type, event.index, event.text) for event in pygame.event.get() if event.type in [pygame_gui.UI_SELECTION_LIST_NEW_SELECTION, pygame_gui.UI_SELECTION_LIST_DROPPED_SELECTION] ]
+        self.assertEqual(events, [(pygame_gui.UI_SELECTION_LIST_DROPPED_SELECTION, 2, "Item 2"), (pygame_gui.UI_SELECTION_LIST_NEW_SELECTION, 5, "Item 5")])
+
+        # the selection stays with its item once its row is recycled
+        virtualList.scroll_bar.set_scroll_from_start_percentage(0.5)
+        virtualList.update(0.0)
+        self.assertFalse(any([ row.is_selected for row in virtualList.rows ]))
+        self.assertEqual(virtualList.get_single_selection(), "Item 5")
+        with self.assertRaises(ValueError):
+            virtualList.set_selection([1, 2])
+        with self.assertRaises(ValueError):
+            virtualList.set_selection([1000])
+
+        virtualList.set_item_list([ ("Solo", "#solo") ])
+        self.assertIsNone(virtualList.get_single_selection())
+        self.assertIsNone(virtualList.scroll_bar)
+        self.assertEqual(len(virtualList.rows), 1)
+        self.assertEqual(virtualList.rows[0].text, "Solo")
+        self.assertIn("#solo", virtualList.rows[0].object_ids)
+
+    def test_gui_items_from_xml_and_state(self):
+        with tempfile.TemporaryDirectory() as directory:
+            source = os.path.join(directory, "servers.xml")
+            with open(source, "w") as f:
+                f.write('<pygamegui><body><virtuallist rect="0 0 300 400" id="servers" multiselect="true" bind="value:servers">'
+                    + '<item>Local</item><item selected="true">Public</item><item selected="true">Friends</item></virtuallist></body></pygamegui>')
+            gui = xmlgui.GUI(source, use_themes_in_file=False)
+            servers = gui.get_element("servers")
+            self.assertIsInstance(servers, xmlvirtuallist.VirtualList)
+            self.assertEqual(servers.get_multi_selection(), ["Public", "Friends"])
+
+            data = CountingSource(50000)
+            gui.state.set("servers", data)
+            gui.update(0)
+            self.assertIs(servers.items, data)
+            self.assertEqual(servers.get_multi_selection(), [])
+            self.assertEqual(servers.rows[0].text, "Server 0")
+
+if __name__ == "__main__":
+    unittest.main()
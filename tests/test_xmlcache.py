@@ -0,0 +1,54 @@
+import unittest
+import unittest.mock
+import sys
+import os
+import tempfile
+sys.path.append(os.path.join(os.path.abspath(os.path.dirname(__file__)), "../"))
+import pygame_gui_xml.xmlparser as xmlparser
+import pygame_gui_xml.xmlcache as xmlcache
+
+MAINMENU = os.path.join( os.path.dirname(os.path.abspath(__file__)), "data/mainmenu.xml" )
+
+class XMLCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.cache = xmlparser.create_ast_cache(self.tempdir.name)
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    def test_cache_hit_matches_parsed_tree(self):
+        parsed = xmlparser.parse_pygame_xml(MAINMENU, self.cache)
+        with unittest.mock.patch("bs4.BeautifulSoup", side_effect=AssertionError("bs4 used on cache hit")):
+            cached = xmlparser.parse_pygame_xml(MAINMENU, self.cache)
+        self.assertEqual(xmlcache.flatten_xml_tree(parsed), xmlcache.flatten_xml_tree(cached))
+        self.assertEqual(cached.find("button").attrs["rect"], (100.0, 0.0, 150.0, 100.0))
+
+    def test_cache_hit_checks_referenced_files(self):
+        source = os.path.join(self.tempdir.name, "image.xml")
+        image = os.path.join(self.tempdir.name, "image.png")
+        with open(image, "wb") as f:
+            f.write(b"")
+        with open(source, "w") as f:
+            f.write(f'<pygamegui><body><image rect="0 0 10 10" src="{image}"></image></body></pygamegui>')
+        xmlparser.parse_pygame_xml(source, self.cache)
+        self.assertEqual(xmlparser.parse_pygame_xml(source, self.cache).find("image").attrs["src"], image)
+        os.remove(image)
+        with self.assertRaises(ValueError):
+            xmlparser.parse_pygame_xml(source)
+        with self.assertRaises(ValueError):
+            xmlparser.parse_pygame_xml(source, self.cache)
+
+    def test_key_depends_on_schema_fingerprint(self):
+        other = xmlcache.ASTCache(self.tempdir.name, schema_fingerprint="other")
+        self.assertNotEqual(self.cache.get_key(b"<pygamegui/>"), other.get_key(b"<pygamegui/>"))
+
+    def test_eviction_by_size(self):
+        xmlparser.parse_pygame_xml(MAINMENU, self.cache)
+        self.assertGreater(self.cache.get_size(), 0)
+        self.cache.max_size = 0
+        self.cache.evict()
+        self.assertEqual(self.cache.get_size(), 0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,36 @@
+import unittest
+import sys
+import os
+import io
+sys.path.append(os.path.join(os.path.abspath(os.path.dirname(__file__)), "../"))
+import pygame_gui_xml.xmlast as xmlast
+import pygame_gui_xml.xmlparser as xmlparser
+import pygame_gui_xml.xmldiff as xmldiff
+
+def parse(source: str) -> xmlast.XMLNode:
+    return xmlast.XMLParser(xmlparser.schemas).get_ast_from_stream(io.BytesIO(source.encode()))
+
+class XMLDiffTest(unittest.TestCase):
+    def test_matches_by_id_and_position(self):
+        old = parse('<pygamegui><body><button id="a" rect="0 0 1 1">A</button><label rect="0 0 1 1">One</label><label rect="0 0 1 1">Two</label></body></pygamegui>')
+        new = parse('<pygamegui><body><label rect="0 0 1 1">One</label><button id="a" rect="0 0 2 2">A</button><label rect="0 0 1 1">Three</label></body></pygamegui>')
+        diff = xmldiff.diff_trees(old, new)
+        self.assertIs(diff.matches[new.find_by_id("a")], old.find_by_id("a"))
+        updates = { change.new.text: change for change in diff.changes if change.kind == "update" }
+        self.assertEqual(updates["A"].attrs, {"rect"})
+        self.assertTrue(updates["Three"].text)
+        self.assertEqual([ change.kind for change in diff.changes if change.kind != "update" ], [])
+
+    def test_creates_and_kills(self):
+        old = parse('<pygamegui><body><button id="a" rect="0 0 1 1">A</button></body></pygamegui>')
+        new = parse('<pygamegui><body><button id="b" rect="0 0 1 1">B</button></body></pygamegui>')
+        diff = xmldiff.diff_trees(old, new)
+        kinds = sorted([ (change.kind, (change.new or change.old).text) for change in diff.changes ])
+        self.assertEqual(kinds, [("create", "B"), ("kill", "A")])
+
+    def test_identical_trees(self):
+        source = '<pygamegui><body><panel rect="0 0 10 10"><label rect="0 0 1 1">Hi</label></panel></body></pygamegui>'
+        self.assertTrue(xmldiff.diff_trees(parse(source), parse(source)).is_empty())
+
+if __name__ == "__main__":
+    unittest.main()